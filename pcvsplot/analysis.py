@@ -0,0 +1,61 @@
+import logging
+import benchmarks
+
+OUTLIER_SUFFIX = "_outlier"
+
+def outlier_column(ordinate):
+    return ordinate + OUTLIER_SUFFIX
+
+def flag_outliers(frames, ordinates, x="bytes", window=5, threshold=0.5):
+    """Flag points of parsed benchmark curves that deviate from their local
+    trend.
+
+    frames maps a test uname to the frame returned by Benchmark.parse. All
+    frames are stacked and processed at once: the trend of each curve is
+    the centered rolling median of log(metric) over window message sizes,
+    and a point is an outlier when it differs from the trend by more than
+    a factor 1 + threshold. The window // 2 sizes at each end of a curve
+    have no complete window and are never flagged. For each ordinate, a
+    boolean column '<ordinate>_outlier' is added to every frame. Returns
+    the number of flagged points."""
+    import numpy as np
+    import pandas as pd
+
+    # empty frames (e.g. quarantined tests) get empty columns
+    for d in frames.values():
+        if len(d) == 0:
+            for ordinate in ordinates:
+                d[outlier_column(ordinate)] = pd.Series([], dtype=bool)
+    frames = {uname: d for uname, d in frames.items() if len(d) > 0}
+    if not frames:
+        return 0
+
+    df = pd.concat([d.sort_values(x) for d in frames.values()],
+            keys=list(frames.keys()), names=["uname", "row"])
+
+    nflagged = 0
+    for ordinate in ordinates:
+        logy  = np.log(df[ordinate].where(df[ordinate] > 0))
+        trend = logy.groupby(level="uname", sort=False) \
+                .rolling(window, center=True, min_periods=window).median() \
+                .droplevel(0)
+        flagged = (logy - trend).abs() > np.log1p(threshold)
+        nflagged = nflagged + int(flagged.sum())
+
+        for uname, d in frames.items():
+            d[outlier_column(ordinate)] = flagged.loc[uname].reindex(d.index).values
+
+    return nflagged
+
+def flag_suite_outliers(ts, window=5, threshold=0.5):
+    """Flag outliers of all the tests of a built PCVSTestSuite, one
+    vectorized pass per benchmark."""
+    for key in ts.testsuite:
+        b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+        if b is None:
+            continue
+
+        frames = {t.uname: ts.parse(b, t) for t in ts.testsuite[key]}
+        nflagged = flag_outliers(frames, b.BENCHMARK_Y, b.BENCHMARK_X[0], window, threshold)
+        if nflagged > 0:
+            logging.warning("Flagged " + str(nflagged) + " outliers in " + key)
@@ -1,18 +1,20 @@
 import abc
 import logging
-import pandas as pd
 import io
-import matplotlib
-import matplotlib.pyplot as plt
-from typing import List
+import re
+from typing import Dict, List
 
 _BENCHMARK_REGISTRY = {}
+_UNKNOWN_BENCHMARKS = set()
 
 def GetBenchmarkClass(base_class, **kwargs):
     key = [kwargs["BENCHMARK_NAME"]]
     if tuple(key) not in _BENCHMARK_REGISTRY:
-        logging.fatal("Benchmark not defined: " + str(key))
-        exit(1)
+        # warn once per name, not once per parsed output
+        if tuple(key) not in _UNKNOWN_BENCHMARKS:
+            _UNKNOWN_BENCHMARKS.add(tuple(key))
+            logging.warning("Benchmark not defined, skipping: " + str(key))
+        return None
 
     return _BENCHMARK_REGISTRY.get(tuple(key))
 
@@ -21,8 +23,13 @@ class AutoRegisterBenchmarkMeta(abc.ABCMeta):
     BENCHMARK_NAME: str
     BENCHMARK_X: List[str] # Abscisse 
     BENCHMARK_Y: List[str] # Ordonnees
+    BENCHMARK_DERIVED: Dict[str, str] # Ordonnees computed from parsed ones
 
     def __init__(cls, name, bases, dct):
+        # derived ordinates are plotted and exported like parsed ones
+        for key in cls.BENCHMARK_DERIVED:
+            if key not in cls.BENCHMARK_Y:
+                cls.BENCHMARK_Y = cls.BENCHMARK_Y + [key]
         if cls.BENCHMARK_NAME:
             key = [cls.BENCHMARK_NAME]
             _BENCHMARK_REGISTRY[tuple(key)] = cls
@@ -31,56 +38,172 @@ class AutoRegisterBenchmarkMeta(abc.ABCMeta):
 class Benchmark(metaclass=AutoRegisterBenchmarkMeta):
 
     BENCHMARK_NAME = None
+    BENCHMARK_Y = []
+    BENCHMARK_DERIVED = {}
 
     @classmethod
     @abc.abstractmethod
     def parse(cls, output):
         return io.StringIO(output)
 
+    @classmethod
+    def derive(cls, df):
+        # each derived ordinate is a pandas expression over parsed columns
+        for key, expr in cls.BENCHMARK_DERIVED.items():
+            df[key] = df.eval(expr)
+        return df
+
+    @classmethod
+    def parse_line(cls, state, line):
+        # row of a single output line, None if the line holds no result
+        return None
+
+    @classmethod
+    def nprocs(cls, output):
+        # number of processes reported by the output, None if unknown
+        return None
+
+    @classmethod
+    def parse_blocks(cls, output):
+        # rows of every process count of the output, in an nprocs column
+        return cls.parse(output).assign(nprocs=cls.nprocs(output))
+
+    @classmethod
+    def stream(cls):
+        return StreamParser(cls)
+
     @classmethod
     @abc.abstractmethod
     def plot(cls, ax, df, x, y, linestyle, color, label):
         pass
 
+class StreamParser():
+    """Incremental parser of a benchmark output, fed one line at a time
+    while the benchmark runs. Rows include derived metrics."""
+
+    def __init__(self, b):
+        self.b     = b
+        self.state = {}
+        self.rows  = []
+
+    def feed(self, line):
+        row = self.b.parse_line(self.state, line)
+        if row is None:
+            return None
+        if self.b.BENCHMARK_DERIVED:
+            import numpy as np
+            # float64 operands divide by zero like DataFrame.eval, to inf or nan
+            values = {k: np.float64(v) for k, v in row.items()}
+            with np.errstate(divide='ignore', invalid='ignore'):
+                for key, expr in self.b.BENCHMARK_DERIVED.items():
+                    row[key] = float(eval(expr, {"__builtins__": {}}, values))
+        self.rows.append(row)
+        return row
+
 class OSU(Benchmark):
 
-    @staticmethod
-    def my_readline(f):
-        byte_str = f.readline()
-        if len( byte_str ) == 0:
+    # Map OSU column headers (lowercase, without spaces) to DataFrame
+    # columns. Header wording changed across OSU releases, so each metric
+    # may have several spellings. OSU_HEADERS of a benchmark overrides
+    # the spellings whose meaning depends on the benchmark.
+    OSU_COLUMNS = {
+            "size": "bytes",
+            "latency(us)": "latency",
+            "bandwidth(mb/s)": "bandwidth",
+            "mb/s": "bandwidth",
+            "messages/s": "msgrate",
+            "avglatency(us)": "avgtime",
+            "minlatency(us)": "mintime",
+            "maxlatency(us)": "maxtime",
+            "iterations": "iterations"
+            }
+    OSU_HEADERS = {}
+
+    @classmethod
+    def parse_header(cls, line):
+        # columns are separated by at least two spaces
+        labels = re.split(r"\s{2,}", line.lstrip("#").strip())
+        labels = [l.replace(" ", "").lower() for l in labels]
+        if not labels or labels[0] != "size":
             return None
-        try:
-            if byte_str[0] in 'abc':
-                ch_str = byte_str   # python2
-            else:
-                ch_str = byte_str
-        except:                     # python3
-            ch_str = byte_str.decode()
-    
-        if len( ch_str ) > 0:
-            ch_str = ch_str[0:-1]   # remove newline
-        tokens = ch_str.split()
-        return tokens
+        names = dict(OSU.OSU_COLUMNS, **cls.OSU_HEADERS)
+        return [names.get(l) for l in labels]
 
-    @staticmethod
-    def get_benchmark(f):
-        while( True ):
-            tokens = OSU.my_readline(f)
-            if tokens is None:
-                return (None, None)
-            nc = len( tokens )
-            if nc < 2:
-                continue;
-            if tokens[1] == "OSU":
-                bench = tokens[3]
-                #if not GetBenchmarkClass(Benchmark, BENCHMARK_NAME=bench):
-                #    print( 'Unsupported benchmark: ', bench )
-                #    continue
-                break
-        # skip one line
-        OSU.my_readline(f)    
+    @classmethod
+    def layout(cls, header, ntokens):
+        """Columns of a row of ntokens: the header when it names a metric
+        of the benchmark and matches the row, else the positional layout
+        of the benchmark. Other columns are None."""
+        columns = cls.BENCHMARK_X + cls.OSU_Y
+        if header is None or len(header) > ntokens or not set(header) & set(cls.OSU_Y):
+            header = columns
+        return [c if c in columns else None for c in header]
+
+    @classmethod
+    def parse(cls, output):
+        import pandas as pd
+        columns = cls.BENCHMARK_X + cls.OSU_Y
+        header  = None
+        rows    = []
+        for line in output.splitlines():
+            tokens = line.split()
+            if len(tokens) == 0:
+                continue
+            if tokens[0][0] == "#":
+                h = cls.parse_header(line)
+                if h is not None:
+                    header = h
+                continue
+            if tokens[0].isdigit():
+                rows.append(tokens)
+
+        header = cls.layout(header, len(rows[0]) if rows else 0)
+        keep   = [i for i, c in enumerate(header) if c is not None]
+
+        # convert the columns of the benchmark only, rows with another
+        # value than a number in one of them are skipped
+        data = []
+        for r in rows:
+            if len(r) < len(header):
+                continue
+            try:
+                data.append([float(r[i]) for i in keep])
+            except ValueError:
+                continue
+
+        pp_data = pd.DataFrame(data, columns=[header[i] for i in keep], dtype=float)
+        pp_data = pp_data.reindex(columns=columns)
+        pp_data = pp_data.loc[pp_data["bytes"] != 0].reset_index(drop=True)
+        pp_data["bytes"] = pp_data["bytes"].astype(int)
 
-        return (bench, 2)
+        return cls.derive(pp_data)
+
+    @classmethod
+    def parse_line(cls, state, line):
+        columns = cls.BENCHMARK_X + cls.OSU_Y
+        tokens  = line.split()
+        if len(tokens) == 0:
+            return None
+        if tokens[0][0] == "#":
+            h = cls.parse_header(line)
+            if h is not None:
+                state["header"] = h
+            return None
+        if not tokens[0].isdigit() or int(tokens[0]) == 0:
+            return None
+
+        # the layout is taken from the first row, like parse
+        if "layout" not in state:
+            state["layout"] = cls.layout(state.get("header"), len(tokens))
+        header = state["layout"]
+        if len(tokens) < len(header):
+            return None
+        try:
+            row = {c: float(v) for c, v in zip(header, tokens) if c is not None}
+        except ValueError:
+            return None
+        row["bytes"] = int(row["bytes"])
+        return {c: row.get(c, float("nan")) for c in columns}
 
     @classmethod
     def plot(cls, ax, df, x, y, linestyle, marker, color, label):
@@ -118,43 +241,26 @@ class OSULatency(OSU):
     BENCHMARK_NAME = "pt2pt_osu_latency" 
     BENCHMARK_X = ['bytes']
     BENCHMARK_Y = ['latency']
+    # OSU 7 prints the average latency of pt2pt and one-sided tests
+    OSU_HEADERS = {"avglatency(us)": "latency"}
+    BENCHMARK_DERIVED = {
+            "msgrate": "1e6 / latency"
+            }
+    OSU_Y = ['latency']
 
     x_plt_label = {
             "bytes": "Message Size"
             }
     y_plt_label = {
-            "latency": "Latency [usec]"
+            "latency": "Latency [usec]",
+            "msgrate": "Message Rate [msg/sec]"
             }
 
-    @classmethod
-    def parse(cls, output):
-        f = super().parse(output)
-        (bench, proc) = OSU.get_benchmark(f)
-
-        dct = {
-                "bytes": [],
-                "latency": []
-                }
-        while True:
-            tokens = OSU.my_readline(f)
-            if tokens == [] or tokens is None:
-                break;
-            try:
-                if int(tokens[0]) == 0:
-                    continue
-                dct["bytes"].append(int(tokens[0]))
-                dct["latency"].append(float(tokens[1]))
-            except:
-                break
-
-        pp_data = pd.DataFrame(dct)
-
-        return pp_data
-
 class OSUBandwidth(OSU):
     BENCHMARK_NAME = "pt2pt_osu_bw" 
     BENCHMARK_X = ['bytes']
     BENCHMARK_Y = ['bandwidth']
+    OSU_Y = ['bandwidth']
 
     x_plt_label = {
             "bytes": "Message Size"
@@ -163,34 +269,133 @@ class OSUBandwidth(OSU):
             "bandwidth": "Bandwidth [MB/sec]"
             }
 
-    @classmethod
-    def parse(cls, output):
-        f = super().parse(output)
-        (bench, proc) = OSU.get_benchmark(f)
+class OSUMessageRate(OSU):
+    BENCHMARK_NAME = "pt2pt_osu_mbw_mr" 
+    BENCHMARK_X = ['bytes']
+    BENCHMARK_Y = ['bandwidth', 'msgrate']
+    OSU_Y = ['bandwidth', 'msgrate']
 
-        dct = {
-                "bytes": [],
-                "bandwidth": []
-                }
-        while True:
-            tokens = OSU.my_readline(f)
-            if tokens == [] or tokens is None:
-                break;
-            try:
-                if int(tokens[0]) == 0:
-                    continue
-                dct["bytes"].append(int(tokens[0]))
-                dct["bandwidth"].append(float(tokens[1]))
-            except:
-                break
+    x_plt_label = {
+            "bytes": "Message Size"
+            }
+    y_plt_label = {
+            "bandwidth": "Bandwidth [MB/sec]",
+            "msgrate": "Message Rate [msg/sec]"
+            }
+
+class OSUCollective(OSU):
+    BENCHMARK_NAME = None
+    BENCHMARK_X = ['bytes']
+    BENCHMARK_Y = ['avgtime', 'mintime', 'maxtime']
+    BENCHMARK_DERIVED = {
+            "bandwidth": "bytes / avgtime",
+            "imbalance": "maxtime / mintime",
+            "straggler": "(maxtime - avgtime) / avgtime"
+            }
+    OSU_Y = ['avgtime', 'mintime', 'maxtime']
+
+    x_plt_label = {
+            "bytes": "Message Size"
+            }
+    y_plt_label = {
+            "avgtime": "Avg Latency [usec]",
+            "mintime": "Min Latency [usec]",
+            "maxtime": "Max Latency [usec]",
+            "bandwidth": "Effective Bandwidth [MB/sec]",
+            "imbalance": "Load Imbalance (max / min)",
+            "straggler": "Straggler Delay ((max - avg) / avg)"
+            }
+
+class OSUBiBandwidth(OSUBandwidth):
+    BENCHMARK_NAME = "pt2pt_osu_bibw" 
+
+class OSUPutLatency(OSULatency):
+    BENCHMARK_NAME = "one-sided_osu_put_latency" 
+
+class OSUGetLatency(OSULatency):
+    BENCHMARK_NAME = "one-sided_osu_get_latency" 
+
+class OSUAccLatency(OSULatency):
+    BENCHMARK_NAME = "one-sided_osu_acc_latency" 
+
+class OSUPutBandwidth(OSUBandwidth):
+    BENCHMARK_NAME = "one-sided_osu_put_bw" 
+
+class OSUGetBandwidth(OSUBandwidth):
+    BENCHMARK_NAME = "one-sided_osu_get_bw" 
+
+class OSUPutBiBandwidth(OSUBandwidth):
+    BENCHMARK_NAME = "one-sided_osu_put_bibw" 
+
+class OSUAllgather(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_allgather" 
+
+class OSUAllgatherv(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_allgatherv" 
+
+class OSUAllreduce(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_allreduce" 
+
+class OSUAlltoall(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_alltoall" 
+
+class OSUAlltoallv(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_alltoallv" 
 
-        pp_data = pd.DataFrame(dct)
+class OSUBcast(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_bcast" 
 
-        return pp_data
+class OSUGather(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_gather" 
+
+class OSUGatherv(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_gatherv" 
+
+class OSUReduce(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_reduce" 
+
+class OSUReduceScatter(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_reduce_scatter" 
+
+class OSUScatter(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_scatter" 
+
+class OSUScatterv(OSUCollective):
+    BENCHMARK_NAME = "collective_osu_scatterv" 
 
 
 class IMB(Benchmark):
 
+    NPROCS_RE = re.compile(r"#processes\s*=\s*(\d+)")
+
+    @classmethod
+    def nprocs(cls, output):
+        m = cls.NPROCS_RE.search(output)
+        return int(m.group(1)) if m else None
+
+    @classmethod
+    def parse_blocks(cls, output):
+        """A run prints one block per process count of each benchmark,
+        parse all the blocks of this benchmark into one frame."""
+        import pandas as pd
+        blocks = []
+        for line in output.splitlines(keepends=True):
+            tokens = line.split()
+            if len(tokens) == 3 and tokens[1] == 'Benchmarking':
+                blocks.append([])
+            if blocks:
+                blocks[-1].append(line)
+
+        frames = []
+        for block in blocks:
+            if block[0].split()[2] != cls.BENCHMARK_NAME:
+                continue
+            text = "".join(block)
+            frames.append(cls.parse(text).assign(nprocs=cls.nprocs(text)))
+        if len(frames) == 0:
+            return pd.DataFrame([], columns=cls.BENCHMARK_X + cls.BENCHMARK_Y + ["nprocs"])
+        return pd.concat(frames, ignore_index=True)
+
     @staticmethod
     def my_readline(f):
         byte_str = f.readline()
@@ -247,6 +452,37 @@ class IMB(Benchmark):
                 break
         return ( bench, nprocs )
 
+    @classmethod
+    def parse_line(cls, state, line):
+        # like parse, keep the rows of the first process count block only
+        tokens = line.split()
+        if len(tokens) == 0:
+            state["table"] = False
+            return None
+        if len(tokens) == 3 and tokens[1] == 'Benchmarking':
+            state["bench"] = tokens[2]
+            state["table"] = False
+            return None
+        m = cls.NPROCS_RE.search(line)
+        if m is not None:
+            state["nprocs"] = int(m.group(1))
+            if state.get("bench") == cls.BENCHMARK_NAME:
+                state.setdefault("first", state["nprocs"])
+            return None
+        if tokens[0] == '#bytes' or tokens[0] == '#repetitions':
+            state["table"] = state.get("bench") == cls.BENCHMARK_NAME and \
+                    state.get("nprocs") == state.get("first")
+            return None
+        if not state.get("table") or not tokens[0].isdigit() \
+                or len(tokens) <= max(cls.IMB_COLUMNS):
+            return None
+        try:
+            row = {c: float(tokens[i]) for i, c in cls.IMB_COLUMNS.items()}
+        except ValueError:
+            return None
+        row["bytes"] = int(row["bytes"])
+        return row
+
     @classmethod
     def plot(cls, ax, df, x, y, linestyle, marker, color, label):
         ax.plot(df[x], df[y], linestyle=linestyle, marker=marker, label=label, color=color)
@@ -283,17 +519,31 @@ class IMBPing(IMB):
     BENCHMARK_NAME = None
     BENCHMARK_X = ['bytes']
     BENCHMARK_Y = ['latency', 'bandwidth']
+    IMB_COLUMNS = {0: "bytes", 2: "latency", 3: "bandwidth"}
+    BENCHMARK_DERIVED = {
+            "msgrate": "1e6 / latency"
+            }
 
     x_plt_label = {
             "bytes": "Message Size"
             }
     y_plt_label = {
             "latency": "Latency [usec]",
-            "bandwidth": "Bandwidth [MB/sec]"
+            "bandwidth": "Bandwidth [MB/sec]",
+            "msgrate": "Message Rate [msg/sec]"
             }
 
+    @classmethod
+    def parse_line(cls, state, line):
+        # like parse, skip zero byte messages
+        row = super().parse_line(state, line)
+        if row is not None and row["bytes"] == 0:
+            return None
+        return row
+
     @classmethod
     def parse(cls, output):
+        import pandas as pd
         f = super().parse(output)
         (bench, proc) = IMB.get_benchmark(f)
         dct = {
@@ -303,7 +553,7 @@ class IMBPing(IMB):
                 }
         if (bench, proc) == (None, None):
             logging.error("Wrong output for benchmark " + str(cls))
-            return pd.DataFrame(dct)
+            return cls.derive(pd.DataFrame(dct))
 
         while True:
             while True:
@@ -326,39 +576,58 @@ class IMBPing(IMB):
             if rv is None:
                 break
             ( b, p ) = rv
-            if b != bench or p != np:
+            if b != bench or p != proc:
                 break
     
-        return pp_data 
+        return cls.derive(pp_data)
 
 
 class IMBCollective(IMB):
     BENCHMARK_NAME = None
     BENCHMARK_X = ['bytes']
-    BENCHMARK_Y = ['avgtime']
+    BENCHMARK_Y = ['avgtime', 'mintime', 'maxtime']
+    IMB_COLUMNS = {0: "bytes", 2: "mintime", 3: "maxtime", 4: "avgtime"}
+    BENCHMARK_DERIVED = {
+            "bandwidth": "bytes / avgtime",
+            "imbalance": "maxtime / mintime",
+            "straggler": "(maxtime - avgtime) / avgtime"
+            }
 
     x_plt_label = {
             "bytes": "Message Size"
             }
     y_plt_label = {
-            "avgtime": "Latency [usec]"
+            "avgtime": "Latency [usec]",
+            "mintime": "Min Latency [usec]",
+            "maxtime": "Max Latency [usec]",
+            "bandwidth": "Effective Bandwidth [MB/sec]",
+            "imbalance": "Load Imbalance (max / min)",
+            "straggler": "Straggler Delay ((max - avg) / avg)"
             }
     
     @classmethod
-    def parse(cls, f):
-        f = cls.super().parse(output)
+    def parse(cls, output):
+        import pandas as pd
+        f = super().parse(output)
         (bench, proc) = IMB.get_benchmark(f)
+        dct = {
+                "bytes": [],
+                "mintime": [],
+                "maxtime": [],
+                "avgtime": []
+                }
+        if (bench, proc) == (None, None):
+            logging.error("Wrong output for benchmark " + str(cls))
+            return cls.derive(pd.DataFrame(dct))
 
         while True:
-            dct = {
-                    "bytes": [],
-                    "avgtime": []
-                    }
             while True:
                 tokens = IMB.my_readline(f)
                 if tokens == [] or tokens is None:
                     break;
                 dct["bytes"].append(int(tokens[0]))
+                dct["mintime"].append(float(tokens[2]))
+                dct["maxtime"].append(float(tokens[3]))
                 dct["avgtime"].append(float(tokens[4]))
 
             pp_data = pd.DataFrame(dct)
@@ -367,36 +636,48 @@ class IMBCollective(IMB):
             if rv is None:
                 break
             ( b, p ) = rv
-            if b != bench or p != np:
+            if b != bench or p != proc:
                 break
 
-        return pp_data
+        return cls.derive(pp_data)
 
 class IMBExchange(IMB):
     BENCHMARK_NAME = None
     BENCHMARK_X = ['bytes']
-    BENCHMARK_Y = ['latency', 'bandwidth']
+    BENCHMARK_Y = ['latency', 'mintime', 'maxtime', 'bandwidth']
+    IMB_COLUMNS = {0: "bytes", 2: "mintime", 3: "maxtime", 4: "latency", 5: "bandwidth"}
+    BENCHMARK_DERIVED = {
+            "imbalance": "maxtime / mintime",
+            "straggler": "(maxtime - latency) / latency"
+            }
 
     x_plt_label = {
             "bytes": "Length"
             }
     y_plt_label = {
             "latency": "Latency [usec]",
-            "bandwidth": "Bandwidth [MB/sec]"
+            "mintime": "Min Latency [usec]",
+            "maxtime": "Max Latency [usec]",
+            "bandwidth": "Bandwidth [MB/sec]",
+            "imbalance": "Load Imbalance (max / min)",
+            "straggler": "Straggler Delay ((max - avg) / avg)"
             }
 
     @classmethod
-    def parse(cls, f):
+    def parse(cls, output):
+        import pandas as pd
         f = super().parse(output)
         (bench, proc) = IMB.get_benchmark(f)
         dct = {
                 "bytes": [],
+                "mintime": [],
+                "maxtime": [],
                 "latency": [],
                 "bandwidth": []
                 }
         if (bench, proc) == (None, None):
             logging.error("Wrong output for benchmark " + str(cls))
-            return pd.DataFrame(dct)
+            return cls.derive(pd.DataFrame(dct))
 
         while True:
             while True:
@@ -404,6 +685,8 @@ class IMBExchange(IMB):
                 if tokens == [] or tokens is None:
                     break;
                 dct["bytes"].append(int(tokens[0]))
+                dct["mintime"].append(float(tokens[2]))
+                dct["maxtime"].append(float(tokens[3]))
                 dct["latency"].append(float(tokens[4]))
                 dct["bandwidth"].append(float(tokens[5]))
 
@@ -413,39 +696,49 @@ class IMBExchange(IMB):
             if rv is None:
                 break
             ( b, p ) = rv
-            if b != bench or p != np:
+            if b != bench or p != proc:
                 break
 
-        return pp_data
+        return cls.derive(pp_data)
 
 #TODO: Barrier must be parsed differently
 
 class IMBNBC(IMB):
     BENCHMARK_X = ['bytes']
-    BENCHMARK_Y = ['overlap', 'cpu', 'overlappercent']
+    BENCHMARK_Y = ['overlap', 'pure', 'cpu', 'overlappercent']
+    IMB_COLUMNS = {0: "bytes", 2: "overlap", 3: "pure", 4: "cpu", 5: "overlappercent"}
+    BENCHMARK_DERIVED = {
+            "overhead": "(overlap - cpu) / cpu",
+            "efficiency": "(pure + cpu - overlap) / pure"
+            }
 
     x_plt_label = {
             "bytes": "Length"
             }
     y_plt_label = {
             "overlap": "Overlap [usec]",
+            "pure": "Pure Communication [usec]",
             "cpu": "CPU [usec]",
-            "overlappercent": "Overlap [%]"
+            "overlappercent": "Overlap [%]",
+            "overhead": "CPU Overhead Ratio",
+            "efficiency": "Overlap Efficiency"
             }
 
     @classmethod
-    def parse(cls, f):
+    def parse(cls, output):
+        import pandas as pd
         f = super().parse(output)
         (bench, proc) = IMB.get_benchmark(f)
         dct = {
                 "bytes": [],
                 "overlap": [],
+                "pure": [],
                 "cpu": [],
                 "overlappercent": []
                 }
         if (bench, proc) == (None, None):
             logging.error("Wrong output for benchmark " + str(cls))
-            return pd.DataFrame(dct)
+            return cls.derive(pd.DataFrame(dct))
 
         while True:
             while True:
@@ -454,6 +747,7 @@ class IMBNBC(IMB):
                     break;
                 dct["bytes"].append(int(tokens[0]))
                 dct["overlap"].append(float(tokens[2]))
+                dct["pure"].append(float(tokens[3]))
                 dct["cpu"].append(float(tokens[4]))
                 dct["overlappercent"].append(float(tokens[5]))
 
@@ -463,10 +757,10 @@ class IMBNBC(IMB):
             if rv is None:
                 break
             ( b, p ) = rv
-            if b != bench or p != np:
+            if b != bench or p != proc:
                 break
 
-        return pp_data
+        return cls.derive(pp_data)
 
 class IMBPingPong(IMBPing):
     BENCHMARK_NAME = 'PingPong'
@@ -0,0 +1,38 @@
+import base64
+import json
+import pytest
+
+def result(te_name, output, fq_name=None, **comb):
+    """PCVS result of test te_name with output and comb iterators."""
+    fq_name = fq_name or te_name + "".join("_" + k + str(v) for k, v in sorted(comb.items()))
+    return {"id": {"te_name": te_name, "fq_name": fq_name, "comb": comb},
+            "data": {"tags": ["mpi"]},
+            "result": {"output": base64.b64encode(output.encode()).decode()}}
+
+@pytest.fixture
+def make_suite(tmp_path):
+    """Write a PCVS build directory name holding tests, a list of
+    results, and return its path with a trailing slash, as pcvsplot
+    takes it."""
+    def make(name, tests):
+        rawdata = tmp_path / name / "rawdata"
+        rawdata.mkdir(parents=True)
+        with open(rawdata / "results.json", 'w') as f:
+            json.dump({"tests": tests}, f)
+        return str(tmp_path / name) + "/"
+    return make
+
+@pytest.fixture
+def flags(tmp_path, monkeypatch):
+    """Parse pcvsplot command line flags, in tmp_path as working
+    directory so that figures and reports are written there."""
+    import pcvsplot
+    if pcvsplot.FLAGS is None:
+        pcvsplot.define_flags()
+    monkeypatch.chdir(tmp_path)
+    def parse(*args):
+        pcvsplot.FLAGS.unparse_flags()
+        pcvsplot.FLAGS(["pcvsplot"] + list(args))
+        return pcvsplot.FLAGS
+    yield parse
+    pcvsplot.FLAGS.unparse_flags()
@@ -0,0 +1,108 @@
+import logging
+
+class FigureExporter():
+    """Write each figure in all requested formats (default jpeg and pdf).
+    Raster formats are written from one rendering of the figure.
+
+    With multipage, PDF pages of all the metrics of a benchmark are
+    gathered in one book instead of one PDF file per metric.
+
+    matplotlib is only imported once a figure is actually written, so that
+    runs with all figures up to date do not pay for it."""
+
+    DEFAULT_FORMATS = ["jpeg", "pdf"]
+    # formats written from a single Agg rendering of a figure
+    RASTER_FORMATS = ["png", "jpg", "jpeg", "tif", "tiff", "webp"]
+    ALPHA_FORMATS = ["png", "tif", "tiff", "webp"]
+
+    def __init__(self, formats=None, dpi=None, multipage=False):
+        if formats is None:
+            formats = self.DEFAULT_FORMATS
+        self.formats   = [f.lower().lstrip(".") for f in formats]
+        self.dpi       = dpi
+        self.multipage = multipage and "pdf" in self.formats
+        self.book      = None
+        self.checked   = False
+
+    def check_formats(self):
+        from matplotlib.backend_bases import FigureCanvasBase
+        supported = FigureCanvasBase.get_supported_filetypes()
+        for f in self.formats:
+            if f not in supported:
+                raise ValueError("Unsupported figure format '" + f + "', "
+                        "choose from " + str(sorted(supported)))
+        self.checked = True
+
+    def params(self):
+        return (self.formats, self.dpi, self.multipage)
+
+    def fig_names(self, basename):
+        return [basename + "." + f for f in self.formats
+                if not (self.multipage and f == "pdf")]
+
+    def book_name(self, basename):
+        if self.multipage:
+            return basename + ".pdf"
+        return None
+
+    def figure_names(self, basename):
+        """Files of a figure plotted on its own, see save_figure."""
+        names = self.fig_names(basename)
+        book = self.book_name(basename)
+        return names + [book] if book is not None else names
+
+    def save_figure(self, fig, basename):
+        """Save a figure plotted on its own. With multipage, its PDF is a
+        book of a single page."""
+        book = self.book_name(basename)
+        if book is not None:
+            self.open_book(book)
+        self.save(fig, self.fig_names(basename))
+        if book is not None:
+            self.close_book()
+
+    def open_book(self, book_name):
+        from matplotlib.backends.backend_pdf import PdfPages
+        self.book = PdfPages(book_name)
+
+    def close_book(self):
+        self.book.close()
+        self.book = None
+
+    def save(self, fig, fig_names):
+        if not self.checked:
+            self.check_formats()
+        raster = [n for n in fig_names if n.rsplit(".", 1)[-1] in self.RASTER_FORMATS]
+        if raster:
+            self.save_raster(fig, raster)
+        # vector formats are drawn by their own backend
+        for fig_name in fig_names:
+            if fig_name not in raster:
+                fig.savefig(fig_name, dpi=self.dpi if self.dpi else "figure")
+        if self.book is not None:
+            self.book.savefig(fig)
+
+    def save_raster(self, fig, fig_names):
+        """Render fig once with Agg and write every raster format from
+        the same pixels."""
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from PIL import Image
+
+        canvas = fig.canvas
+        dpi = fig.dpi
+        try:
+            if self.dpi:
+                fig.set_dpi(self.dpi)
+            agg = canvas if isinstance(canvas, FigureCanvasAgg) else FigureCanvasAgg(fig)
+            agg.draw()
+            rgba = Image.frombuffer("RGBA", agg.get_width_height(), agg.buffer_rgba(),
+                    "raw", "RGBA", 0, 1)
+            # formats without alpha are composited on white, as by savefig
+            rgb = Image.new("RGB", rgba.size, "white")
+            rgb.paste(rgba, mask=rgba.getchannel("A"))
+            for fig_name in fig_names:
+                img = rgba if fig_name.rsplit(".", 1)[-1] in self.ALPHA_FORMATS else rgb
+                img.save(fig_name, dpi=(fig.dpi, fig.dpi))
+        finally:
+            fig.set_dpi(dpi)
+            fig.set_canvas(canvas)
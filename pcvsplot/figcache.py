@@ -0,0 +1,50 @@
+import hashlib
+import json
+import os
+import logging
+
+class FigureCache():
+    """Content-addressed record of the figures rendered in a directory.
+
+    Each figure file is associated with a digest of its parsed input
+    series and plot parameters. A figure whose digest did not change and
+    whose file still exists does not need to be rendered again."""
+
+    CACHE_FILE = ".pcvsplot_cache.json"
+
+    def __init__(self, outdir="."):
+        self.outdir  = outdir
+        self.path    = os.path.join(outdir, self.CACHE_FILE)
+        self.entries = {}
+        if os.path.isfile(self.path):
+            try:
+                with open(self.path, 'r') as f:
+                    self.entries = json.load(f)
+            except json.decoder.JSONDecodeError as err:
+                logging.warning("Ignoring corrupted figure cache " + self.path + ": " + str(err))
+
+    @staticmethod
+    def digest(series, *params):
+        import pandas as pd
+        h = hashlib.sha256()
+        for df in series:
+            h.update(repr(list(df.columns)).encode())
+            h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+        for p in params:
+            h.update(repr(p).encode())
+        return h.hexdigest()
+
+    def is_clean(self, fig_names, digest):
+        for fig_name in fig_names:
+            if self.entries.get(fig_name) != digest or \
+                    not os.path.isfile(os.path.join(self.outdir, fig_name)):
+                return False
+        return True
+
+    def update(self, fig_names, digest):
+        for fig_name in fig_names:
+            self.entries[fig_name] = digest
+
+    def save(self):
+        with open(self.path, 'w') as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
@@ -0,0 +1,37 @@
+import logging
+
+def normalize(df, x, ordinate, baseline):
+    """Values of ordinate relative to the baseline cell, a dict of comb
+    key to value, at the same abscissa."""
+    mask = None
+    for k, v in baseline.items():
+        if k not in df:
+            raise KeyError("Baseline key " + k + " is not an iterator of the tests")
+        mask = (df[k] == v) if mask is None else mask & (df[k] == v)
+    ref = df.loc[mask].groupby(x)[ordinate].mean()
+    if len(ref) == 0:
+        raise ValueError("No test matches baseline " + str(baseline))
+    return df[ordinate] / df[x].map(ref)
+
+def pivot(df, x, rows, cols, ordinate, baseline=None, size=None):
+    """Grid of ordinate over two dimensions of a sweep, each one a comb
+    key or the abscissa x. When x is not a dimension, either one size is
+    selected or cells hold the geometric mean over all sizes, so that
+    every size weighs the same whatever its scale."""
+    import numpy as np
+
+    if rows not in df or cols not in df:
+        raise KeyError("Cannot pivot on " + rows + " x " + cols + ", available: " +
+                str(list(df.columns)))
+    if size is not None:
+        df = df.loc[df[x] == size]
+        if len(df) == 0:
+            raise ValueError("No result for " + x + "=" + str(size))
+
+    values = df[ordinate] if baseline is None else normalize(df, x, ordinate, baseline)
+    with np.errstate(divide='ignore'):
+        df = df.assign(_log=np.log(values.astype(float)))
+    grid = df.pivot_table(index=rows, columns=cols, values="_log", aggfunc="mean")
+    logging.info("Pivoted " + ordinate + " on " + rows + " x " + cols + ": " +
+            str(grid.shape[0]) + "x" + str(grid.shape[1]) + " cells")
+    return np.exp(grid)
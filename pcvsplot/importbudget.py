@@ -0,0 +1,57 @@
+from absl import flags
+import json
+import os
+import subprocess
+import sys
+import logging
+logging.basicConfig()
+logging.getLogger().setLevel(logging.INFO)
+
+FLAGS = flags.FLAGS
+
+FORBIDDEN = ['pandas', 'numpy', 'matplotlib', 'absl']
+
+flags.DEFINE_float('budget', 0.5, 'Maximum import time of pcvsplot in seconds')
+flags.DEFINE_integer('repeat', 5, 'Number of measurements, the fastest one is kept')
+flags.DEFINE_list('forbidden', FORBIDDEN,
+        'Modules that must not be loaded by importing pcvsplot')
+
+# run in a fresh interpreter so that nothing is already imported
+probe = """
+import json, sys, time
+t = time.perf_counter()
+import pcvsplot
+t = time.perf_counter() - t
+print(json.dumps({"time": t, "modules": sorted(sys.modules)}))
+"""
+
+def measure():
+    rv = subprocess.run([sys.executable, "-c", probe], capture_output=True, text=True,
+            check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    return json.loads(rv.stdout.splitlines()[-1])
+
+def check(budget=0.5, forbidden=FORBIDDEN, repeat=5):
+    """Errors of the fastest of repeat imports of pcvsplot: forbidden
+    modules it loaded and import time over budget."""
+    results = [measure() for i in range(repeat)]
+    best = min(results, key=lambda r: r["time"])
+
+    errors = []
+    loaded = [m for m in forbidden if m in best["modules"]]
+    if loaded:
+        errors.append("Importing pcvsplot loads " + ", ".join(loaded))
+    if best["time"] > budget:
+        errors.append("Import time {:.3f}s exceeds budget {:.3f}s".format(best["time"], budget))
+    else:
+        logging.info("Import time {:.3f}s within budget {:.3f}s".format(best["time"], budget))
+    return errors
+
+def main():
+    errors = check(FLAGS.budget, FLAGS.forbidden, FLAGS.repeat)
+    for error in errors:
+        logging.error(error)
+    return 1 if errors else 0
+
+if __name__=="__main__":
+    FLAGS(sys.argv)
+    sys.exit(main())
@@ -0,0 +1,74 @@
+import json
+import os
+import logging
+import tests
+
+class ManifestError(Exception):
+    def __init__(self, message="Invalid manifest"):
+        self.message = message
+        super().__init__(self.message)
+
+class Manifest():
+    """Declarative list of PCVS suites and plot jobs (JSON or YAML).
+
+    {
+        "iterator": "n_ptl",
+        "suites": {
+            "lcp":  "/path/to/lcp/build/",
+            "ompi": {"path": "/path/to/ompi/build/", "iterator": "n_mpi"}
+        },
+        "jobs": [
+            {"mode": "list", "suites": ["lcp", "ompi"], "labels": ["lcp", "ompi"]}
+        ]
+    }
+
+    Suites are loaded lazily, at most once, the first time a job
+    references them, so that all jobs share the same tests and parsed
+    frames. on_load is called on each suite once it is built."""
+
+    # modes reading their own input instead of suites
+    NO_SUITE_MODES = ["overhead"]
+
+    def __init__(self, path, on_load=None):
+        with open(path, 'r') as f:
+            if path.endswith(".yml") or path.endswith(".yaml"):
+                import yaml
+                data = yaml.safe_load(f)
+            else:
+                data = json.load(f)
+
+        try:
+            self.iterator = data.get("iterator")
+            self.suites   = data["suites"]
+            self.jobs     = data["jobs"]
+        except KeyError as err:
+            raise ManifestError("Missing section " + str(err) + " in " + path)
+
+        for job in self.jobs:
+            if "mode" not in job:
+                raise ManifestError("Job without mode in " + path)
+            if job["mode"] not in self.NO_SUITE_MODES and not job.get("suites"):
+                raise ManifestError("Job " + job["mode"] + " without suites in " + path)
+            for name in job.get("suites", []):
+                if name not in self.suites:
+                    raise ManifestError("Job " + job["mode"] + " references "
+                            "undefined suite '" + name + "'")
+
+        self.on_load  = on_load
+        self.ts_cache = {}
+        logging.info("Loaded manifest: njobs=" + str(len(self.jobs)))
+
+    def suite(self, name):
+        if name not in self.ts_cache:
+            cfg = self.suites[name]
+            if isinstance(cfg, str):
+                cfg = {"path": cfg}
+            ts = tests.PCVSTestSuite(os.path.join(cfg["path"], ""))
+            ts.build(cfg.get("iterator", self.iterator))
+            if self.on_load is not None:
+                self.on_load(ts)
+            self.ts_cache[name] = ts
+        return self.ts_cache[name]
+
+    def job_suites(self, job):
+        return [self.suite(name) for name in job.get("suites", [])]
@@ -0,0 +1,114 @@
+import json
+import benchmarks
+
+def _wls(s):
+    """Weighted least squares T = alpha + beta * m from the sums of the
+    columns of s (w, x, y, xx, xy, yy), one row per fit. Returns alpha,
+    beta, the weighted sum of squared residuals and the total sum of
+    squares."""
+    den   = s["w"] * s["xx"] - s["x"] * s["x"]
+    beta  = (s["w"] * s["xy"] - s["x"] * s["y"]) / den
+    alpha = (s["y"] - beta * s["x"]) / s["w"]
+    sse   = s["yy"] - alpha * s["y"] - beta * s["xy"]
+    sst   = s["yy"] - s["y"] * s["y"] / s["w"]
+    return alpha, beta, sse.clip(lower=0), sst
+
+def _terms(df, x, y, relative):
+    import pandas as pd
+    X = df[x].astype(float)
+    Y = df[y].astype(float)
+    # relative errors, so that small messages weigh as much as large ones
+    W = 1.0 / (Y * Y) if relative else pd.Series(1.0, index=df.index)
+    return pd.DataFrame({"w": W, "x": W * X, "y": W * Y,
+        "xx": W * X * X, "xy": W * X * Y, "yy": W * Y * Y}, index=df.index)
+
+def stack(frames, x="bytes", y="latency"):
+    """Stack parsed frames keyed by test uname into one frame with a uname
+    column, dropping points without a positive metric."""
+    import pandas as pd
+    df = pd.concat([d[[x, y]] for d in frames.values()], keys=list(frames.keys()),
+            names=["uname", "row"]).reset_index(level="uname")
+    df = df.loc[df[y] > 0]
+    return df.sort_values(["uname", x], kind="stable")
+
+def fit_hockney(df, x="bytes", y="latency", relative=True):
+    """Fit the Hockney model T = alpha + beta * m for every uname of a
+    stacked frame at once. alpha is in usec, beta in usec/byte and the
+    asymptotic bandwidth 1 / beta in MB/sec."""
+    import pandas as pd
+    s = _terms(df, x, y, relative).groupby(df["uname"], sort=False).sum()
+    alpha, beta, sse, sst = _wls(s)
+    return pd.DataFrame({"alpha": alpha, "beta": beta, "bandwidth": 1.0 / beta,
+        "r2": 1.0 - sse / sst})
+
+def fit_piecewise(df, x="bytes", y="latency", relative=True):
+    """Fit two Hockney segments, eager up to a breakpoint size and
+    rendezvous above it, for every uname of a stacked frame at once.
+
+    All breakpoints are evaluated together from cumulative sums over the
+    sizes of each curve, each segment needing at least two points, and
+    the one with the smallest residual is kept."""
+    import numpy as np
+    import pandas as pd
+    terms = _terms(df, x, y, relative)
+    group = terms.groupby(df["uname"], sort=False)
+    left  = group.cumsum()
+    right = group.transform("sum") - left
+
+    a_l, b_l, sse_l, sst = _wls(left)
+    a_r, b_r, sse_r, sst = _wls(right)
+    sse = (sse_l + sse_r).where((left["w"] > 0) & (right["w"] > 0))
+    npoints = group.cumcount() + 1
+    ntotal  = group["w"].transform("size")
+    sse = sse.where((npoints >= 2) & (ntotal - npoints >= 2), np.inf)
+
+    fits = pd.DataFrame({"uname": df["uname"], "breakpoint": df[x],
+        "alpha_eager": a_l, "beta_eager": b_l, "alpha_rndv": a_r, "beta_rndv": b_r,
+        "sse": sse}).reset_index(drop=True)
+    best = fits.loc[fits.groupby("uname", sort=False)["sse"].idxmin()].set_index("uname")
+
+    s = group.sum()
+    sst = s["yy"] - s["y"] * s["y"] / s["w"]
+    best["r2"] = 1.0 - best["sse"] / sst
+    best.loc[np.isinf(best["sse"]), ["breakpoint", "alpha_eager", "beta_eager",
+        "alpha_rndv", "beta_rndv", "r2"]] = np.nan
+    return best.drop(columns="sse")
+
+def predict(params, sizes):
+    """Latency predicted by a row of fit_piecewise, or of fit_hockney when
+    no breakpoint was found."""
+    import numpy as np
+    sizes = np.asarray(sizes, dtype=float)
+    if "breakpoint" in params and not np.isnan(params["breakpoint"]):
+        return np.where(sizes <= params["breakpoint"],
+                params["alpha_eager"] + params["beta_eager"] * sizes,
+                params["alpha_rndv"] + params["beta_rndv"] * sizes)
+    return params["alpha"] + params["beta"] * sizes
+
+def fit_frames(frames, x="bytes", y="latency", relative=True):
+    """Hockney and piecewise parameters of each frame, indexed by uname."""
+    df = stack(frames, x, y)
+    hockney   = fit_hockney(df, x, y, relative)
+    piecewise = fit_piecewise(df, x, y, relative)
+    return hockney.join(piecewise, rsuffix="_piecewise")
+
+def fit_suite(ts, metric="latency", relative=True):
+    """Fit all tests of a built PCVSTestSuite whose benchmark reports
+    metric. Returns one row per test with its benchmark and comb config."""
+    import pandas as pd
+    tables = []
+    for key in ts.testsuite:
+        b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+        if b is None or metric not in b.BENCHMARK_Y:
+            continue
+
+        frames = {t.uname: ts.parse(b, t) for t in ts.testsuite[key]}
+        table  = fit_frames(frames, b.BENCHMARK_X[0], metric, relative)
+        configs = {t.uname: json.dumps(t.comb, sort_keys=True) for t in ts.testsuite[key]}
+        table.insert(0, "config", table.index.map(configs))
+        table.insert(0, "benchmark", key)
+        tables.append(table)
+
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables)
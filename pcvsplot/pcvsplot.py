@@ -1,76 +1,188 @@
-from absl import flags
 import benchmarks
 import tests
+import store
+import figcache
+import export
+import manifest
+import analysis
+import models
+import grid
+import scaling
 import sys
-import numpy as np
-import matplotlib.pyplot as plt
 import logging
 logging.basicConfig()
 logging.getLogger().setLevel(logging.INFO)
 
-FLAGS = flags.FLAGS
-
-flags.DEFINE_string('pcvsdir', None, 'Path to PCVS build directory')
-flags.DEFINE_string('iterator', None, 'PCVS iterator defined in profile') 
-flags.DEFINE_string('mpcdir', None, 'Path to mpc results build directory')
-flags.DEFINE_string('select', None, 'Name of the benchmark to select')
-flags.DEFINE_list('pcvslist', None, 'Path to multiple PCVS build directories')
-flags.DEFINE_boolean('output', False, 'Output the results in csv files')
+FLAGS = None
+
+def define_flags():
+    """Define the command line flags. absl is only imported when pcvsplot
+    runs as a script, so that importing its functions stays cheap."""
+    global FLAGS
+    from absl import flags
+
+    flags.DEFINE_string('pcvsdir', None, 'Path to PCVS build directory')
+    flags.DEFINE_string('iterator', None, 'PCVS iterator defined in profile') 
+    flags.DEFINE_string('mpcdir', None, 'Path to mpc results build directory')
+    flags.DEFINE_string('select', None, 'Name of the benchmark to select')
+    flags.DEFINE_list('pcvslist', None, 'Path to multiple PCVS build directories')
+    flags.DEFINE_list('labels', None, 'Curve labels, in order of the tests of --pcvslist')
+    flags.DEFINE_boolean('output', False, 'Output the results in csv files')
+    flags.DEFINE_boolean('replot', False, 'Render all figures even if their inputs did not change')
+    flags.DEFINE_list('formats', ['jpeg', 'pdf'], 'Figure formats to export (e.g. pdf,svg,png)')
+    flags.DEFINE_integer('dpi', None, 'Resolution of raster figure formats')
+    flags.DEFINE_boolean('multipage', False, 'Export one multi-page PDF per benchmark instead of one PDF per metric')
+    flags.DEFINE_boolean('outliers', False, 'Flag points deviating from the local trend of their curve')
+    flags.DEFINE_integer('outlier_window', 5, 'Number of message sizes of the rolling median trend')
+    flags.DEFINE_float('outlier_threshold', 0.5, 'Relative deviation from the trend flagged as outlier')
+    flags.DEFINE_boolean('exclude_outliers', False, 'Exclude flagged points from speedup ratios')
+    flags.DEFINE_boolean('fit', False, 'Fit Hockney and eager/rendezvous latency models, overlay them on plots')
+    flags.DEFINE_string('fit_metric', 'latency', 'Metric fitted by the latency models')
+    flags.DEFINE_string('store', None, 'Path to result store, ingest --pcvslist into it')
+    flags.DEFINE_string('campaign_date', None, 'Campaign date stored with results (default: today)')
+    flags.DEFINE_string('mpc_commit', None, 'MPC commit stored with results')
+    flags.DEFINE_string('manifest', None, 'Path to a JSON/YAML manifest of suites and plot jobs')
+    flags.DEFINE_enum('scaling', None, scaling.MODES, 'Plot strong or weak scaling of --pcvslist against process count')
+    flags.DEFINE_string('scaling_procs', None, 'Iterator holding the process count (default: IMB #processes header)')
+    flags.DEFINE_list('scaling_by', None, 'Iterators of the scaling curves (e.g. a transport iterator)')
+    flags.DEFINE_list('scaling_bytes', None, 'Message sizes of the scaling curves (default: largest size)')
+    flags.DEFINE_string('overhead', None, 'Path to a launch times CSV of runner overhead, plot it')
+    flags.DEFINE_integer('jobs', 1, 'Number of processes parsing all outputs when a suite is loaded (1: parse plotted tests lazily, 0: all cores)')
+    flags.DEFINE_string('quarantine', 'quarantine.csv', 'Path of the report of tests that could not be loaded or parsed')
+    flags.DEFINE_list('where', None, 'Only plot tests whose iterators take these values (e.g. rndv_mode=1,n_mpi=2)')
+    flags.DEFINE_list('group_by', None, 'Plot one curve per combination of these iterators, averaging other ones')
+    flags.DEFINE_list('heatmap', None, 'Plot heatmaps over two iterators, or an iterator and bytes (e.g. n_ptl,rndv_mode)')
+    flags.DEFINE_string('metric', None, 'Metric of heatmaps and grouped plots (default: first metric of the benchmark)')
+    flags.DEFINE_list('heatmap_baseline', None, 'Baseline cell of heatmaps (e.g. n_ptl=1,rndv_mode=0)')
+    flags.DEFINE_integer('heatmap_bytes', None, 'Message size of heatmaps (default: geometric mean over sizes)')
+
+    FLAGS = flags.FLAGS
 
 colors = ['b', 'r', 'c', 'm', 'y', 'k', 'w'] 
 markers = ['o', 'x', 'd', '*', '<', '>', '.']
 
-def plot_list():
+def analyse_suite(ts):
+    if FLAGS.jobs != 1:
+        ts.parse_all(FLAGS.jobs or None)
+    if FLAGS.outliers:
+        analysis.flag_suite_outliers(ts, FLAGS.outlier_window, FLAGS.outlier_threshold)
 
-    # read all test suites
+def load_suites(dirs, it):
     ts_list = []
-    for d in FLAGS.pcvslist:
+    for d in dirs:
         ts = tests.PCVSTestSuite(d)
-        ts.build(FLAGS.iterator)
+        ts.build(it)
+        analyse_suite(ts)
         ts_list.append(ts)
+    return ts_list
+
+def merge_labels(labels, t_labels):
+    """User labels first, default test labels for the remaining curves."""
+    if not labels:
+        return t_labels
+    return labels + t_labels[len(labels):]
+
+def test_label(ts, t):
+    """Default curve label: build directory and iterator value."""
+    label = ts.name
+    if hasattr(t, "it_value"):
+        label += " " + str(t.it_value)
+    return label
+
+def render_benchmark(cache, exporter, b, key, suffix, title, data, labels):
+    """Plot one figure per metric of benchmark b with one curve per parsed
+    frame of data. Figures whose inputs did not change are skipped."""
+    if len(data) == 0:
+        return
+    x = b.BENCHMARK_X[0]
+
+    figs = {}
+    for ordinate in b.BENCHMARK_Y:
+        cols = [x, ordinate, analysis.outlier_column(ordinate)]
+        digest = cache.digest([d[[c for c in cols if c in d]] for d in data],
+                b.__name__, ordinate, title, labels, markers, colors, exporter.params(),
+                FLAGS.fit and ordinate == FLAGS.fit_metric)
+        figs[ordinate] = (exporter.fig_names(key + "_" + ordinate + suffix), digest)
+
+    # a multi-page book is rewritten as a whole when any of its pages changed
+    book = exporter.book_name(key + suffix)
+    if book is not None:
+        book_digest = cache.digest([], *[figs[o][1] for o in b.BENCHMARK_Y])
+        if FLAGS.replot or not cache.is_clean([book], book_digest):
+            exporter.open_book(book)
+
+    # loop over all metrics of the benchmark
+    for ordinate in b.BENCHMARK_Y:
+        fig_names, digest = figs[ordinate]
+        if not FLAGS.replot and exporter.book is None and cache.is_clean(fig_names, digest):
+            logging.info("Up to date " + b.__name__ + " with " + ordinate)
+            continue
+        logging.info("Plotting " + b.__name__ + " with " + ordinate)
+        import matplotlib.pyplot as plt
+
+        # Init plot
+        fig, ax = plt.subplots(1,1)
+        ax.grid()
+
+        for nplot, d in enumerate(data):
+            b.plot(ax, d, x, ordinate, 'dashed', markers[nplot % len(markers)],
+                    colors[nplot % len(colors)], labels[nplot])
+
+            # overlay fitted latency model
+            # (no fit without a positive value of the metric)
+            fits = models.fit_frames({labels[nplot]: d}, x, ordinate) \
+                    if FLAGS.fit and ordinate == FLAGS.fit_metric and len(d) > 0 else []
+            if len(fits) > 0:
+                ax.plot(d[x], models.predict(fits.iloc[0], d[x]), linestyle='dotted',
+                        color=colors[nplot % len(colors)])
+
+            # circle flagged outliers
+            o_col = analysis.outlier_column(ordinate)
+            if o_col in d:
+                o = d.loc[d[o_col]]
+                ax.plot(o[x], o[ordinate], linestyle='none', marker='o', markersize=12,
+                        markerfacecolor='none', markeredgecolor='r')
+
+        ax.set_title(title)
+        exporter.save(fig, fig_names)
+        plt.close('all')
+        cache.update(fig_names, digest)
+
+    if exporter.book is not None:
+        exporter.close_book()
+        cache.update([book], book_digest)
+
+def plot_list(cache, exporter, ts_list, labels=None, suffix="_multi_siam_cse", where=None):
+
+    where = where or {}
 
     # loop over all benchmarks 
     for key in ts_list[0].testsuite:
 
         b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+        if b is None:
+            continue
 
-        # loop over all metrics of the benchmark
-        for ordinate in b.BENCHMARK_Y:
-            logging.info("Plotting " + b.__name__ + " with " + ordinate)
-
-            # Init plot
-            fig, ax = plt.subplots(1,1)
-            ax.grid()
+        # parse all tests of all test suites once
+        data = []
+        t_labels = []
+        for ts in ts_list:
+            for t in ts.select(key, **where):
+                d = ts.parse(b, t)
+                #d = d.loc[d["bytes"] <= 64*1024]
+                if FLAGS.output:
+                    d.to_csv("csv_" + t.uname + ".csv")
+                data.append(d)
+                t_labels.append(test_label(ts, t))
+        if len(data) == 0:
+            continue
 
-            nplot = 0
-            # loop over all test suites
-            for ts in ts_list:
+        render_benchmark(cache, exporter, b, key, suffix, b.BENCHMARK_NAME + "",
+                data, merge_labels(labels, t_labels))
 
-                # loop over all tests in the test suite
-                labels = ["lcp multi", "ompi btl bxi", "old"]
-                for t in ts.testsuite[key]:
-                    d = b.parse(t.output)
-                    #d = d.loc[d["bytes"] <= 64*1024]
-                    if FLAGS.output:
-                        d.to_csv("csv_" + t.uname + ".csv")
-                    b.plot(ax, d, b.BENCHMARK_X[0], ordinate, 'dashed', markers[nplot], colors[nplot], labels[nplot])
-                    nplot = nplot + 1 
-
-            ax.set_title(b.BENCHMARK_NAME + "")
-            fig_name = t.name + "_" + ordinate + "_multi_siam_cse" + ".jpeg"
-            plt.savefig(fig_name)
-            fig_name = t.name + "_" + ordinate + "_multi_siam_cse" + ".pdf"
-            plt.savefig(fig_name)
-            plt.close('all')
+    cache.save()
 
-def plot_speedup():
-    # read all test suites
-    ts_list = []
-    i = 0
-    for d in FLAGS.pcvslist:
-        ts = tests.PCVSTestSuite(d)
-        ts.build(FLAGS.iterator)
-        ts_list.append(ts)
+def plot_speedup(cache, exporter, ts_list, labels=None, suffix="_speedup", where=None):
 
     def chunks(lst, n):
         """Yield successive n-sized chunks from lst."""
@@ -82,79 +194,64 @@ def plot_speedup():
     for key in ts_list[0].testsuite:
 
         b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+        if b is None:
+            continue
 
-        # loop over all metrics of the benchmark
-        for ordinate in b.BENCHMARK_Y:
-            logging.info("Plotting " + b.__name__ + " with " + ordinate)
-
-            # Init plot
-            fig, ax = plt.subplots(1,1)
-            ax.grid()
-
-            nplot = 0
-            # loop over all test suites
-            for ts_speedup in ts_list_speedup:
-                ts_4nic = ts_speedup[0]
-                ts_1nic = ts_speedup[1]
-                # loop over all tests in the test suite
-                labels = ["lcp offload rput ", "lcp offload rget", "lcp am rput", "lcp am rget", "ompi btl ptl4", "ompi btl bxi"]
-                for t4nic, t1nic in zip(ts_4nic.testsuite[key], ts_1nic.testsuite[key]):
-                    d4nic = b.parse(t4nic.output)
-                    d1nic = b.parse(t1nic.output)
-                    d = d4nic
-                    d[ordinate] = d4nic[ordinate]/d1nic[ordinate]
-                    if FLAGS.output:
-                        d.to_csv("csv_" + t4nic.uname + ".csv")
-                    b.plot(ax, d, b.BENCHMARK_X[0], ordinate, 'dashed', markers[nplot], colors[nplot], labels[nplot])
-                    nplot = nplot + 1 
-
-            ax.set_title(b.BENCHMARK_NAME + " speedup")
-            fig_name = t4nic.name + "_" + ordinate + "_speedup" + ".jpeg"
-            plt.savefig(fig_name)
-            fig_name = t4nic.name + "_" + ordinate + "_speedup" + ".pdf"
-            plt.savefig(fig_name)
-            plt.close('all')
-
-def plot_dev_vs_lcp_all():
-    # Init testsuite
-    ts_mpc = tests.PCVSTestSuite(FLAGS.mpcdir)
-    ts_lcp = tests.PCVSTestSuite(FLAGS.pcvsdir)
-
-    # Build testsuite
-    ts_mpc.build(FLAGS.iterator)
-    ts_lcp.build(FLAGS.iterator)
+        # parse all pairs of tests once and compute speedup of all metrics
+        data = []
+        t_labels = []
+        for ts_speedup in ts_list_speedup:
+            ts_4nic = ts_speedup[0]
+            ts_1nic = ts_speedup[1]
+            for t4nic, t1nic in zip(ts_4nic.select(key, **(where or {})),
+                    ts_1nic.select(key, **(where or {}))):
+                d4nic = ts_4nic.parse(b, t4nic)
+                d1nic = ts_1nic.parse(b, t1nic)
+                d = d4nic.copy()
+                d[b.BENCHMARK_Y] = d4nic[b.BENCHMARK_Y]/d1nic[b.BENCHMARK_Y]
+                for ordinate in b.BENCHMARK_Y:
+                    o_col = analysis.outlier_column(ordinate)
+                    if o_col not in d:
+                        continue
+                    d[o_col] = d4nic[o_col] | d1nic[o_col]
+                    if FLAGS.exclude_outliers:
+                        d.loc[d[o_col], ordinate] = float("nan")
+                        d[o_col] = False
+                if FLAGS.output:
+                    d.to_csv("csv_" + t4nic.uname + ".csv")
+                data.append(d)
+                t_labels.append(test_label(ts_4nic, t4nic))
+
+        render_benchmark(cache, exporter, b, key, suffix, b.BENCHMARK_NAME + " speedup",
+                data, merge_labels(labels, t_labels))
+
+    cache.save()
+
+def plot_dev_vs_lcp_all(cache, exporter, ts_mpc, ts_lcp, labels=None, suffix=""):
 
     for key in ts_mpc.testsuite:
         # Get benchmark class to apply specific parser
         b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+        if b is None:
+            continue
 
-        for ordinate in b.BENCHMARK_Y:
-            logging.info("Plotting " + b.__name__ + " with " + ordinate)
-
-            # Init plot
-            fig, ax = plt.subplots(1,1)
-            ax.grid()
+        # first parse lcp all, then dev
+        data = []
+        t_labels = []
+        for t in ts_lcp.testsuite.get(key, []):
+            data.append(ts_lcp.parse(b, t))
+            t_labels.append(test_label(ts_lcp, t))
+        for t in ts_mpc.testsuite[key]:
+            data.append(ts_mpc.parse(b, t))
+            t_labels.append("ompi")
+        render_benchmark(cache, exporter, b, key, suffix, b.BENCHMARK_NAME,
+                data, merge_labels(labels, t_labels))
 
-            # first parse and plot lcp all
-            nplot = 0
-            labels = ["rwrma", "rget", "rput"]
-            for t in ts_lcp.testsuite[key]:
-                d = b.parse(t.output)
-                b.plot(ax, d, b.BENCHMARK_X[0], ordinate, 'dashed', markers[nplot], colors[nplot], labels[nplot])
-                #b.plot(ax, d, b.BENCHMARK_X[0], ordinate, markers[nplot], colors[nplot], "dev")
-                nplot = nplot + 1
-
-            # first parse and plot dev
-            for t in ts_mpc.testsuite[key]:
-                d = b.parse(t.output)
-                b.plot(ax, d, b.BENCHMARK_X[0], ordinate, 'dashed', markers[nplot+1], colors[nplot+1], "ompi")
-
-            ax.set_title(b.BENCHMARK_NAME)
-            fig_name = t.name + "_" + ordinate + ".pdf"
-            plt.savefig(fig_name)
-            plt.close('all')
+    cache.save()
 
 def plot_dev_vs_lcp():
+    import matplotlib.pyplot as plt
+
     # Init testsuite
     ts_mpc = tests.PCVSTestSuite(FLAGS.mpcdir)
     ts_lcp = tests.PCVSTestSuite(FLAGS.pcvsdir)
@@ -172,6 +269,8 @@ def plot_dev_vs_lcp():
 
         # Get benchmark class to apply specific parser
         benchclass = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=t1.name)
+        if benchclass is None:
+            continue
 
         # Instanciate benchmark
         b1 = benchclass(t1.output)
@@ -215,61 +314,339 @@ def plot_dev_vs_lcp():
             plt.savefig(fig_name)
             plt.close('all')
 
-def plot_n_ptl():
-    # Init testsuite
-    ts = tests.PCVSTestSuite(FLAGS.pcvsdir)
+def plot_n_ptl(cache, exporter, ts, it, key=None, ordinate="bandwidth", title=None,
+        where=None, suffix=""):
+    """One curve per value of iterator it, or per combination of values
+    of a list of iterators. Tests of a curve differing by other iterators
+    are averaged."""
+    # select benchmark, default to the first one of the test suite
+    if key is None:
+        key = next(iter(ts.testsuite))
+    b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+    if b is None:
+        return
+    keys = it if isinstance(it, list) else [it]
+    x = b.BENCHMARK_X[0]
+    ordinate = ordinate or b.BENCHMARK_Y[0]
+
+    data = []
+    labels = []
+    for values, group in ts.groupby(keys, key, **(where or {})):
+        frames = [ts.parse(b, t) for t in group]
+        d = frames[0]
+        if len(frames) > 1:
+            import pandas as pd
+            d = pd.concat(frames).groupby(x, as_index=False)[b.BENCHMARK_Y].mean()
+        #d = d.loc[d["bytes"] >= 64*1024*1024]
+        data.append(d)
+        labels.append(",".join(k + "=" + str(v) for k, v in zip(keys, values)))
+
+    it = "_".join(keys)
+    name = key + "_" + str(it) + "_" + ts.name + suffix
+    fig_names = exporter.figure_names(name)
+    digest = cache.digest([d[[x, ordinate]] for d in data],
+            b.__name__, ordinate, title, labels, markers, colors, exporter.params())
+    if not FLAGS.replot and cache.is_clean(fig_names, digest):
+        logging.info("Up to date " + b.__name__ + " with " + str(it))
+        return
+    logging.info("Plotting " + b.__name__ + " with " + str(it))
+    import matplotlib.pyplot as plt
 
-    # Build testsuite
-    ts.build(FLAGS.iterator)
-    
     fig, ax = plt.subplots(1,1)
     ax.grid()
-    i=0
-    for t in ts.testsuite:
-        # Get benchmark class to apply specific parser
-        benchclass = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=t.name)
+    for i, d in enumerate(data):
+        b.plot(ax, d, x, ordinate, 'dashed', markers[i % len(markers)],
+                colors[i % len(colors)], labels[i])
 
-        # Instanciate benchmark
-        bench = benchclass(t.output)
+    ax.set_title(title or b.BENCHMARK_NAME)
+    exporter.save_figure(fig, name)
+    plt.close('all')
+    cache.update(fig_names, digest)
+    cache.save()
+
+def parse_cell(cell_list):
+    """Iterator values from a list of key=value, values parsed as JSON."""
+    import json
+    if not cell_list:
+        return None
+    cell = {}
+    for kv in cell_list:
+        k, v = kv.split("=", 1)
+        try:
+            cell[k] = json.loads(v)
+        except json.decoder.JSONDecodeError:
+            cell[k] = v
+    return cell
+
+def plot_heatmap(cache, exporter, ts, key, rows, cols, ordinate=None, baseline=None,
+        size=None, title=None, where=None):
+    """Heatmap of a benchmark metric over two dimensions of the sweep of
+    suite ts, relative to the baseline cell when one is given."""
+    b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+    if b is None:
+        return
+    x = b.BENCHMARK_X[0]
+    ordinate = ordinate or b.BENCHMARK_Y[0]
+
+    try:
+        df = ts.frame(b, key, **(where or {}))
+        g = grid.pivot(df, x, rows, cols, ordinate, baseline, size)
+    except (KeyError, ValueError) as err:
+        logging.warning("Skipping heatmap of " + key + ": " + str(err))
+        return
+
+    suffix = "_heatmap_" + rows + "_" + cols + "_" + ts.name
+    name = key + "_" + ordinate + suffix
+    fig_names = exporter.figure_names(name)
+    digest = cache.digest([g.reset_index()], b.__name__, ordinate, rows, cols,
+            baseline, size, title, where, exporter.params())
+    if not FLAGS.replot and cache.is_clean(fig_names, digest):
+        logging.info("Up to date " + b.__name__ + " heatmap of " + ordinate)
+        return
+    logging.info("Plotting " + b.__name__ + " heatmap of " + ordinate)
+    import matplotlib.pyplot as plt
 
-        # Parse output and get DataFrame
-        data = bench.parse()
-        #data = data.loc[data["bytes"] >= 64*1024*1024]
-
-        # Plot
-        bench.plot(ax, data, bench.BENCHMARK_X[0], "bandwidth", markers[i], colors[i], "n ptl="+str(t.it_value))
-        i = i + 1
-
-    ax.set_ylabel('Bandwidth [MB/sec]')
-    ax.set_xlabel('Message Size')
-    xticks = [d for d in data["bytes"][0::4]]
-    xtick_labels = []
-    for d in xticks:
-        if d < 1024:
-            tik = str(int(d)) + "B"
-        elif d < 1024*1024:
-            tik = str(int(d/1024)) + "kB"
-        elif d < 1024*1024*1024:
-            tik = str(int(d/(1024*1024))) + "MB"
-        else:
-            tik = str(int(d/(1024*1024*1024))) + "GB"
-        xtick_labels.append(tik)
+    fig, ax = plt.subplots(1,1)
+    im = ax.imshow(g.values, aspect='auto', origin='lower', cmap='viridis')
+    label = ordinate if baseline is None else ordinate + " / baseline"
+    fig.colorbar(im, ax=ax, label=label)
+    ax.set_xticks(range(len(g.columns)))
+    ax.set_xticklabels([str(c) for c in g.columns], rotation=90 if len(g.columns) > 8 else 0)
+    ax.set_yticks(range(len(g.index)))
+    ax.set_yticklabels([str(r) for r in g.index])
+    ax.set_xlabel(cols)
+    ax.set_ylabel(rows)
+
+    # annotate cells while they stay readable
+    if g.size <= 400:
+        for i in range(g.shape[0]):
+            for j in range(g.shape[1]):
+                if g.isna().values[i, j]:
+                    continue
+                ax.text(j, i, "{:.3g}".format(g.values[i, j]), ha='center', va='center',
+                        color='w', fontsize='x-small')
+
+    if title is None:
+        title = b.BENCHMARK_NAME
+        if size is not None:
+            title += " " + x + "=" + str(size)
+    ax.set_title(title)
+    exporter.save_figure(fig, name)
+    plt.close('all')
+    cache.update(fig_names, digest)
+    cache.save()
+
+def plot_scaling(cache, exporter, ts_list, mode="strong", procs_key=None, by=None,
+        sizes=None, ordinate=None, suffix="_scaling"):
+    """Speedup and parallel efficiency against process count of every
+    benchmark of the suites, one curve per suite, group of by iterators
+    and message size."""
+    keys = []
+    for ts in ts_list:
+        keys += [k for k in ts.testsuite if k not in keys]
+
+    for key in keys:
+        b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+        if b is None:
+            continue
+        x = b.BENCHMARK_X[0]
+        y = ordinate or b.BENCHMARK_Y[0]
+        try:
+            df = scaling.scaling_frame(ts_list, b, key, procs_key)
+            if len(df) == 0 or df[scaling.NPROCS].nunique() < 2:
+                logging.warning("Skipping scaling of " + key + ": less than two process counts")
+                continue
+            s = scaling.scaling(df, x, y, by, mode)
+        except (KeyError, ValueError) as err:
+            logging.warning("Skipping scaling of " + key + ": " + str(err))
+            continue
+        if FLAGS.output:
+            s.to_csv("csv_" + key + "_" + y + suffix + ".csv")
+
+        plot_sizes = [int(v) for v in sizes] if sizes else [s[x].max()]
+        s = s.loc[s[x].isin(plot_sizes)]
+        curves = scaling.curve_keys(s, by) + [x]
+        groups = list(s.groupby(curves, sort=True, dropna=False))
+
+        for metric in [scaling.EFFICIENCY, scaling.SPEEDUP]:
+            name = key + "_" + y + "_" + metric + suffix
+            fig_names = exporter.figure_names(name)
+            digest = cache.digest([s], b.__name__, y, metric, mode, by, plot_sizes,
+                    markers, colors, exporter.params())
+            if not FLAGS.replot and cache.is_clean(fig_names, digest):
+                logging.info("Up to date " + b.__name__ + " " + metric)
+                continue
+            logging.info("Plotting " + b.__name__ + " " + mode + " scaling " + metric)
+            import matplotlib.pyplot as plt
 
-    ax.set_xticks(ticks=xticks, labels=xtick_labels)
+            fig, ax = plt.subplots(1,1)
+            ax.grid()
+            for i, (values, d) in enumerate(groups):
+                label = " ".join(k + "=" + str(v) for k, v in zip(curves, values))
+                ax.plot(d[scaling.NPROCS], d[metric], linestyle='dashed',
+                        marker=markers[i % len(markers)], color=colors[i % len(colors)],
+                        label=label)
+
+            # ideal scaling
+            p = s[scaling.NPROCS].drop_duplicates().sort_values()
+            ideal = [1.0] * len(p) if metric == scaling.EFFICIENCY else p / p.iloc[0]
+            ax.plot(p, ideal, linestyle='dotted', color='k', label="ideal")
+            ax.set_xscale('log', base=2)
+            ax.set_xlabel(scaling.NPROCS)
+            ax.set_ylabel(metric + " (" + y + ")")
+            ax.legend()
+            ax.set_title(b.BENCHMARK_NAME + " " + mode + " scaling")
+            exporter.save_figure(fig, name)
+            plt.close('all')
+            cache.update(fig_names, digest)
+
+    cache.save()
+
+OVERHEAD_COLUMNS = ["rep", "launch", "direct", "overhead", "exit_code"]
+
+def plot_overhead(cache, exporter, path, x="n", ordinate="overhead", title=None):
+    """Launch time of the runner overhead mode against the number of
+    processes: mean with min/max bars over repetitions, one curve per
+    combination of the other swept keys."""
+    import pandas as pd
+    df = pd.read_csv(path)
+    failed = df["exit_code"] != 0
+    if failed.any():
+        logging.warning("Ignoring " + str(int(failed.sum())) + " failed launches of " + path)
+    df = df.loc[~failed]
+    keys = [c for c in df.columns if c not in OVERHEAD_COLUMNS and c != x]
+
+    stats = df.groupby(keys + [x])[ordinate].agg(["mean", "min", "max"]).reset_index()
+    name = "launch_" + ordinate + "_" + x
+    fig_names = exporter.figure_names(name)
+    digest = cache.digest([stats], ordinate, x, title, markers, colors, exporter.params())
+    if not FLAGS.replot and cache.is_clean(fig_names, digest):
+        logging.info("Up to date launch " + ordinate)
+        return
+    logging.info("Plotting launch " + ordinate + " of " + path)
+    import matplotlib.pyplot as plt
 
-    plt.title("PingPong, Fragment size=64MB")
-    fig_name = ts.testsuite[0].name + "_" + str(FLAGS.iterator) + ".pdf"
-    plt.savefig(fig_name)
+    fig, ax = plt.subplots(1,1)
+    ax.grid()
+    groups = stats.groupby(keys, sort=True) if keys else [((), stats)]
+    for i, (values, d) in enumerate(groups):
+        values = values if isinstance(values, tuple) else (values,)
+        label = ",".join(k + "=" + str(v) for k, v in zip(keys, values))
+        ax.errorbar(d[x], d["mean"], yerr=[d["mean"] - d["min"], d["max"] - d["mean"]],
+                linestyle='dashed', marker=markers[i % len(markers)],
+                color=colors[i % len(colors)], label=label, capsize=3)
+    ax.set_xscale('log', base=2)
+    ax.set_xlabel(x)
+    ax.set_ylabel(ordinate + " (s)")
+    ax.legend()
+    ax.set_title(title or "mpcrun " + ordinate)
+    exporter.save_figure(fig, name)
     plt.close('all')
+    cache.update(fig_names, digest)
+    cache.save()
+
+def fit_list(ts_list, metric="latency", fit_name=None):
+    """Write the latency model parameters of all tests in one CSV table."""
+    import pandas as pd
+    table = pd.concat([models.fit_suite(ts, metric) for ts in ts_list])
+    fit_name = fit_name or "fit_" + metric + ".csv"
+    table.to_csv(fit_name)
+    logging.info("Fitted " + str(len(table)) + " tests into " + fit_name)
+
+def ingest_list(ts_list, store_path, date=None, commit=None):
+    rs = store.ResultStore(store_path)
+
+    for ts in ts_list:
+        rs.ingest(ts, date, commit)
+
+    rs.close()
+
+def run_manifest(cache, exporter, path):
+    """Run all jobs of a manifest, loading each referenced suite once."""
+    m = manifest.Manifest(path, on_load=analyse_suite)
+
+    for job in m.jobs:
+        mode = job["mode"]
+        ts_list = m.job_suites(job)
+        logging.info("Running manifest job: mode=" + mode)
+        if mode == "list":
+            plot_list(cache, exporter, ts_list, job.get("labels"),
+                    job.get("suffix", "_multi_siam_cse"), job.get("where"))
+        elif mode == "speedup":
+            plot_speedup(cache, exporter, ts_list, job.get("labels"),
+                    job.get("suffix", "_speedup"), job.get("where"))
+        elif mode == "dev_vs_lcp_all":
+            plot_dev_vs_lcp_all(cache, exporter, ts_list[0], ts_list[1],
+                    job.get("labels"), job.get("suffix", ""))
+        elif mode == "n_ptl":
+            for ts in ts_list:
+                plot_n_ptl(cache, exporter, ts, job.get("group_by", job.get("iterator", m.iterator)),
+                        job.get("benchmark"), job.get("metric", "bandwidth"), job.get("title"),
+                        job.get("where"), job.get("suffix", ""))
+        elif mode == "heatmap":
+            for ts in ts_list:
+                for key in ([job["benchmark"]] if "benchmark" in job else ts.testsuite):
+                    plot_heatmap(cache, exporter, ts, key, job["rows"], job["cols"],
+                            job.get("metric"), job.get("baseline"), job.get("bytes"),
+                            job.get("title"), job.get("where"))
+        elif mode == "scaling":
+            plot_scaling(cache, exporter, ts_list, job.get("scaling", "strong"),
+                    job.get("procs"), job.get("by"), job.get("bytes"), job.get("metric"),
+                    job.get("suffix", "_scaling"))
+        elif mode == "overhead":
+            plot_overhead(cache, exporter, job["input"], job.get("x", "n"),
+                    job.get("metric", "overhead"), job.get("title"))
+        elif mode == "fit":
+            fit_list(ts_list, job.get("metric", "latency"), job.get("output"))
+        elif mode == "ingest":
+            ingest_list(ts_list, job["store"], job.get("date"), job.get("commit"))
+        else:
+            raise manifest.ManifestError("Unknown job mode '" + mode + "'")
+
+    tests.write_quarantine(list(m.ts_cache.values()), FLAGS.quarantine)
 
 def main():
+    cache = figcache.FigureCache()
+    exporter = export.FigureExporter(FLAGS.formats, FLAGS.dpi, FLAGS.multipage)
+
+    if FLAGS.manifest:
+        run_manifest(cache, exporter, FLAGS.manifest)
+        return
+
+    if FLAGS.overhead:
+        plot_overhead(cache, exporter, FLAGS.overhead, ordinate=FLAGS.metric or "overhead")
+        return
+
     #plot_dev_vs_lcp()
-    #plot_n_ptl()
+    #plot_n_ptl(cache, exporter, load_suites([FLAGS.pcvsdir], FLAGS.iterator)[0], FLAGS.iterator, FLAGS.select)
     #plot_diff()
-    #plot_dev_vs_lcp_all()
-    plot_list()
-    #plot_speedup()
+    #plot_dev_vs_lcp_all(cache, exporter, *load_suites([FLAGS.mpcdir, FLAGS.pcvsdir], FLAGS.iterator))
+    ts_list = load_suites(FLAGS.pcvslist, FLAGS.iterator)
+    if FLAGS.store:
+        ingest_list(ts_list, FLAGS.store, FLAGS.campaign_date, FLAGS.mpc_commit)
+    elif FLAGS.heatmap:
+        rows, cols = FLAGS.heatmap
+        for ts in ts_list:
+            for key in ([FLAGS.select] if FLAGS.select else ts.testsuite):
+                plot_heatmap(cache, exporter, ts, key, rows, cols, FLAGS.metric,
+                        parse_cell(FLAGS.heatmap_baseline), FLAGS.heatmap_bytes, None,
+                        parse_cell(FLAGS.where))
+    elif FLAGS.scaling:
+        plot_scaling(cache, exporter, ts_list, FLAGS.scaling, FLAGS.scaling_procs,
+                FLAGS.scaling_by, FLAGS.scaling_bytes, FLAGS.metric)
+    elif FLAGS.group_by:
+        for ts in ts_list:
+            for key in ([FLAGS.select] if FLAGS.select else ts.testsuite):
+                plot_n_ptl(cache, exporter, ts, FLAGS.group_by, key,
+                        FLAGS.metric, None, parse_cell(FLAGS.where))
+    else:
+        plot_list(cache, exporter, ts_list, FLAGS.labels, where=parse_cell(FLAGS.where))
+        if FLAGS.fit:
+            fit_list(ts_list, FLAGS.fit_metric)
+    #plot_speedup(cache, exporter, ts_list, FLAGS.labels)
+    tests.write_quarantine(ts_list, FLAGS.quarantine)
     
 if __name__=="__main__":
+    define_flags()
     FLAGS(sys.argv)
     main()
@@ -0,0 +1,78 @@
+import gzip
+import json
+import lzma
+import pathlib
+import tarfile
+import logging
+
+RESULTS_SUFFIXES = [".json", ".json.gz", ".json.xz", ".json.zst"]
+ARCHIVE_SUFFIXES = [".tar", ".tar.gz", ".tgz", ".tar.xz", ".txz", ".tar.zst", ".tzst"]
+
+def is_results(name):
+    return any(str(name).endswith(s) for s in RESULTS_SUFFIXES)
+
+def is_archive(name):
+    return any(str(name).endswith(s) for s in ARCHIVE_SUFFIXES)
+
+def zstd_reader(f):
+    try:
+        import zstandard
+    except ImportError:
+        raise OSError("Reading zstd compressed files requires the zstandard package")
+    return zstandard.ZstdDecompressor().stream_reader(f)
+
+def decompress(name, f):
+    """Binary stream decompressing f on the fly, according to the suffix
+    of its name."""
+    name = str(name)
+    if name.endswith(".gz") or name.endswith(".tgz"):
+        return gzip.GzipFile(fileobj=f)
+    if name.endswith(".xz") or name.endswith(".txz"):
+        return lzma.LZMAFile(f)
+    if name.endswith(".zst") or name.endswith(".tzst"):
+        return zstd_reader(f)
+    return f
+
+def load(name, f):
+    return json.loads(decompress(name, f).read())
+
+def in_rawdata(name):
+    """Archive members holding results: files under a rawdata directory,
+    or at the root of an archive of the rawdata directory itself."""
+    parts = pathlib.PurePosixPath(name).parts
+    return is_results(name) and (len(parts) == 1 or "rawdata" in parts[:-1])
+
+def iter_archive(path):
+    with open(path, 'rb') as f:
+        # sequential read of the archive, members are never extracted
+        with tarfile.open(fileobj=decompress(path, f), mode="r|") as tar:
+            for member in tar:
+                if not member.isfile() or not in_rawdata(member.name):
+                    continue
+                name = str(path) + ":" + member.name
+                try:
+                    yield name, load(member.name, tar.extractfile(member)), None
+                except (OSError, EOFError, ValueError) as err:
+                    yield name, None, err
+
+def iter_results(path):
+    """Yield (name, data, error) for every results file of a rawdata
+    source: a directory of plain or compressed JSON files and archives, a
+    single results file or a tar archive, compressed or not. data is the
+    decoded JSON, or None with the error when the file cannot be read."""
+    path = pathlib.Path(path)
+    if path.is_dir():
+        files = sorted(path.iterdir())
+    else:
+        files = [path]
+
+    for f in files:
+        try:
+            if is_archive(f.name):
+                yield from iter_archive(f)
+            else:
+                with f.open('rb') as f_h:
+                    yield str(f), load(f.name, f_h), None
+        except (OSError, EOFError, ValueError, tarfile.TarError) as err:
+            logging.debug("Cannot read " + str(f) + ": " + repr(err))
+            yield str(f), None, err
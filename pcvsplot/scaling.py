@@ -0,0 +1,75 @@
+import logging
+
+NPROCS = "nprocs"
+SUITE = "suite"
+MODES = ["strong", "weak"]
+
+# output columns, named apart from the ordinates of the benchmarks (IMB
+# non-blocking collectives have an efficiency ordinate)
+SPEEDUP = "speedup"
+EFFICIENCY = "parallel_efficiency"
+
+# ordinates where larger is better, their speedup is inverted
+HIGHER_IS_BETTER = ["bandwidth", "msgrate", "overlappercent"]
+
+def scaling_frame(ts_list, b, key, procs_key=None):
+    """Tidy frame of the tests of benchmark key in all suites with their
+    process count in an nprocs column and their suite in a suite column.
+    The process count is taken from the procs_key comb iterator, or else
+    from the output of each test, which may hold several process counts
+    (IMB #processes blocks). Rows without a process count are dropped."""
+    import pandas as pd
+
+    frames = []
+    for ts in ts_list:
+        if procs_key is not None and procs_key not in ts.iterators():
+            raise KeyError("Unknown iterator " + procs_key + ", available: " +
+                    str(ts.iterators()))
+        d = ts.frame(b, key, blocks=procs_key is None)
+        if len(d) == 0:
+            continue
+        if procs_key is not None:
+            d[NPROCS] = d[procs_key]
+        frames.append(d.assign(**{SUITE: ts.name}))
+
+    if len(frames) == 0:
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    return df.loc[df[NPROCS].notna()].astype({NPROCS: int})
+
+def curve_keys(df, by=None):
+    """Keys of the scaling curves: the suite first, so that suites are
+    only averaged together when by holds it, then the by iterators."""
+    by = list(by or [])
+    if SUITE in df and SUITE not in by:
+        by = [SUITE] + by
+    return by
+
+def scaling(df, x, ordinate, by=None, mode="strong"):
+    """Speedup and parallel efficiency (SPEEDUP and EFFICIENCY columns)
+    of ordinate relative to the run with the fewest processes of each
+    curve (see curve_keys) and size x, computed for all sizes at once.
+    Runs with the same process count are averaged first.
+
+    strong scaling (fixed problem size): speedup = t0 / t and
+    efficiency = speedup * p0 / p; weak scaling (fixed size per process):
+    efficiency = t0 / t and speedup = efficiency * p / p0. For ordinates
+    of HIGHER_IS_BETTER, such as bandwidth, the ratio is t / t0."""
+    if mode not in MODES:
+        raise ValueError("Invalid scaling mode '" + mode + "' not in " + str(MODES))
+    keys = curve_keys(df, by) + [x]
+    s = df.groupby(keys + [NPROCS], dropna=False)[ordinate].mean().reset_index()
+    s = s.sort_values(keys + [NPROCS], kind="stable")
+
+    ref = s.groupby(keys, dropna=False)
+    p0 = ref[NPROCS].transform("first")
+    t0 = ref[ordinate].transform("first")
+    ratio = s[ordinate] / t0 if ordinate in HIGHER_IS_BETTER else t0 / s[ordinate]
+    if mode == "strong":
+        s[SPEEDUP]    = ratio
+        s[EFFICIENCY] = s[SPEEDUP] * p0 / s[NPROCS]
+    else:
+        s[EFFICIENCY] = ratio
+        s[SPEEDUP]    = s[EFFICIENCY] * s[NPROCS] / p0
+    logging.info("Computed " + mode + " scaling of " + ordinate + ": " + str(len(s)) + " points")
+    return s.reset_index(drop=True)
@@ -0,0 +1,119 @@
+import sqlite3
+import json
+import datetime
+import logging
+import benchmarks
+
+class ResultStore():
+    """SQLite store of parsed benchmark results.
+
+    Each ingested test suite becomes a campaign (date, MPC commit, PCVS
+    directory). Results are stored in long format, one row per
+    (benchmark, metric, bytes, config) of a campaign, where config is the
+    JSON encoded PCVS comb of the test. Ingesting the same campaign again
+    replaces its results."""
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS campaigns (
+            id        INTEGER PRIMARY KEY AUTOINCREMENT,
+            date      TEXT NOT NULL,
+            commit_id TEXT,
+            directory TEXT
+        );
+        CREATE TABLE IF NOT EXISTS results (
+            campaign  INTEGER NOT NULL REFERENCES campaigns(id),
+            benchmark TEXT NOT NULL,
+            config    TEXT NOT NULL,
+            bytes     INTEGER NOT NULL,
+            metric    TEXT NOT NULL,
+            value     REAL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS results_key_idx
+            ON results(benchmark, metric, bytes, config, campaign);
+        CREATE INDEX IF NOT EXISTS campaigns_date_idx
+            ON campaigns(date);
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.db      = sqlite3.connect(db_path)
+        self.migrate()
+        self.db.executescript(self.SCHEMA)
+        logging.info("Opened result store: path=" + str(db_path))
+
+    def close(self):
+        self.db.close()
+
+    def migrate(self):
+        """Drop the index of stores written before results were unique,
+        and their duplicate rows, keeping the last ingested."""
+        if self.db.execute("SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND name = 'results_idx'").fetchone() is None:
+            return
+        with self.db:
+            self.db.execute("DROP INDEX results_idx")
+            self.db.execute("DELETE FROM results WHERE rowid NOT IN (SELECT MAX(rowid) "
+                    "FROM results GROUP BY benchmark, metric, bytes, config, campaign)")
+
+    def ingest(self, ts, date=None, commit=None):
+        """Store all tests of a built PCVSTestSuite as a campaign, new
+        unless a campaign of the same date, commit and directory exists,
+        whose results are then replaced. Returns the campaign id."""
+        if date is None:
+            date = datetime.date.today().isoformat()
+
+        with self.db:
+            row = self.db.execute("SELECT id FROM campaigns WHERE date = ? AND commit_id IS ? "
+                    "AND directory = ?", (date, commit, str(ts.testdir))).fetchone()
+            if row is not None:
+                campaign = row[0]
+                self.db.execute("DELETE FROM results WHERE campaign = ?", (campaign,))
+            else:
+                cur = self.db.execute("INSERT INTO campaigns (date, commit_id, directory) "
+                        "VALUES (?, ?, ?)", (date, commit, str(ts.testdir)))
+                campaign = cur.lastrowid
+
+            nrows = 0
+            for key in ts.testsuite:
+                b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=key)
+                if b is None:
+                    continue
+
+                for t in ts.testsuite[key]:
+                    d = ts.parse(b, t)
+                    d = d.melt(id_vars=b.BENCHMARK_X[0], value_vars=b.BENCHMARK_Y,
+                            var_name="metric", value_name="value").dropna()
+                    config = json.dumps(t.comb, sort_keys=True)
+                    rows = zip([campaign] * len(d), [key] * len(d), [config] * len(d),
+                            d[b.BENCHMARK_X[0]].astype(int).tolist(),
+                            d["metric"].tolist(), d["value"].tolist())
+                    # tests sharing a comb keep the last one
+                    self.db.executemany("INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)", rows)
+                    nrows = nrows + len(d)
+
+        logging.info("Ingested campaign " + str(campaign) + ": nrows=" + str(nrows))
+        return campaign
+
+    def campaigns(self):
+        import pandas as pd
+        return pd.read_sql_query("SELECT * FROM campaigns ORDER BY date, id", self.db)
+
+    def trend(self, benchmark, metric, bytes=None, config=None):
+        """Return the time series of a metric across campaigns as a
+        DataFrame with columns date, commit_id, campaign, config, bytes
+        and value. bytes and config (a comb dict) optionally restrict the
+        series."""
+        import pandas as pd
+        query = "SELECT c.date, c.commit_id, r.campaign, r.config, r.bytes, r.value " \
+                "FROM results r JOIN campaigns c ON r.campaign = c.id " \
+                "WHERE r.benchmark = ? AND r.metric = ?"
+        params = [benchmark, metric]
+        if bytes is not None:
+            query += " AND r.bytes = ?"
+            params.append(int(bytes))
+        if config is not None:
+            query += " AND r.config = ?"
+            params.append(json.dumps(config, sort_keys=True))
+        query += " ORDER BY c.date, r.campaign, r.bytes"
+
+        return pd.read_sql_query(query, self.db, params=params)
@@ -0,0 +1,43 @@
+import pandas as pd
+import analysis
+import tests
+from conftest import result
+
+SIZES = [2 ** i for i in range(9)]
+
+def curve(spike=None):
+    latency = [1.0 + 0.1 * i for i in range(len(SIZES))]
+    if spike is not None:
+        latency[spike] = latency[spike] * 3
+    return pd.DataFrame({"bytes": SIZES, "latency": latency})
+
+def test_flag_outliers():
+    frames = {"a": curve(), "b": curve(spike=4), "c": curve(spike=0)}
+    assert analysis.flag_outliers(frames, ["latency"]) == 1
+    assert not frames["a"]["latency_outlier"].any()
+    assert list(frames["b"]["latency_outlier"]) == [i == 4 for i in range(len(SIZES))]
+    # the ends of a curve have no complete window
+    assert not frames["c"]["latency_outlier"].any()
+
+def test_threshold():
+    frames = {"b": curve(spike=4)}
+    assert analysis.flag_outliers(frames, ["latency"], threshold=5) == 0
+
+def test_unsorted_and_empty():
+    frames = {"b": curve(spike=4).iloc[::-1], "empty": pd.DataFrame({"bytes": [], "latency": []})}
+    assert analysis.flag_outliers(frames, ["latency"]) == 1
+    # flags follow the rows of the frame
+    assert frames["b"]["latency_outlier"].loc[4]
+    assert frames["b"]["latency_outlier"].sum() == 1
+    assert len(frames["empty"]["latency_outlier"]) == 0
+
+def test_flag_suite_outliers(make_suite):
+    output = "# Size  Latency (us)\n" + "".join("{}  {}\n".format(m, l)
+            for m, l in zip(SIZES, curve(spike=4)["latency"]))
+    ts = tests.PCVSTestSuite(make_suite("a", [result("pt2pt_osu_latency", output)]))
+    ts.build(None)
+    analysis.flag_suite_outliers(ts)
+    t = ts.testsuite["pt2pt_osu_latency"][0]
+    # flags are kept on the parsed frame shared by all plots
+    d = ts.parse(None, t)
+    assert list(d.loc[d["latency_outlier"], "bytes"]) == [16]
@@ -0,0 +1,204 @@
+import logging
+import math
+import benchmarks
+
+OSU_LATENCY = """# OSU MPI Latency Test v5.8
+# Size          Latency (us)
+0                       0.20
+1                       0.25
+8                       0.50
+1024                    2.00
+"""
+
+# OSU 7 prints avg/min/max latencies and a validation column
+OSU7_LATENCY = """# OSU MPI Latency Test v7.3
+# Datatype: MPI_CHAR.
+# Size       Avg Latency(us)   Min Latency(us)   Max Latency(us)  Iterations  Validation
+1                       0.25              0.20              0.30        1000        Pass
+8                       0.50              0.40              0.60        1000        Pass
+1024                    2.00              1.90              2.10        1000        Fail
+"""
+
+OSU_MBW_MR = """# OSU MPI Multiple Bandwidth / Message Rate Test v5.8
+# [ pairs: 1 ] [ window size: 64 ]
+# Size                  MB/s        Messages/s
+1                       2.50        2500000.00
+1024                 2048.00        2000000.00
+"""
+
+OSU_ALLREDUCE = """# OSU MPI Allreduce Latency Test v5.8
+# Size       Avg Latency(us)   Min Latency(us)   Max Latency(us)  Iterations
+4                       2.00              1.00              4.00        1000
+1024                    8.00              8.00              8.00        1000
+"""
+
+def benchmark(name):
+    return benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=name)
+
+def test_unknown_benchmark(caplog):
+    with caplog.at_level(logging.WARNING):
+        assert benchmark("pt2pt_osu_unknown") is None
+        assert benchmark("pt2pt_osu_unknown") is None
+    assert len([r for r in caplog.records if "pt2pt_osu_unknown" in r.message]) == 1
+
+def test_osu_latency():
+    df = benchmark("pt2pt_osu_latency").parse(OSU_LATENCY)
+    # zero byte messages are dropped
+    assert list(df["bytes"]) == [1, 8, 1024]
+    assert list(df["latency"]) == [0.25, 0.5, 2.0]
+
+def test_osu_positional():
+    # no header, columns of the benchmark in order
+    output = "".join(l for l in OSU_LATENCY.splitlines(keepends=True) if "Size" not in l)
+    df = benchmark("pt2pt_osu_latency").parse(output)
+    assert list(df["latency"]) == [0.25, 0.5, 2.0]
+
+    # a header naming no metric of the benchmark
+    output = OSU_LATENCY.replace("Latency (us)", "Time (us)")
+    df = benchmark("pt2pt_osu_latency").parse(output)
+    assert list(df["latency"]) == [0.25, 0.5, 2.0]
+
+def test_osu7_latency():
+    for name in ["pt2pt_osu_latency", "one-sided_osu_put_latency"]:
+        df = benchmark(name).parse(OSU7_LATENCY)
+        assert list(df["bytes"]) == [1, 8, 1024]
+        assert list(df["latency"]) == [0.25, 0.5, 2.0]
+
+def test_osu_one_sided():
+    assert issubclass(benchmark("one-sided_osu_put_latency"), benchmarks.OSULatency)
+    df = benchmark("one-sided_osu_get_bw").parse(OSU_MBW_MR.replace("MB/s        Messages/s", "Bandwidth (MB/s)"))
+    assert list(df["bandwidth"]) == [2.5, 2048.0]
+
+def test_osu_message_rate():
+    df = benchmark("pt2pt_osu_mbw_mr").parse(OSU_MBW_MR)
+    assert list(df["bandwidth"]) == [2.5, 2048.0]
+    assert list(df["msgrate"]) == [2.5e6, 2e6]
+
+def test_osu_collective():
+    df = benchmark("collective_osu_allreduce").parse(OSU_ALLREDUCE)
+    assert list(df["avgtime"]) == [2.0, 8.0]
+    assert list(df["mintime"]) == [1.0, 8.0]
+    assert list(df["maxtime"]) == [4.0, 8.0]
+
+    # OSU 7 collectives print the average latency only by default
+    output = OSU_ALLREDUCE.replace("Min Latency(us)   Max Latency(us)  Iterations", "")
+    df = benchmark("collective_osu_allreduce").parse(output)
+    assert list(df["avgtime"]) == [2.0, 8.0]
+    assert df["mintime"].isna().all()
+
+def test_osu_invalid_row():
+    output = OSU_LATENCY.replace("0.50", "n/a")
+    df = benchmark("pt2pt_osu_latency").parse(output)
+    assert list(df["bytes"]) == [1, 1024]
+
+IMB_PINGPONG = """#---------------------------------------------------
+# Benchmarking PingPong
+# #processes = 2
+#---------------------------------------------------
+       #bytes #repetitions      t[usec]   Mbytes/sec
+            0         1000         0.21         0.00
+            1         1000         0.25         4.00
+         1024         1000         2.00       512.00
+"""
+
+IMB_ALLREDUCE = """#----------------------------------------------------------------
+# Benchmarking Allreduce
+# #processes = 2
+#----------------------------------------------------------------
+       #bytes #repetitions  t_min[usec]  t_max[usec]  t_avg[usec]
+            0         1000         1.35         1.65         1.50
+            4         1000         1.36         1.66         1.51
+         1024         1000         2.73         3.34         3.04
+
+#----------------------------------------------------------------
+# Benchmarking Allreduce
+# #processes = 4
+#----------------------------------------------------------------
+       #bytes #repetitions  t_min[usec]  t_max[usec]  t_avg[usec]
+            0         1000         2.35         2.65         2.50
+            4         1000         2.36         2.66         2.51
+         1024         1000         3.73         4.34         4.04
+
+
+# All processes entering MPI_Finalize
+"""
+
+def test_derived_metrics():
+    df = benchmark("pt2pt_osu_latency").parse(OSU_LATENCY)
+    assert list(df["msgrate"]) == [4e6, 2e6, 5e5]
+    assert "msgrate" in benchmark("pt2pt_osu_latency").BENCHMARK_Y
+
+    df = benchmark("collective_osu_allreduce").parse(OSU_ALLREDUCE)
+    assert list(df["bandwidth"]) == [2.0, 128.0]
+
+    df = benchmark("PingPong").parse(IMB_PINGPONG)
+    assert list(df["msgrate"]) == [4e6, 5e5]
+
+def test_imb_first_block():
+    # parse keeps the first process count block only
+    df = benchmark("Allreduce").parse(IMB_ALLREDUCE)
+    assert list(df["bytes"]) == [0, 4, 1024]
+    assert list(df["avgtime"]) == [1.50, 1.51, 3.04]
+
+    df = benchmark("PingPong").parse(IMB_PINGPONG)
+    assert list(df["bytes"]) == [1, 1024]
+    assert list(df["latency"]) == [0.25, 2.0]
+
+def test_imbalance():
+    df = benchmark("collective_osu_allreduce").parse(OSU_ALLREDUCE)
+    assert list(df["imbalance"]) == [4.0, 1.0]
+    assert list(df["straggler"]) == [1.0, 0.0]
+
+    df = benchmark("Allreduce").parse(IMB_ALLREDUCE)
+    assert list(df["mintime"]) == [1.35, 1.36, 2.73]
+    assert list(df["maxtime"]) == [1.65, 1.66, 3.34]
+    assert df["imbalance"][2] == 3.34 / 2.73
+    assert df["straggler"][2] == (3.34 - 3.04) / 3.04
+
+def test_imb_blocks():
+    # blocks of other benchmarks are skipped
+    output = IMB_PINGPONG + "\n" + IMB_ALLREDUCE
+    df = benchmark("Allreduce").parse_blocks(output)
+    assert list(df["nprocs"]) == [2, 2, 2, 4, 4, 4]
+    assert list(df["avgtime"]) == [1.50, 1.51, 3.04, 2.50, 2.51, 4.04]
+
+    df = benchmark("Bcast").parse_blocks(output)
+    assert len(df) == 0
+    assert "nprocs" in df
+
+def test_osu_blocks():
+    df = benchmark("pt2pt_osu_latency").parse_blocks(OSU_LATENCY)
+    assert df["nprocs"].isna().all()
+
+def stream_rows(b, output):
+    parser = b.stream()
+    for line in output.splitlines(keepends=True):
+        parser.feed(line)
+    return parser.rows
+
+def assert_parity(b, output):
+    df = b.parse(output)
+    rows = stream_rows(b, output)
+    assert len(rows) == len(df)
+    for row, (i, expected) in zip(rows, df.iterrows()):
+        for c in df.columns:
+            if math.isnan(expected[c]):
+                assert math.isnan(row[c])
+            else:
+                assert row[c] == expected[c], c
+
+def test_stream_parity():
+    assert_parity(benchmark("pt2pt_osu_latency"), OSU_LATENCY)
+    assert_parity(benchmark("pt2pt_osu_latency"), OSU7_LATENCY)
+    assert_parity(benchmark("pt2pt_osu_latency"), OSU_LATENCY.replace("Latency (us)", "Time (us)"))
+    assert_parity(benchmark("pt2pt_osu_latency"), OSU_LATENCY.replace("0.50", "n/a"))
+    assert_parity(benchmark("pt2pt_osu_mbw_mr"), OSU_MBW_MR)
+    assert_parity(benchmark("collective_osu_allreduce"), OSU_ALLREDUCE)
+    assert_parity(benchmark("Allreduce"), IMB_ALLREDUCE)
+    assert_parity(benchmark("PingPong"), IMB_PINGPONG)
+
+def test_stream_zero_divisor():
+    output = OSU_ALLREDUCE.replace("1.00              4.00", "0.00              4.00")
+    b = benchmark("collective_osu_allreduce")
+    assert math.isinf(b.parse(output)["imbalance"][0])
+    assert math.isinf(stream_rows(b, output)[0]["imbalance"])
@@ -0,0 +1,48 @@
+import pytest
+import export
+
+@pytest.fixture
+def fig():
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    fig, ax = plt.subplots()
+    ax.plot([1, 2, 4], [3, 1, 2])
+    yield fig
+    plt.close(fig)
+
+def test_formats(tmp_path, fig):
+    from PIL import Image
+    exporter = export.FigureExporter(["PNG", ".jpeg", "tiff", "pdf", "svg"], dpi=50)
+    exporter.save_figure(fig, str(tmp_path / "fig"))
+    for f in ["png", "jpeg", "tiff", "pdf", "svg"]:
+        assert (tmp_path / ("fig." + f)).stat().st_size > 0
+
+    # raster formats at the requested resolution, jpeg without alpha
+    assert Image.open(tmp_path / "fig.png").size == (320, 240)
+    assert Image.open(tmp_path / "fig.png").mode == "RGBA"
+    assert Image.open(tmp_path / "fig.jpeg").mode == "RGB"
+    assert fig.dpi == 100
+
+def test_single_draw(tmp_path, fig, monkeypatch):
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    draws = []
+    draw = FigureCanvasAgg.draw
+    monkeypatch.setattr(FigureCanvasAgg, "draw", lambda self: draws.append(self) or draw(self))
+    export.FigureExporter(["png", "jpeg", "tiff"]).save_figure(fig, str(tmp_path / "fig"))
+    assert len(draws) == 1
+
+def test_multipage(tmp_path, fig):
+    exporter = export.FigureExporter(["png", "pdf"], multipage=True)
+    assert exporter.figure_names("fig") == ["fig.png", "fig.pdf"]
+    exporter.open_book(str(tmp_path / "book.pdf"))
+    exporter.save(fig, exporter.fig_names(str(tmp_path / "a")))
+    exporter.save(fig, exporter.fig_names(str(tmp_path / "b")))
+    exporter.close_book()
+    assert (tmp_path / "book.pdf").read_bytes().count(b"/Type /Page ") == 2
+    assert not (tmp_path / "a.pdf").exists()
+    assert (tmp_path / "b.png").exists()
+
+def test_unsupported_format(tmp_path, fig):
+    with pytest.raises(ValueError, match="bmp"):
+        export.FigureExporter(["png", "bmp"]).save_figure(fig, str(tmp_path / "fig"))
@@ -0,0 +1,56 @@
+import os
+import pandas as pd
+import figcache
+import export
+import pcvsplot
+import tests
+from conftest import result
+from test_benchmarks import OSU_LATENCY
+
+def test_digest():
+    d = pd.DataFrame({"bytes": [1, 8], "latency": [0.25, 0.5]})
+    digest = figcache.FigureCache.digest([d], "latency")
+    assert digest == figcache.FigureCache.digest([d.copy()], "latency")
+    assert digest != figcache.FigureCache.digest([d.assign(latency=[0.25, 0.6])], "latency")
+    assert digest != figcache.FigureCache.digest([d.rename(columns={"latency": "l"})], "latency")
+    assert digest != figcache.FigureCache.digest([d], "bandwidth")
+
+def test_is_clean(tmp_path):
+    cache = figcache.FigureCache(str(tmp_path))
+    assert not cache.is_clean(["a.png"], "d")
+    cache.update(["a.png"], "d")
+    # the figure file must still exist
+    assert not cache.is_clean(["a.png"], "d")
+    (tmp_path / "a.png").write_text("")
+    assert cache.is_clean(["a.png"], "d")
+    assert not cache.is_clean(["a.png"], "e")
+
+    cache.save()
+    assert figcache.FigureCache(str(tmp_path)).is_clean(["a.png"], "d")
+
+def test_corrupted(tmp_path):
+    (tmp_path / figcache.FigureCache.CACHE_FILE).write_text("{")
+    assert figcache.FigureCache(str(tmp_path)).entries == {}
+
+def test_up_to_date(make_suite, flags, monkeypatch):
+    saved = []
+    save = export.FigureExporter.save
+    monkeypatch.setattr(export.FigureExporter, "save",
+            lambda self, fig, fig_names: saved.extend(fig_names) or save(self, fig, fig_names))
+    ts = tests.PCVSTestSuite(make_suite("a", [result("pt2pt_osu_latency", OSU_LATENCY)]))
+    ts.build(None)
+
+    def plot(*args):
+        flags("--formats=png", *args)
+        del saved[:]
+        pcvsplot.plot_list(figcache.FigureCache(), export.FigureExporter(["png"]), [ts])
+        return saved
+
+    nmetrics = len(pcvsplot.benchmarks.OSULatency.BENCHMARK_Y)
+    assert len(plot()) == nmetrics
+    assert plot() == []
+    assert len(plot("--replot")) == nmetrics
+
+    # a removed figure is rendered again, alone
+    os.remove("pt2pt_osu_latency_latency_multi_siam_cse.png")
+    assert plot() == ["pt2pt_osu_latency_latency_multi_siam_cse.png"]
@@ -0,0 +1,62 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+import figcache
+import export
+import grid
+import pcvsplot
+import tests
+from conftest import result
+
+def sweep():
+    # latency doubles with n_ptl, halves with rndv_mode, scales with bytes
+    rows = [{"bytes": m, "n_ptl": p, "rndv_mode": r, "latency": m * p / (r + 1)}
+            for m in [1, 100] for p in [1, 2, 4] for r in [0, 1]]
+    return pd.DataFrame(rows)
+
+def test_pivot_dimensions():
+    g = grid.pivot(sweep(), "bytes", "n_ptl", "rndv_mode", "latency")
+    assert list(g.index) == [1, 2, 4]
+    assert list(g.columns) == [0, 1]
+    # geometric mean over sizes
+    assert np.allclose(g.loc[1], [10.0, 5.0])
+    assert np.allclose(g.loc[4], [40.0, 20.0])
+
+    g = grid.pivot(sweep(), "bytes", "bytes", "n_ptl", "latency", size=None)
+    assert list(g.index) == [1, 100]
+    assert np.allclose(g.loc[100], [np.sqrt(100 * 50), np.sqrt(200 * 100), np.sqrt(400 * 200)])
+
+def test_pivot_size():
+    g = grid.pivot(sweep(), "bytes", "n_ptl", "rndv_mode", "latency", size=100)
+    assert np.allclose(g.loc[2], [200.0, 100.0])
+    with pytest.raises(ValueError):
+        grid.pivot(sweep(), "bytes", "n_ptl", "rndv_mode", "latency", size=8)
+
+def test_pivot_baseline():
+    g = grid.pivot(sweep(), "bytes", "n_ptl", "rndv_mode", "latency",
+            baseline={"n_ptl": 1, "rndv_mode": 0})
+    assert np.allclose(g.values, [[1.0, 0.5], [2.0, 1.0], [4.0, 2.0]])
+    with pytest.raises(ValueError):
+        grid.pivot(sweep(), "bytes", "n_ptl", "rndv_mode", "latency", baseline={"n_ptl": 8})
+    with pytest.raises(KeyError):
+        grid.pivot(sweep(), "bytes", "n_ptl", "rndv_mode", "latency", baseline={"n_tcp": 1})
+
+def test_pivot_unknown_dimension():
+    with pytest.raises(KeyError, match="n_tcp"):
+        grid.pivot(sweep(), "bytes", "n_tcp", "rndv_mode", "latency")
+
+def test_plot_heatmap(make_suite, flags):
+    flags("--formats=png")
+    ts = tests.PCVSTestSuite(make_suite("a", [result("pt2pt_osu_latency",
+        "# Size  Latency (us)\n1  {}\n8  {}\n".format(p, 2 * p), n_ptl=p, rndv_mode=r)
+        for p in [1, 2] for r in [0, 1]]))
+    ts.build(None)
+    pcvsplot.plot_heatmap(figcache.FigureCache(), export.FigureExporter(["png"]), ts,
+            "pt2pt_osu_latency", "n_ptl", "rndv_mode")
+    assert os.path.isfile("pt2pt_osu_latency_latency_heatmap_n_ptl_rndv_mode_a.png")
+
+    # an unknown dimension skips the heatmap
+    pcvsplot.plot_heatmap(figcache.FigureCache(), export.FigureExporter(["png"]), ts,
+            "pt2pt_osu_latency", "n_tcp", "rndv_mode")
+    assert not any("n_tcp" in f for f in os.listdir("."))
@@ -0,0 +1,4 @@
+import importbudget
+
+def test_import_budget():
+    assert importbudget.check(repeat=3) == []
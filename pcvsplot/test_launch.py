@@ -0,0 +1,30 @@
+import os
+import figcache
+import export
+import pcvsplot
+
+CSV = """N,n,rep,launch,direct,overhead,exit_code
+1,2,0,0.5,0.1,0.4,0
+1,2,1,0.7,0.1,0.6,0
+1,4,0,0.9,0.1,0.8,0
+1,4,1,9.1,0.1,9.0,1
+2,4,0,1.1,0.1,1.0,0
+"""
+
+def test_plot_overhead(tmp_path, flags, caplog):
+    flags("--formats=png")
+    (tmp_path / "overhead.csv").write_text(CSV)
+    saved = []
+    exporter = export.FigureExporter(["png"])
+    save_figure = exporter.save_figure
+    exporter.save_figure = lambda fig, name: saved.append(fig) or save_figure(fig, name)
+    pcvsplot.plot_overhead(figcache.FigureCache(), exporter, "overhead.csv")
+    assert os.path.isfile("launch_overhead_n.png")
+    assert "Ignoring 1 failed launches" in caplog.text
+
+    # one curve per N, mean of the successful repetitions
+    ax = saved[0].axes[0]
+    assert [t.get_text() for t in ax.get_legend().get_texts()] == ["N=1", "N=2"]
+    lines = [l for l in ax.get_lines() if l.get_linestyle() == "--"]
+    assert list(lines[0].get_ydata()) == [0.5, 0.8]
+    assert list(lines[1].get_ydata()) == [1.0]
@@ -0,0 +1,56 @@
+import json
+import os
+import pytest
+import figcache
+import export
+import manifest
+import pcvsplot
+from conftest import result
+from test_benchmarks import OSU_LATENCY
+
+def write(tmp_path, data, name="manifest.json"):
+    path = tmp_path / name
+    path.write_text(json.dumps(data))
+    return str(path)
+
+def suite(make_suite, name="a"):
+    return make_suite(name, [result("pt2pt_osu_latency", OSU_LATENCY, rndv_mode=r)
+        for r in [0, 1]])
+
+def test_shared_suites(tmp_path, make_suite):
+    loaded = []
+    m = manifest.Manifest(write(tmp_path, {"suites": {"a": suite(make_suite)},
+        "jobs": [{"mode": "list", "suites": ["a"]}, {"mode": "fit", "suites": ["a"]}]}),
+        on_load=loaded.append)
+    ts = m.job_suites(m.jobs[0])[0]
+    assert m.job_suites(m.jobs[1])[0] is ts
+    assert loaded == [ts]
+    assert ts.ntests == 2
+
+def test_yaml(tmp_path, make_suite):
+    path = tmp_path / "manifest.yml"
+    path.write_text("suites:\n  a: " + suite(make_suite) + "\njobs:\n  - mode: list\n    suites: [a]\n")
+    assert manifest.Manifest(str(path)).jobs == [{"mode": "list", "suites": ["a"]}]
+
+def test_invalid(tmp_path, make_suite):
+    suites = {"a": suite(make_suite)}
+    with pytest.raises(manifest.ManifestError, match="Missing section"):
+        manifest.Manifest(write(tmp_path, {"suites": suites}))
+    with pytest.raises(manifest.ManifestError, match="without mode"):
+        manifest.Manifest(write(tmp_path, {"suites": suites, "jobs": [{"suites": ["a"]}]}))
+    with pytest.raises(manifest.ManifestError, match="undefined suite 'b'"):
+        manifest.Manifest(write(tmp_path, {"suites": suites,
+            "jobs": [{"mode": "list", "suites": ["b"]}]}))
+    with pytest.raises(manifest.ManifestError, match="list without suites"):
+        manifest.Manifest(write(tmp_path, {"suites": suites, "jobs": [{"mode": "list"}]}))
+    # the overhead mode reads its own input
+    manifest.Manifest(write(tmp_path, {"suites": {}, "jobs": [{"mode": "overhead", "input": "o.csv"}]}))
+
+def test_job_where(tmp_path, make_suite, flags):
+    flags("--output", "--formats=png")
+    path = write(tmp_path, {"suites": {"a": suite(make_suite)}, "jobs": [
+        {"mode": "list", "suites": ["a"], "where": {"rndv_mode": 1}}]})
+    pcvsplot.run_manifest(figcache.FigureCache(), export.FigureExporter(["png"]), path)
+    csvs = sorted(f for f in os.listdir(tmp_path) if f.startswith("csv_"))
+    assert len(csvs) == 1 and csvs[0].endswith("rndv_mode1.csv")
+    assert os.path.isfile("pt2pt_osu_latency_latency_multi_siam_cse.png")
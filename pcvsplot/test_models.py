@@ -0,0 +1,65 @@
+import os
+import numpy as np
+import pandas as pd
+import figcache
+import export
+import models
+import pcvsplot
+import tests
+from conftest import result
+
+SIZES = [1, 2, 4, 8, 16, 32, 64, 128]
+
+def curve(alpha, beta, sizes=SIZES):
+    return pd.DataFrame({"bytes": sizes, "latency": [alpha + beta * m for m in sizes]})
+
+def eager_rndv():
+    # eager up to 16 bytes, rendezvous with a higher startup cost above
+    return pd.DataFrame({"bytes": SIZES, "latency":
+        [1.0 + 0.5 * m if m <= 16 else 10.0 + 0.25 * m for m in SIZES]})
+
+def test_hockney():
+    fits = models.fit_frames({"a": curve(2.0, 0.5), "b": curve(1.0, 0.25)})
+    assert np.allclose(fits["alpha"], [2.0, 1.0])
+    assert np.allclose(fits["beta"], [0.5, 0.25])
+    assert np.allclose(fits["bandwidth"], [2.0, 4.0])
+    assert np.allclose(fits["r2"], 1.0)
+
+def test_piecewise():
+    params = models.fit_frames({"a": eager_rndv()}).loc["a"]
+    assert params["breakpoint"] == 16
+    assert np.isclose(params["alpha_eager"], 1.0)
+    assert np.isclose(params["beta_rndv"], 0.25)
+    assert np.isclose(params["r2_piecewise"], 1.0)
+    assert params["r2"] < 1.0
+    assert np.allclose(models.predict(params, [8, 64]), [5.0, 26.0])
+
+def test_too_few_points():
+    # a breakpoint needs two points on each side
+    params = models.fit_frames({"a": curve(2.0, 0.5, [1, 2, 4])}).loc["a"]
+    assert np.isnan(params["breakpoint"])
+    assert np.allclose(models.predict(params, [8]), [6.0])
+
+def test_empty():
+    d = pd.DataFrame({"bytes": [1, 2], "latency": [np.nan, 0.0]})
+    assert len(models.fit_frames({"a": d})) == 0
+
+    fits = models.fit_frames({"a": d, "b": curve(2.0, 0.5)})
+    assert list(fits.index) == ["b"]
+
+def test_fit_suite(make_suite):
+    output = "# Size  Latency (us)\n" + "".join("{}  {}\n".format(m, 2.0 + 0.5 * m) for m in SIZES)
+    ts = tests.PCVSTestSuite(make_suite("a", [result("pt2pt_osu_latency", output, n_ptl=1)]))
+    ts.build(None)
+    table = models.fit_suite(ts)
+    assert list(table["benchmark"]) == ["pt2pt_osu_latency"]
+    assert list(table["config"]) == ['{"n_ptl": 1}']
+    assert np.allclose(table["alpha"], 2.0)
+
+def test_render_without_fit(flags):
+    flags("--fit", "--formats=png")
+    b = pcvsplot.benchmarks.OSULatency
+    d = pd.DataFrame({"bytes": SIZES, "latency": np.nan})
+    pcvsplot.render_benchmark(figcache.FigureCache(), export.FigureExporter(["png"]), b,
+            b.BENCHMARK_NAME, "", "title", [b.derive(d), b.derive(eager_rndv())], ["a", "b"])
+    assert os.path.isfile(b.BENCHMARK_NAME + "_latency.png")
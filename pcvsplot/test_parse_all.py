@@ -0,0 +1,52 @@
+import pandas as pd
+import pcvsplot
+import tests
+from conftest import result
+from test_benchmarks import OSU_ALLREDUCE, OSU_LATENCY
+
+def suite(make_suite, name="a"):
+    results = [result("pt2pt_osu_latency", OSU_LATENCY.replace("2.00", str(p)), n_ptl=p)
+            for p in range(1, 9)]
+    results += [result("collective_osu_allreduce", OSU_ALLREDUCE, n_mpi=4),
+            result("pt2pt_osu_latency", "no result\n", fq_name="empty"),
+            result("pt2pt_osu_unknown", OSU_LATENCY)]
+    ts = tests.PCVSTestSuite(make_suite(name, results))
+    ts.build(None)
+    return ts
+
+def test_parse_all(make_suite):
+    pool = suite(make_suite, "a").parse_all(nprocs=2, chunksize=3)
+    ts = suite(make_suite, "b")
+    serial = ts.parse_all(nprocs=1)
+    # unknown benchmarks are not parsed
+    assert len(pool) == len(serial) == 10
+    for (_, d), (_, e) in zip(sorted(pool.items()), sorted(serial.items())):
+        pd.testing.assert_frame_equal(d, e)
+
+def test_quarantine_pool(make_suite):
+    ts = suite(make_suite)
+    ts.parse_all(nprocs=2)
+    assert [q["fq_name"] for q in ts.quarantine] == ["empty"]
+
+def test_parsed_once(make_suite, monkeypatch):
+    ts = suite(make_suite)
+    ts.parse_all(nprocs=2)
+    frames = dict(ts.frames)
+    # frames are shared with later plots, nothing is parsed again
+    monkeypatch.setattr(tests, "parse_job", None)
+    assert ts.parse_all(nprocs=2) == frames
+    t = ts.select("pt2pt_osu_latency", n_ptl=3)[0]
+    assert ts.parse(None, t) is frames[t.uname]
+
+def test_lazy_default(make_suite, flags, monkeypatch):
+    calls = []
+    monkeypatch.setattr(tests.PCVSTestSuite, "parse_all", lambda self, nprocs=None: calls.append(nprocs))
+    ts = suite(make_suite)
+    flags()
+    pcvsplot.analyse_suite(ts)
+    assert calls == []
+    flags("--jobs=0")
+    pcvsplot.analyse_suite(ts)
+    flags("--jobs=4")
+    pcvsplot.analyse_suite(ts)
+    assert calls == [None, 4]
@@ -0,0 +1,58 @@
+import csv
+import benchmarks
+import tests
+from conftest import result
+from test_benchmarks import IMB_ALLREDUCE, IMB_PINGPONG, OSU_LATENCY
+
+def report(tmp_path, ts_list):
+    path = str(tmp_path / "quarantine.csv")
+    n = tests.write_quarantine(ts_list, path)
+    with open(path, 'r') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == n
+    return rows
+
+def test_load(tmp_path, make_suite):
+    untagged = result("pt2pt_osu_latency", OSU_LATENCY, fq_name="untagged")
+    del untagged["data"]["tags"]
+    invalid = result("pt2pt_osu_latency", OSU_LATENCY, fq_name="invalid")
+    invalid["result"]["output"] = "not base64!"
+    path = make_suite("a", [result("pt2pt_osu_latency", OSU_LATENCY), untagged, invalid,
+        {"id": {"te_name": "nofqname"}}])
+    (tmp_path / "a" / "rawdata" / "broken.json").write_text("{")
+
+    ts = tests.PCVSTestSuite(path)
+    ts.build(None)
+    assert ts.ntests == 1
+    rows = report(tmp_path, [ts])
+    reasons = {r["fq_name"]: r["reason"] for r in rows}
+    assert reasons["untagged"] == "Test was not tagged"
+    assert reasons["invalid"].startswith("Invalid output")
+    # the result file that is not JSON, and the test without fq_name
+    assert len(rows) == 4
+    assert reasons[""].startswith("Invalid")
+    assert all(r["suite"] == str(ts.testdir) for r in rows)
+
+def test_parse(tmp_path, make_suite):
+    ts = tests.PCVSTestSuite(make_suite("a", [
+        result("pt2pt_osu_latency", "no result\n", fq_name="empty"),
+        # a single benchmark per output
+        result("Allreduce", IMB_PINGPONG + IMB_ALLREDUCE, fq_name="mixed")]))
+    ts.build(None)
+    for t in ts.tests.values():
+        b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=t.name)
+        d = ts.parse(b, t)
+        assert len(d) == 0
+        assert set(b.BENCHMARK_Y) <= set(d.columns)
+
+    reasons = {r["fq_name"]: r["reason"] for r in report(tmp_path, [ts])}
+    assert reasons["empty"] == "No result parsed by OSULatency"
+    assert reasons["mixed"].startswith("Parser IMBAllreduce failed")
+
+def test_empty_report(tmp_path, make_suite):
+    ts = tests.PCVSTestSuite(make_suite("a", [result("pt2pt_osu_latency", OSU_LATENCY)]))
+    ts.build(None)
+    # the report of a previous run is overwritten, header only
+    (tmp_path / "quarantine.csv").write_text("stale\n")
+    assert report(tmp_path, [ts]) == []
+    assert (tmp_path / "quarantine.csv").read_text().startswith("suite,file,fq_name,reason")
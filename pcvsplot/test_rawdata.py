@@ -0,0 +1,68 @@
+import gzip
+import io
+import json
+import lzma
+import tarfile
+import pytest
+import rawdata
+import tests
+from conftest import result
+from test_benchmarks import OSU_LATENCY
+
+def results(*fq_names):
+    return json.dumps({"tests": [result("pt2pt_osu_latency", OSU_LATENCY, fq_name=n)
+        for n in fq_names]}).encode()
+
+def write_tar(path, members, mode="w:gz"):
+    with tarfile.open(path, mode) as tar:
+        for name, data in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return str(path)
+
+def test_compressed_files(tmp_path):
+    rawdata_dir = tmp_path / "build" / "rawdata"
+    rawdata_dir.mkdir(parents=True)
+    (rawdata_dir / "a.json").write_bytes(results("a"))
+    (rawdata_dir / "b.json.gz").write_bytes(gzip.compress(results("b")))
+    (rawdata_dir / "c.json.xz").write_bytes(lzma.compress(results("c")))
+    write_tar(rawdata_dir / "d.tar.gz", {"d.json": results("d")})
+
+    ts = tests.PCVSTestSuite(str(tmp_path / "build") + "/")
+    ts.build(None)
+    assert sorted(t.fq_name for t in ts.tests.values()) == ["a", "b", "c", "d"]
+
+def test_zstd(tmp_path):
+    zstandard = pytest.importorskip("zstandard")
+    (tmp_path / "a.json.zst").write_bytes(zstandard.ZstdCompressor().compress(results("a")))
+    [(name, data, err)] = rawdata.iter_results(tmp_path / "a.json.zst")
+    assert err is None and data["tests"][0]["id"]["fq_name"] == "a"
+
+def test_archive(tmp_path):
+    # archive of a build directory, only its rawdata holds results
+    path = write_tar(tmp_path / "build.tar.xz", {"build/conf.json": b"{}",
+        "build/rawdata/a.json": results("a"), "build/rawdata/b.json.gz": gzip.compress(results("b"))},
+        "w:xz")
+    ts = tests.PCVSTestSuite(path)
+    ts.build(None)
+    assert ts.name == "build"
+    assert sorted(t.fq_name for t in ts.tests.values()) == ["a", "b"]
+    assert ts.tests[next(iter(ts.tests))].path.startswith(path + ":build/rawdata/")
+
+    # archive of the rawdata directory itself
+    path = write_tar(tmp_path / "rawdata.tgz", {"a.json": results("a")})
+    assert [data is not None for name, data, err in rawdata.iter_results(path)] == [True]
+
+def test_corrupted(tmp_path):
+    rawdata_dir = tmp_path / "build" / "rawdata"
+    rawdata_dir.mkdir(parents=True)
+    (rawdata_dir / "a.json.gz").write_bytes(gzip.compress(results("a"))[:-10])
+    (rawdata_dir / "b.tar.gz").write_bytes(b"not an archive")
+    write_tar(rawdata_dir / "c.tar", {"rawdata/c.json": b"{"}, "w")
+
+    ts = tests.PCVSTestSuite(str(tmp_path / "build") + "/")
+    ts.build(None)
+    assert ts.ntests == 0
+    assert [q["file"].split("rawdata/", 1)[-1] for q in ts.quarantine] == \
+            ["a.json.gz", "b.tar.gz", "c.tar:rawdata/c.json"]
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+import benchmarks
+import scaling
+import tests
+from conftest import result
+from test_benchmarks import IMB_ALLREDUCE, OSU_LATENCY
+
+def frame():
+    return pd.DataFrame({"bytes": [8, 8, 8, 8], "nprocs": [2, 4, 8, 4],
+        "latency": [10.0, 6.0, 5.0, 4.0], "bandwidth": [1.0, 2.0, 2.5, 2.0]})
+
+def test_strong():
+    s = scaling.scaling(frame(), "bytes", "latency")
+    # runs with the same process count are averaged
+    assert list(s["nprocs"]) == [2, 4, 8]
+    assert list(s[scaling.SPEEDUP]) == [1.0, 2.0, 2.0]
+    assert list(s[scaling.EFFICIENCY]) == [1.0, 1.0, 0.5]
+
+def test_weak():
+    s = scaling.scaling(frame(), "bytes", "latency", mode="weak")
+    assert list(s[scaling.EFFICIENCY]) == [1.0, 2.0, 2.0]
+    assert list(s[scaling.SPEEDUP]) == [1.0, 4.0, 8.0]
+
+    with pytest.raises(ValueError):
+        scaling.scaling(frame(), "bytes", "latency", mode="linear")
+
+def test_higher_is_better():
+    s = scaling.scaling(frame(), "bytes", "bandwidth")
+    assert list(s[scaling.SPEEDUP]) == [1.0, 2.0, 2.5]
+
+def test_efficiency_ordinate():
+    # the efficiency ordinate of IMB non-blocking collectives is kept
+    df = frame().rename(columns={"latency": "efficiency"})
+    s = scaling.scaling(df, "bytes", "efficiency")
+    assert list(s["efficiency"]) == [10.0, 5.0, 5.0]
+    assert list(s[scaling.EFFICIENCY]) == [1.0, 1.0, 0.5]
+
+def test_curves():
+    df = pd.concat([frame().assign(suite="a"), frame().assign(suite="b", latency=20.0)])
+    s = scaling.scaling(df, "bytes", "latency")
+    assert list(s["suite"]) == ["a"] * 3 + ["b"] * 3
+    assert list(s[scaling.SPEEDUP]) == [1.0, 2.0, 2.0, 1.0, 1.0, 1.0]
+
+def test_scaling_frame(make_suite):
+    b = benchmarks.IMBAllreduce
+    ts_list = []
+    for name in ["a", "b"]:
+        ts = tests.PCVSTestSuite(make_suite(name, [result("Allreduce", IMB_ALLREDUCE)]))
+        ts.build(None)
+        ts_list.append(ts)
+
+    # process counts of the IMB blocks
+    df = scaling.scaling_frame(ts_list, b, "Allreduce")
+    assert list(df["suite"]) == ["a"] * 6 + ["b"] * 6
+    assert list(df["nprocs"]) == [2, 2, 2, 4, 4, 4] * 2
+
+    with pytest.raises(KeyError):
+        scaling.scaling_frame(ts_list, b, "Allreduce", procs_key="n_mpi")
+
+def test_scaling_frame_iterator(make_suite):
+    b = benchmarks.OSULatency
+    ts = tests.PCVSTestSuite(make_suite("a", [
+        result("pt2pt_osu_latency", OSU_LATENCY, n_mpi=2),
+        result("pt2pt_osu_latency", OSU_LATENCY.replace("2.00", "1.00"), n_mpi=4)]))
+    ts.build(None)
+    df = scaling.scaling_frame([ts], b, "pt2pt_osu_latency", procs_key="n_mpi")
+    s = scaling.scaling(df, "bytes", "latency")
+    assert list(s.loc[s["bytes"] == 1024, scaling.SPEEDUP]) == [1.0, 2.0]
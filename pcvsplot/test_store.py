@@ -0,0 +1,60 @@
+import sqlite3
+import store
+import tests
+from conftest import result
+from test_benchmarks import OSU_LATENCY
+
+def suite(make_suite, name, scale=1):
+    output = OSU_LATENCY.replace("2.00", str(2.0 * scale))
+    ts = tests.PCVSTestSuite(make_suite(name, [result("pt2pt_osu_latency", output, rndv_mode=r)
+        for r in [0, 1]]))
+    ts.build(None)
+    return ts
+
+def test_trend(tmp_path, make_suite):
+    rs = store.ResultStore(str(tmp_path / "results.db"))
+    first = rs.ingest(suite(make_suite, "a"), "2024-01-01", "abc")
+    second = rs.ingest(suite(make_suite, "b", 2), "2024-02-01", "def")
+    assert list(rs.campaigns()["id"]) == [first, second]
+
+    df = rs.trend("pt2pt_osu_latency", "latency", bytes=1024, config={"rndv_mode": 0})
+    assert list(df["date"]) == ["2024-01-01", "2024-02-01"]
+    assert list(df["commit_id"]) == ["abc", "def"]
+    assert list(df["value"]) == [2.0, 4.0]
+
+    # both configs, all sizes but the dropped zero byte row
+    df = rs.trend("pt2pt_osu_latency", "latency")
+    assert len(df) == 2 * 2 * 3
+    assert len(rs.trend("pt2pt_osu_latency", "bandwidth")) == 0
+    rs.close()
+
+def test_reingest(tmp_path, make_suite):
+    rs = store.ResultStore(str(tmp_path / "results.db"))
+    ts = suite(make_suite, "a")
+    campaign = rs.ingest(ts, "2024-01-01")
+    # the same campaign replaces its results
+    assert rs.ingest(ts, "2024-01-01") == campaign
+    assert len(rs.campaigns()) == 1
+    assert len(rs.trend("pt2pt_osu_latency", "latency")) == 2 * 3
+
+    assert rs.ingest(ts, "2024-01-02") != campaign
+    assert len(rs.trend("pt2pt_osu_latency", "latency")) == 2 * 2 * 3
+    rs.close()
+
+def test_migrate(tmp_path, make_suite):
+    # store written with the former non unique index, ingested twice
+    db = sqlite3.connect(str(tmp_path / "results.db"))
+    db.executescript(store.ResultStore.SCHEMA.replace("UNIQUE INDEX IF NOT EXISTS results_key_idx",
+        "INDEX results_idx"))
+    db.execute("INSERT INTO campaigns VALUES (1, '2024-01-01', NULL, 'a')")
+    db.executemany("INSERT INTO results VALUES (1, 'pt2pt_osu_latency', '{}', 8, 'latency', ?)",
+            [(1.0,), (2.0,)])
+    db.commit()
+    db.close()
+
+    rs = store.ResultStore(str(tmp_path / "results.db"))
+    assert list(rs.trend("pt2pt_osu_latency", "latency")["value"]) == [2.0]
+    indexes = [r[0] for r in rs.db.execute("SELECT name FROM sqlite_master WHERE type = 'index'")]
+    assert "results_idx" not in indexes
+    assert "results_key_idx" in indexes
+    rs.close()
@@ -0,0 +1,65 @@
+import os
+import pytest
+import figcache
+import export
+import pcvsplot
+import tests
+from conftest import result
+from test_benchmarks import OSU_LATENCY, OSU_ALLREDUCE
+
+def suite(make_suite):
+    results = [result("pt2pt_osu_latency", OSU_LATENCY.replace("2.00", str(p + r)),
+        n_ptl=p, rndv_mode=r) for p in [1, 2] for r in [0, 1]]
+    # an iterator of some tests only
+    results.append(result("collective_osu_allreduce", OSU_ALLREDUCE, n_mpi=4))
+    ts = tests.PCVSTestSuite(make_suite("a", results))
+    ts.build(None)
+    return ts
+
+def test_index(make_suite):
+    ts = suite(make_suite)
+    assert len(ts.index) == 5
+    assert sorted(ts.iterators()) == ["n_mpi", "n_ptl", "rndv_mode"]
+    # integer iterators stay integers where other tests lack them
+    assert ts.index["n_ptl"].dropna().tolist() == [2, 2, 1, 1]
+
+def test_select(make_suite):
+    ts = suite(make_suite)
+    assert [t.comb for t in ts.select("pt2pt_osu_latency", n_ptl=2)] == \
+            [{"n_ptl": 2, "rndv_mode": 1}, {"n_ptl": 2, "rndv_mode": 0}]
+    assert len(ts.select("pt2pt_osu_latency", n_ptl=[1, 2], rndv_mode=0)) == 2
+    assert len(ts.select(n_mpi=4)) == 1
+    assert ts.select("pt2pt_osu_latency", n_mpi=4) == []
+    with pytest.raises(KeyError, match="n_tcp"):
+        ts.select(n_tcp=1)
+
+def test_groupby(make_suite):
+    ts = suite(make_suite)
+    groups = list(ts.groupby(["rndv_mode"], "pt2pt_osu_latency"))
+    assert [values for values, g in groups] == [(0,), (1,)]
+    assert [len(g) for values, g in groups] == [2, 2]
+    groups = list(ts.groupby(["n_ptl", "rndv_mode"], "pt2pt_osu_latency", n_ptl=1))
+    assert [values for values, g in groups] == [(1, 0), (1, 1)]
+    with pytest.raises(KeyError):
+        list(ts.groupby(["n_tcp"]))
+
+def test_frame(make_suite):
+    ts = suite(make_suite)
+    b = pcvsplot.benchmarks.OSULatency
+    df = ts.frame(b, "pt2pt_osu_latency", keys=["n_ptl"], rndv_mode=1)
+    assert len(df) == 2 * 3
+    assert "rndv_mode" not in df
+    assert sorted(df.loc[df["bytes"] == 1024, "latency"]) == [2.0, 3.0]
+    assert len(ts.frame(b, "pt2pt_osu_latency", n_ptl=8)) == 0
+
+def test_parse_cell():
+    assert pcvsplot.parse_cell(["n_ptl=2", "t_name=tcp", "n=[1, 2]"]) == \
+            {"n_ptl": 2, "t_name": "tcp", "n": [1, 2]}
+    assert pcvsplot.parse_cell(None) is None
+
+def test_plot_group(make_suite, flags):
+    flags("--formats=png")
+    ts = suite(make_suite)
+    pcvsplot.plot_n_ptl(figcache.FigureCache(), export.FigureExporter(["png"]), ts,
+            ["rndv_mode"], "pt2pt_osu_latency", "latency", where={"n_ptl": 2})
+    assert os.path.isfile("pt2pt_osu_latency_rndv_mode_a.png")
@@ -1,17 +1,37 @@
-import json
+import csv
 import base64
+import binascii
 import os
 import io
 import pathlib
 import logging
+import rawdata
+
+def parse_job(job):
+    """Parse the output of a (uname, benchmark class, output) job, in a
+    worker process of parse_all. Returns (uname, frame, error)."""
+    uname, b, output = job
+    try:
+        return uname, b.parse(output), None
+    except Exception as err:
+        return uname, None, "Parser " + b.__name__ + " failed: " + repr(err)
+
+class QuarantineError(Exception):
+    """Raised on a test that cannot be loaded."""
+    def __init__(self, message="Invalid test"):
+        self.message = message
+        super().__init__(self.message)
 
 class PCVSTest():
 
-    def __init__(self, t_js, testdir, it):
+    def __init__(self, t_js, testdir, it, path=None):
         self.data  = t_js 
+        self.path  = path
         self.name  = self.data["id"]["te_name"]
+        self.fq_name = self.data["id"]["fq_name"]
         self.uname = str(testdir) + "_" + self.data["id"]["fq_name"]
         self.uname = self.uname.replace("/","_")
+        self.comb  = self.data["id"].get("comb", {})
 
         try:
             self.it_value = self.data["id"]["comb"][it]
@@ -21,41 +41,214 @@ class PCVSTest():
         try:
             self.benchname = self.data["data"]["tags"]
         except KeyError as err:
-            logging.error(err)
-            logging.error("Tests were not tagged.")
-            sys.exit(1)
+            raise QuarantineError("Test was not tagged")
 
         #TODO: add some semantic to improve tag parsing
-        self.output = base64.b64decode(self.data["result"]["output"]).decode()
+        try:
+            self.output = base64.b64decode(self.data["result"]["output"]).decode()
+        except (KeyError, binascii.Error, UnicodeDecodeError) as err:
+            raise QuarantineError("Invalid output: " + str(err))
         logging.info("Initialized PCVSTest: name=" + self.name)
 
 class PCVSTestSuite():
 
     def __init__(self, test_dir):
-        self.testdir   = pathlib.Path(test_dir + "rawdata/")
-        self.files     = self.testdir.iterdir()
+        # a PCVS build directory, or an archive of one or of its rawdata
+        source = test_dir.rstrip("/")
+        if rawdata.is_archive(source) or os.path.isfile(source):
+            self.testdir = pathlib.Path(source)
+            self.name    = self.testdir.name.split(".")[0]
+        else:
+            self.testdir = pathlib.Path(test_dir + "rawdata/")
+            self.name    = self.testdir.parent.name
         self.testsuite = {}
+        self.tests     = {}
+        self._index    = None
+        self.frames    = {}
+        self.quarantine = []
         self.ntests    = 0
         logging.info("Initialized PCVSSuite: directory=" + self.testdir.name)
 
+    def quarantine_test(self, path, fq_name, reason):
+        """Keep a test out of the suite, recording why in the report."""
+        logging.warning("Quarantined test " + str(fq_name) + " of " + str(path) + ": " + reason)
+        self.quarantine.append({"file": str(path), "fq_name": fq_name, "reason": reason})
+
     def build(self, it):
-        for f in self.files:
-            with f.open('r') as f_h:
-                data = json.load(f_h)
-                for t_js in data["tests"]:
+        for f, data, err in rawdata.iter_results(self.testdir):
+            try:
+                if err is None:
+                    tests = data["tests"]
+            except (KeyError, TypeError) as e:
+                err = e
+            if err is not None:
+                self.quarantine_test(f, None, "Invalid result file: " + repr(err))
+                continue
+
+            for t_js in tests:
+                try:
                     if t_js["id"]["te_name"] == "Barrier" or \
                             t_js["id"]["te_name"] == "Ibarrier":
                         continue
-                    t = PCVSTest(t_js, self.testdir, it)
-                    if "compilation" not in t.benchname:
-                        if not t.name in self.testsuite:
-                            self.testsuite[t.name] = [t]
-                        else:
-                            self.testsuite[t.name].append(t)
-                        self.ntests = self.ntests + 1
+                    t = PCVSTest(t_js, self.testdir, it, f)
+                except (QuarantineError, KeyError, TypeError) as err:
+                    fq_name = None
+                    if isinstance(t_js, dict) and isinstance(t_js.get("id"), dict):
+                        fq_name = t_js["id"].get("fq_name")
+                    reason = err.message if isinstance(err, QuarantineError) else \
+                            "Invalid test: " + repr(err)
+                    self.quarantine_test(f, fq_name, reason)
+                    continue
+                if "compilation" not in t.benchname:
+                    self.tests[t.uname] = t
+                    if not t.name in self.testsuite:
+                        self.testsuite[t.name] = [t]
+                    else:
+                        self.testsuite[t.name].append(t)
+                    self.ntests = self.ntests + 1
 
         # sort list of test by name
         for t_name in self.testsuite:
             self.testsuite[t_name].sort(key=lambda x: x.uname, reverse=True);
 
+        self._index = None
         logging.info("Built PCVSSuite: ntests=" + str(self.ntests))
+
+    @property
+    def index(self):
+        """Index of all tests: one row per test with its name, uname and
+        the value of every comb iterator (NaN when a test lacks it). It is
+        built on first use, loading a suite does not need pandas."""
+        if self._index is None:
+            self._index = self.build_index()
+        return self._index
+
+    def build_index(self):
+        import pandas as pd
+        rows = []
+        for t_name in self.testsuite:
+            for t in self.testsuite[t_name]:
+                rows.append(dict(t.comb, te_name=t_name, uname=t.uname))
+        # nullable dtypes keep integer iterators integers when some tests lack them
+        return pd.DataFrame(rows, columns=None if rows else ["te_name", "uname"]).convert_dtypes()
+
+    def iterators(self):
+        return [c for c in self.index.columns if c not in ["te_name", "uname"]]
+
+    def match(self, name=None, **where):
+        """Rows of the index of test name (any if None) whose iterators
+        take the given values, a value may be a list of values."""
+        idx = self.index
+        mask = idx["uname"].notna()
+        if name is not None:
+            mask &= idx["te_name"] == name
+        for k, v in where.items():
+            if k not in idx:
+                raise KeyError("Unknown iterator " + k + ", available: " + str(self.iterators()))
+            mask &= idx[k].isin(v if isinstance(v, list) else [v])
+        return idx.loc[mask]
+
+    def select(self, name=None, **where):
+        """Tests matching name and iterator values, in suite order."""
+        return [self.tests[u] for u in self.match(name, **where)["uname"]]
+
+    def groupby(self, keys, name=None, **where):
+        """Yield (values, tests) for each combination of the values of
+        iterators keys among the matching tests."""
+        idx = self.match(name, **where)
+        for k in keys:
+            if k not in idx:
+                raise KeyError("Unknown iterator " + k + ", available: " + str(self.iterators()))
+        for values, g in idx.groupby(keys, sort=True, dropna=False):
+            yield values, [self.tests[u] for u in g["uname"]]
+
+    def frame(self, b, name, keys=None, blocks=False, **where):
+        """Tidy frame of the matching tests of name parsed with benchmark
+        b: parsed rows with the uname and iterators keys (default all) of
+        their test. With blocks, rows of all the process counts of each
+        output are parsed, with their nprocs column."""
+        import pandas as pd
+        idx = self.match(name, **where)
+        keys = self.iterators() if keys is None else keys
+        frames = []
+        for _, row in idx.iterrows():
+            t = self.tests[row["uname"]]
+            if blocks:
+                try:
+                    d = b.parse_blocks(t.output)
+                except Exception as err:
+                    self.quarantine_test(t.path, t.fq_name, "Parser " + b.__name__ +
+                            " failed: " + repr(err))
+                    continue
+            else:
+                d = self.parse(b, t)
+            frames.append(d.assign(uname=row["uname"], **{k: row[k] for k in keys}))
+        if len(frames) == 0:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def parse(self, b, t):
+        """Parse output of test t with benchmark class b. Frames are kept
+        so that a test is parsed only once by all plots of the suite. A
+        test whose output cannot be parsed is quarantined and yields an
+        empty frame."""
+        if t.uname not in self.frames:
+            _, d, err = parse_job((t.uname, b, t.output))
+            self.add_frame(b, t, d, err)
+        return self.frames[t.uname]
+
+    def add_frame(self, b, t, d, err):
+        if err is not None:
+            import pandas as pd
+            self.quarantine_test(t.path, t.fq_name, err)
+            d = pd.DataFrame([], columns=b.BENCHMARK_X + b.BENCHMARK_Y, dtype=float)
+        elif len(d) == 0:
+            self.quarantine_test(t.path, t.fq_name, "No result parsed by " + b.__name__)
+        self.frames[t.uname] = d
+
+    def parse_all(self, nprocs=None, chunksize=None):
+        """Parse all tests of known benchmarks not parsed yet in a pool of
+        nprocs processes (default: all cores), distributing chunksize tests
+        at a time. Returns the frames keyed by test uname."""
+        import multiprocessing
+        import benchmarks
+        jobs = []
+        for t_name in self.testsuite:
+            b = benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=t_name)
+            if b is None:
+                continue
+            for t in self.testsuite[t_name]:
+                if t.uname not in self.frames:
+                    jobs.append((t, b))
+
+        nprocs = nprocs or os.cpu_count() or 1
+        nprocs = min(nprocs, len(jobs))
+        if nprocs <= 1:
+            for t, b in jobs:
+                self.parse(b, t)
+            return self.frames
+
+        # several chunks per worker balance outputs of uneven sizes
+        if chunksize is None:
+            chunksize = max(1, len(jobs) // (4 * nprocs))
+        todo = {t.uname: (t, b) for t, b in jobs}
+        with multiprocessing.Pool(nprocs) as pool:
+            for uname, d, err in pool.imap_unordered(parse_job,
+                    [(t.uname, b, t.output) for t, b in jobs], chunksize):
+                t, b = todo[uname]
+                self.add_frame(b, t, d, err)
+        logging.info("Parsed PCVSSuite: ntests=" + str(len(jobs)) + " nprocs=" + str(nprocs))
+        return self.frames
+
+def write_quarantine(ts_list, path):
+    """Write the quarantined tests of all suites to a CSV report, with
+    its header only when no test was quarantined. Returns the number of
+    quarantined tests."""
+    rows = [dict(q, suite=str(ts.testdir)) for ts in ts_list for q in ts.quarantine]
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=["suite", "file", "fq_name", "reason"])
+        writer.writeheader()
+        writer.writerows(rows)
+    if len(rows) > 0:
+        logging.warning("Quarantined " + str(len(rows)) + " tests, see " + path)
+    return len(rows)
@@ -0,0 +1,154 @@
+import os
+import json
+import math
+import random
+import logging
+import config as cfg
+import parsers
+
+class Objective():
+    """Score of a run: aggregate of a benchmark metric over a range of
+    message sizes, parsed from the run output with the benchmarks
+    classes of pcvsplot."""
+
+    AGGREGATES = ["mean", "median", "min", "max"]
+
+    def __init__(self, benchmark, metric, agg="mean", min_bytes=0,
+            max_bytes=None, minimize=False):
+        self.b = parsers.benchmark_class(benchmark)
+        if self.b is None:
+            raise cfg.CfgArgError("Unknown benchmark '{}'".format(benchmark))
+        if metric not in self.b.BENCHMARK_Y:
+            raise cfg.CfgArgError("Benchmark '{}' has no metric '{}', choose from {}"
+                    .format(benchmark, metric, self.b.BENCHMARK_Y))
+        if agg not in self.AGGREGATES:
+            raise cfg.CfgArgError("Invalid aggregate '{}' not in {}"
+                    .format(agg, self.AGGREGATES))
+        self.benchmark = benchmark
+        self.metric    = metric
+        self.agg       = agg
+        self.min_bytes = min_bytes
+        self.max_bytes = max_bytes
+        self.minimize  = minimize
+
+    def settings(self):
+        """What the scores depend on besides the run, to check that trials
+        recorded in a journal can be reused."""
+        return {"benchmark": self.benchmark, "metric": self.metric, "agg": self.agg,
+                "min_bytes": self.min_bytes, "max_bytes": self.max_bytes,
+                "minimize": self.minimize}
+
+    def score(self, output):
+        with open(output, 'r') as f:
+            d = self.b.parse(f.read())
+        x = self.b.BENCHMARK_X[0]
+        d = d.loc[d[x] >= self.min_bytes]
+        if self.max_bytes is not None:
+            d = d.loc[d[x] <= self.max_bytes]
+        y = d[self.metric].dropna()
+        if len(y) == 0:
+            return None
+        return float(getattr(y, self.agg)())
+
+    def sort_key(self, score):
+        """Sort key placing the best scores first and failed runs last."""
+        if score is None:
+            return math.inf
+        return score if self.minimize else -score
+
+def search_space(space):
+    """Values of each tuning key. A null value stands for all the
+    ALLOWED_VALUES of the configuration key."""
+    values = {}
+    for key, v in space.items():
+        if v is None:
+            cfgarg = cfg.GetCfgArgClass(cfg.CfgArg, CFG_KEY=key)
+            if not hasattr(cfgarg, "ALLOWED_VALUES"):
+                raise cfg.CfgArgError("Key '{}' has no allowed values, "
+                        "list them in the search space".format(key))
+            v = cfgarg.ALLOWED_VALUES
+        values[key] = v
+    return values
+
+def grid_points(space):
+    keys = list(space.keys())
+    points = [{}]
+    for key in keys:
+        points = [dict(p, **{key: v}) for p in points for v in space[key]]
+    return points
+
+class Tuner():
+    """Search the configuration space with one of STRATEGIES.
+
+    Each trial (point, repetition) is run through run(config, output) and
+    recorded in the journal with its score, so that rerunning a search
+    with the same journal reuses completed trials."""
+
+    STRATEGIES = ["grid", "random", "halving"]
+
+    def __init__(self, base_config, space, objective, journal, outdir, run):
+        self.base_config = base_config
+        self.space       = search_space(space)
+        self.objective   = objective
+        self.journal     = journal
+        self.outdir      = outdir
+        self.run         = run
+        self.states      = journal.states()
+
+    def make_config(self, point):
+        config = cfg.Config.ConfigDecoder().decode(json.dumps(self.base_config))
+        for key, value in point.items():
+            config.set(key, value)
+        return config
+
+    def evaluate(self, point, rep=0):
+        config = self.make_config(point)
+        trial  = "{}.{}".format(config.config_hash(), rep)
+        state  = self.states.get(trial)
+        if state is not None and state["status"] in ["completed", "failed"]:
+            return state["score"]
+
+        output = os.path.join(self.outdir, trial + ".out")
+        logging.info("Running trial {} rep {}".format(point, rep))
+        self.journal.record(trial, "running", point=point, rep=rep, output=output)
+        rc = self.run(config, output)
+
+        score = self.objective.score(output) if rc == 0 else None
+        status = "completed" if score is not None else "failed"
+        self.journal.record(trial, status, point=point, rep=rep, output=output,
+                exit_code=rc, score=score)
+        self.states[trial] = {"status": status, "score": score}
+        logging.info("Trial {} rep {}: score={}".format(point, rep, score))
+        return score
+
+    def mean_score(self, point, nreps):
+        scores = [self.evaluate(point, rep) for rep in range(nreps)]
+        if None in scores:
+            return None
+        return sum(scores) / len(scores)
+
+    def search(self, strategy="grid", budget=None, seed=0):
+        """Returns the list of (score, point) of the last round, best first."""
+        points = grid_points(self.space)
+        rng = random.Random(seed)
+        if strategy in ["random", "halving"] and budget is not None and budget < len(points):
+            points = rng.sample(points, budget)
+
+        if strategy in ["grid", "random"]:
+            results = [(self.mean_score(p, 1), p) for p in points]
+        elif strategy == "halving":
+            # successive halving: keep the best half, double the repetitions
+            nreps = 1
+            while True:
+                results = [(self.mean_score(p, nreps), p) for p in points]
+                results.sort(key=lambda r: self.objective.sort_key(r[0]))
+                if len(points) == 1:
+                    break
+                points = [p for (s, p) in results[:math.ceil(len(points) / 2)]]
+                nreps = nreps * 2
+        else:
+            raise cfg.CfgArgError("Invalid strategy '{}' not in {}"
+                    .format(strategy, self.STRATEGIES))
+
+        results.sort(key=lambda r: self.objective.sort_key(r[0]))
+        return results
@@ -0,0 +1,113 @@
+import os
+import json
+import logging
+import config as cfg
+import parsers
+
+class Calibration():
+    """Short OSU pingpong and bandwidth runs of a configuration, compared
+    to the baseline of its fabric (the net key) before trusting a sweep.
+
+    The baseline file maps each fabric to the reference value of each
+    metric per message size (example: {\"tcp\": {\"latency\": {\"8\": 20.5},
+    \"bandwidth\": {\"1048576\": 1150.0}}}). A run fails calibration when
+    latency exceeds its reference, or bandwidth falls below it, by more
+    than tolerance (a fraction of the reference) at any size.
+
+    Each test is the fq_name of a PCVS test, or the path of an executable
+    run instead. run(config, output) runs a configuration and returns its
+    exit code."""
+
+    BENCHMARKS = {"latency": "pt2pt_osu_latency", "bandwidth": "pt2pt_osu_bw"}
+
+    def __init__(self, baseline, tests, run, tolerance=0.25, outdir="."):
+        self.baseline_path = baseline
+        self.baseline  = {}
+        if os.path.isfile(baseline):
+            with open(baseline, 'r') as f:
+                self.baseline = json.load(f)
+        self.tests     = tests
+        self.run       = run
+        self.tolerance = tolerance
+        self.outdir    = outdir
+
+    def make_config(self, config, test):
+        c = cfg.Config.ConfigDecoder().decode(cfg.Config.ConfigEncoder().encode(config.__dict__))
+        # a pingpong between two processes, on two nodes when the runs span several
+        c.set("n", 2)
+        c.set("N", min(c.N.value, 2))
+        if os.path.isfile(test) and os.access(test, os.X_OK):
+            c.fq_name.use_program(test)
+        else:
+            c.set("fq_name", test)
+        return c
+
+    def measure(self, config):
+        """Values of each metric per message size, None for a failed run."""
+        os.makedirs(self.outdir, exist_ok=True)
+        measures = {}
+        for metric, test in self.tests.items():
+            b = parsers.benchmark_class(self.BENCHMARKS[metric])
+            output = os.path.join(self.outdir, "calibration_{}.out".format(metric))
+            try:
+                c = self.make_config(config, test)
+            except (cfg.CfgArgError, TypeError) as err:
+                # TypeError: the exec line of the test could not be parsed
+                logging.error("Invalid calibration {} test '{}': {}".format(metric, test, err))
+                return None
+            rc = self.run(c, output)
+            if rc != 0:
+                logging.error("Calibration {} run exited with code {}, see '{}'"
+                        .format(metric, rc, output))
+                return None
+
+            parser = b.stream()
+            with open(output, 'r') as f:
+                for line in f:
+                    parser.feed(line)
+            measures[metric] = {str(row["bytes"]): row[metric] for row in parser.rows}
+        return measures
+
+    def check(self, net, measures):
+        """Messages describing each value out of tolerance."""
+        if net not in self.baseline:
+            return ["No baseline for fabric '{}' in '{}', record one with --record"
+                    .format(net, self.baseline_path)]
+        failures = []
+        for metric, ref in self.baseline[net].items():
+            for size, ref_value in ref.items():
+                value = measures.get(metric, {}).get(size)
+                if value is None:
+                    failures.append("{} not measured at {} bytes".format(metric, size))
+                    continue
+                ratio = value / ref_value
+                if (metric == "latency" and ratio > 1 + self.tolerance) or \
+                        (metric != "latency" and ratio < 1 - self.tolerance):
+                    failures.append("{} {} at {} bytes is {:.0f}% of baseline {}"
+                            .format(metric, value, size, 100 * ratio, ref_value))
+        return failures
+
+    def calibrate(self, config, record=False):
+        """Measure config and compare it to the baseline of its fabric, or
+        record it as that baseline. Returns True when results can be
+        trusted."""
+        net = config.net.value
+        logging.info("Calibrating fabric '{}'".format(net))
+        measures = self.measure(config)
+        if measures is None:
+            return False
+
+        if record:
+            self.baseline[net] = measures
+            with open(self.baseline_path, 'w') as f:
+                json.dump(self.baseline, f, indent=4)
+            logging.info("Recorded baseline of fabric '{}' in '{}'".format(net, self.baseline_path))
+            return True
+
+        failures = self.check(net, measures)
+        for failure in failures:
+            logging.error("Calibration failed: {}".format(failure))
+        if not failures:
+            logging.info("Calibration of fabric '{}' within {:.0f}% of baseline"
+                    .format(net, 100 * self.tolerance))
+        return not failures
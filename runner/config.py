@@ -4,6 +4,9 @@ import os
 import pathlib
 import logging
 import json
+import hashlib
+import topology
+import parsers
 from typing import List
 
 logging.basicConfig()
@@ -319,6 +322,105 @@ class CfgArgTransport(CfgArgKeyValue):
                 return False
         return True
 
+class CfgArgBind(CfgArgKeyValue):
+
+    CFG_KEY = 'bind'
+    CFG_STR = "export SLURM_CPU_BIND="
+    ALLOWED_VALUES = ["default", "none", "cores", "threads", "sockets", "ldoms"]
+
+    def __init__(self, value="default"):
+        super().__init__(value)
+
+    def check_arg(self, value):
+        return value in self.ALLOWED_VALUES
+
+    def to_string(self):
+        if self.value == "default":
+            return ""
+        return self.CFG_STR + self.value
+
+class CfgArgCpuMap(CfgArgKeyValue):
+
+    CFG_KEY = 'cpu_map'
+    CFG_STR = "export SLURM_CPU_BIND=map_cpu:"
+
+    def __init__(self, value=None):
+        super().__init__([] if value is None else value)
+
+    def check_arg(self, value):
+        if not isinstance(value, list):
+            return False
+        if len(value) == 0:
+            return True
+        cpus = topology.local().cpus
+        for cpu in value:
+            if not isinstance(cpu, int) or cpu not in cpus:
+                logging.error("cpu {} not in local topology {}".format(cpu, cpus))
+                return False
+        return True
+
+    def to_string(self):
+        if len(self.value) == 0:
+            return ""
+        return self.CFG_STR + ",".join([str(cpu) for cpu in self.value])
+
+class CfgArgNuma(CfgArgKeyValue):
+
+    CFG_KEY = 'numa'
+    CFG_STR = "numactl --cpunodebind={0} --membind={0}"
+
+    def __init__(self, value=-1):
+        super().__init__(value)
+
+    def check_arg(self, value):
+        if not isinstance(value, int):
+            return False
+        if value == -1:
+            return True
+        nodes = topology.local().numa
+        if value not in nodes:
+            logging.error("numa node {} not in local topology {}"
+                    .format(value, sorted(nodes.keys())))
+            return False
+        return True
+
+    def to_string(self):
+        if self.value == -1:
+            return ""
+        return self.CFG_STR.format(self.value)
+
+class CfgArgTimeout(CfgArgKeyValue):
+
+    CFG_KEY = 'timeout'
+    CFG_STR = ""
+
+    def __init__(self, value=0):
+        super().__init__(value)
+
+    def check_arg(self, value):
+        return isinstance(value, int) and value >= 0
+
+    def to_string(self):
+        return ""
+
+class CfgArgIdleTimeout(CfgArgTimeout):
+
+    CFG_KEY = 'idle_timeout'
+
+class CfgArgLauncher(CfgArgKeyValue):
+
+    CFG_KEY = 'launcher'
+    CFG_STR = ""
+
+    def __init__(self, value="mpcrun"):
+        super().__init__(value)
+
+    def check_arg(self, value):
+        return isinstance(value, str) and value != ""
+
+    def to_string(self):
+        return self.value
+
 class CfgArgVerbose(CfgArgKeyValue):
 
     CFG_KEY = 'verbose'
@@ -421,16 +523,18 @@ class CfgArgExe(CfgArg):
                 args = arg + " " + args
 
     def search(self, build):
-        testdir = pathlib.Path(build + "/rawdata/")
+        # the build must exist on disk, its results files may be compressed
+        rawdata = parsers.import_pcvsplot("rawdata")
 
         try:
-            for f in testdir.iterdir():
-                with f.open('r') as f_h:
-                    data = json.load(f_h)
-                    for t_js in data["tests"]:
-                        if t_js["id"]["fq_name"] == self.value:
-                            (path, args) = self.parse_exec_line(t_js["exec"])
-                            raise self.Found
+            for f, data, err in rawdata.iter_results(build + "/rawdata/"):
+                if err is not None:
+                    logging.warning("Skipping unreadable results file '{}': {}".format(f, err))
+                    continue
+                for t_js in data["tests"]:
+                    if t_js["id"]["fq_name"] == self.value:
+                        (path, args) = self.parse_exec_line(t_js["exec"])
+                        raise self.Found
             self.is_valid = False
             raise CfgArgError("Could not find test with fq_name={}".
                     format(self.value))
@@ -441,6 +545,12 @@ class CfgArgExe(CfgArg):
             logging.debug("Test path: {}. Tests args: {}".format(self.path, self.args))
             self.is_valid = True
 
+    def use_program(self, path, args=""):
+        """Run path instead of the executable of the PCVS test."""
+        self.path = path
+        self.args = args
+        self.is_valid = True
+
     def to_string(self, with_arg):
         if self.is_valid == False:
             logging.warning("Test '{}' not set".format(self.value))
@@ -534,6 +644,10 @@ class Config():
             json_str = self.ConfigEncoder().encode(self.__dict__)
             f.write(json_str)
 
+    def config_hash(self):
+        json_str = self.ConfigEncoder(sort_keys=True).encode(self.__dict__)
+        return hashlib.sha256(json_str.encode()).hexdigest()[:16]
+
     def config_print(self):
         logging.info("Printing configuration:\n{}"
                 .format(self.ConfigEncoder().encode(self.__dict__)))
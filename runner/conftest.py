@@ -0,0 +1,37 @@
+import json
+import os
+import subprocess
+import sys
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+TESTDATA = os.path.join(HERE, "testdata")
+
+def runner(tmp_path, *args, **env):
+    """Run runner.py in tmp_path with the fake launcher of testdata."""
+    env = dict(os.environ, PATH=TESTDATA + os.pathsep + os.environ["PATH"], **env)
+    return subprocess.run([sys.executable, os.path.join(HERE, "runner.py"), *args],
+            env=env, cwd=tmp_path, capture_output=True, text=True)
+
+@pytest.fixture
+def config_file(tmp_path):
+    """Configuration of a fake MPC install and PCVS build whose tests
+    osu/latency and osu/bw are the fake OSU programs of testdata."""
+    (tmp_path / "install").mkdir()
+    (tmp_path / "install" / "mpcvars.sh").write_text("")
+    (tmp_path / "build" / "rawdata").mkdir(parents=True)
+    (tmp_path / "build" / "conf.yml").write_text("")
+    tests = [{"id": {"fq_name": "osu/latency"}, "exec": os.path.join(TESTDATA, "osu_latency")},
+            {"id": {"fq_name": "osu/bw"}, "exec": os.path.join(TESTDATA, "osu_bw")}]
+    with open(tmp_path / "build" / "rawdata" / "osu.json", 'w') as f:
+        json.dump({"tests": tests}, f)
+
+    path = tmp_path / "config.json"
+    runner(tmp_path, "init", "--cfg-file", str(path)).check_returncode()
+    with open(path, 'r') as f:
+        config = json.load(f)
+    config.update({"install": str(tmp_path / "install"), "build": str(tmp_path / "build"),
+        "fq_name": "osu/latency"})
+    with open(path, 'w') as f:
+        json.dump(config, f)
+    return path
@@ -0,0 +1,59 @@
+import json
+import os
+import time
+import logging
+
+class JournalError(Exception):
+    def __init__(self, message="Invalid journal"):
+        self.message = message
+        super().__init__(self.message)
+
+class Journal():
+    """Append-only record of the state of a sweep (JSON lines).
+
+    The first line is a header holding the sweep description and the base
+    configuration. Each following line records the state of one sweep
+    point, identified by the hash of its configuration: status (running,
+    completed, failed, ...), output path and exit code. The last record
+    of a point is its current state, so that an interrupted sweep can be
+    resumed from the journal alone."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def exists(self):
+        return os.path.isfile(self.path)
+
+    def create(self, header):
+        with open(self.path, 'w') as f:
+            f.write(json.dumps(header) + "\n")
+        logging.info("Created journal '{}'".format(self.path))
+
+    def header(self):
+        with open(self.path, 'r') as f:
+            try:
+                return json.loads(f.readline())
+            except json.decoder.JSONDecodeError:
+                raise JournalError("Invalid journal header in '{}'".format(self.path))
+
+    def states(self):
+        states = {}
+        with open(self.path, 'r') as f:
+            f.readline()
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.decoder.JSONDecodeError:
+                    # last line of a journal killed while writing
+                    logging.warning("Skipping truncated journal entry")
+                    continue
+                states[entry["hash"]] = entry
+        return states
+
+    def record(self, cfg_hash, status, **kwargs):
+        entry = {"hash": cfg_hash, "status": status, "time": time.time()}
+        entry.update(kwargs)
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
@@ -0,0 +1,74 @@
+import datetime
+import hashlib
+import json
+import os
+import shutil
+import logging
+
+_DIGESTS = {}
+
+def file_digest(path):
+    """sha256 of the content of a file, cached by path, size and mtime.
+    Empty string when path is not a file."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return ""
+    key = (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+    if key not in _DIGESTS:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                h.update(block)
+        _DIGESTS[key] = h.hexdigest()
+    return _DIGESTS[key]
+
+class Memo():
+    """Local store of the outputs of successful runs, keyed by what
+    determines a result: the expanded command, the content hash of the
+    executable and the MPC install path. Each entry is an output file
+    <key>.out and its metadata <key>.json in directory path. A memo
+    created with force never reuses results but still records them."""
+
+    DEFAULT_DIR = "./.runner_memo"
+
+    def __init__(self, path=DEFAULT_DIR, force=False):
+        self.path  = path
+        self.force = force
+
+    @staticmethod
+    def key(cmd, exe, install):
+        h = hashlib.sha256()
+        for part in [cmd, file_digest(exe), os.path.realpath(install)]:
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.hexdigest()[:32]
+
+    def entry(self, key):
+        return os.path.join(self.path, key + ".out"), os.path.join(self.path, key + ".json")
+
+    def fetch(self, key, output):
+        """Copy the memoized output of key to output. Returns False when
+        there is no valid entry."""
+        if self.force:
+            return False
+        out, meta = self.entry(key)
+        try:
+            with open(meta, 'r') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if info.get("exit_code") != 0 or not os.path.isfile(out):
+            return False
+        shutil.copyfile(out, output)
+        logging.info("Reusing result of {} from '{}'".format(info.get("date"), out))
+        return True
+
+    def store(self, key, output, **info):
+        os.makedirs(self.path, exist_ok=True)
+        out, meta = self.entry(key)
+        shutil.copyfile(output, out)
+        # metadata last, an entry is valid once it is written
+        with open(meta + ".tmp", 'w') as f:
+            json.dump(dict(info, exit_code=0, date=datetime.datetime.now().isoformat()), f)
+        os.replace(meta + ".tmp", meta)
@@ -0,0 +1,17 @@
+import importlib
+import os
+import sys
+
+# benchmark output parsers are shared with pcvsplot
+PCVSPLOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "pcvsplot")
+
+def import_pcvsplot(name):
+    """Import module name of pcvsplot, on first use only."""
+    if PCVSPLOT_DIR not in sys.path:
+        sys.path.append(PCVSPLOT_DIR)
+    return importlib.import_module(name)
+
+def benchmark_class(name):
+    """Parser class of benchmark name, None if unknown."""
+    benchmarks = import_pcvsplot("benchmarks")
+    return benchmarks.GetBenchmarkClass(benchmarks.Benchmark, BENCHMARK_NAME=name)
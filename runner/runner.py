@@ -1,9 +1,19 @@
 import argparse
+import csv
+import itertools
 import json
 import os
+import shlex
 import sys
+import time
 import logging
 import config as cfg
+import journal as jn
+import watchdog as wd
+import autotune as at
+import calibrate as cb
+import memo as mm
+import stream as st
 import subprocess
 
 logging.basicConfig()
@@ -22,70 +32,139 @@ set pagination off
 run
 """
 
-class Runner():
-
-    def __init__(self):
-        self.cmd = ""
+def add_cmd_prefix(cmd, cfgarg):
+    if cfgarg.to_string() != "":
+        return cmd + cfgarg.to_string() + "\n"
+    else:
+        return cmd
 
-    def build_cmd(self, config):
-        def add_cmd_prefix(cmd, cfgarg):
-            if cfgarg.to_string() != "":
-                return cmd + cfgarg.to_string() + "\n"
-            else:
-                return cmd
-        def add_cmd_arg(cmd, cfgarg):
-            if cfgarg.to_string() != "":
-                return cmd + " " + cfgarg.to_string()
-            else:
-                return cmd
-        def add_cmd_exe(cmd, cfgarg, with_args):
-            return cmd + " " + cfgarg.to_string(with_args)
+def add_cmd_arg(cmd, cfgarg):
+    if cfgarg.to_string() != "":
+        return cmd + " " + cfgarg.to_string()
+    else:
+        return cmd
 
-        # add source mpc
-        self.cmd = add_cmd_prefix(self.cmd, config.install)
+def add_cmd_exe(cmd, cfgarg, with_args):
+    return cmd + " " + cfgarg.to_string(with_args)
 
-        # add environment variables
-        self.cmd = add_cmd_prefix(self.cmd, config.n_ptl)
-        self.cmd = add_cmd_prefix(self.cmd, config.n_tcp)
-        self.cmd = add_cmd_prefix(self.cmd, config.ptl_max_mr)
-        self.cmd = add_cmd_prefix(self.cmd, config.rndv_mode)
-        self.cmd = add_cmd_prefix(self.cmd, config.offload)
-        self.cmd = add_cmd_prefix(self.cmd, config.t_name)
+class Runner():
 
-        # launcher
-        self.cmd += "mpcrun"
+    def __init__(self):
+        self.cmd          = ""
+        self.timeout      = 0
+        self.idle_timeout = 0
+        self.timed_out    = None
+        self.exe          = ""
+        self.install      = ""
+        self.memoized     = False
+
+    @staticmethod
+    def setup_cmd(config):
+        """Setup shared by all runs of an installation."""
+        # add source mpc
+        return add_cmd_prefix("", config.install)
+
+    @staticmethod
+    def env_cmd(config):
+        """Exported environment variables of a run."""
+        cmd = ""
+        cmd = add_cmd_prefix(cmd, config.n_ptl)
+        cmd = add_cmd_prefix(cmd, config.n_tcp)
+        cmd = add_cmd_prefix(cmd, config.ptl_max_mr)
+        cmd = add_cmd_prefix(cmd, config.rndv_mode)
+        cmd = add_cmd_prefix(cmd, config.offload)
+        cmd = add_cmd_prefix(cmd, config.t_name)
+
+        # add placement, a cpu map overrides the binding policy
+        cmd = add_cmd_prefix(cmd, config.bind)
+        cmd = add_cmd_prefix(cmd, config.cpu_map)
+        return cmd
+
+    @staticmethod
+    def launch_cmd(config):
+        """Launcher command line of a run."""
+        cmd = config.launcher.to_string()
 
         # verbose
-        self.cmd = add_cmd_arg(self.cmd, config.verbose)
+        cmd = add_cmd_arg(cmd, config.verbose)
 
         # add MPI config
-        self.cmd = add_cmd_arg(self.cmd, config.c)
-        self.cmd = add_cmd_arg(self.cmd, config.n)
-        self.cmd = add_cmd_arg(self.cmd, config.N)
-        self.cmd = add_cmd_arg(self.cmd, config.p)
-        self.cmd = add_cmd_arg(self.cmd, config.net)
+        cmd = add_cmd_arg(cmd, config.c)
+        cmd = add_cmd_arg(cmd, config.n)
+        cmd = add_cmd_arg(cmd, config.N)
+        cmd = add_cmd_arg(cmd, config.p)
+        cmd = add_cmd_arg(cmd, config.net)
 
         # add opt mpcrun
-        self.cmd = add_cmd_arg(self.cmd, config.opt)
+        cmd = add_cmd_arg(cmd, config.opt)
 
-        # add wrapper config
-        self.cmd = add_cmd_arg(self.cmd, config.type)
+        # add numa placement outside of the wrapper, so that a debugger
+        # runs the benchmark and not numactl
+        cmd = add_cmd_arg(cmd, config.numa)
+        cmd = add_cmd_arg(cmd, config.type)
 
         # add exec
         if config.type.value == "gdb":
-            self.cmd = add_cmd_exe(self.cmd, config.fq_name, False)
+            cmd = add_cmd_exe(cmd, config.fq_name, False)
         else:
             if config.program_args.value == "":
-                self.cmd = add_cmd_exe(self.cmd, config.fq_name, True)
+                cmd = add_cmd_exe(cmd, config.fq_name, True)
             else:
-                self.cmd = add_cmd_exe(self.cmd, config.fq_name, False)
-                self.cmd = add_cmd_arg(self.cmd, config.program_args)
+                cmd = add_cmd_exe(cmd, config.fq_name, False)
+                cmd = add_cmd_arg(cmd, config.program_args)
+        return cmd
 
-    def run(self, show=False):
+    def build_cmd(self, config):
+        self.cmd += self.setup_cmd(config)
+        self.cmd += self.env_cmd(config)
+        self.cmd += self.launch_cmd(config)
+
+        # watchdog limits
+        self.timeout      = config.timeout.value
+        self.idle_timeout = config.idle_timeout.value
+
+        # inputs of the result besides the command
+        if config.fq_name.is_valid:
+            self.exe = config.fq_name.path.strip()
+        self.install = config.install.value
+
+    def run(self, show=False, output=None, monitor=None, memo=None):
+        """Run the command, writing its output to output or stdout. A
+        monitor is called on each line of output and may abort the run.
+        With a memo, the output of an identical successful run is reused
+        and successful runs are memoized."""
+        if memo is None or output is None or show == True:
+            return self.execute(show, output, monitor)
+
+        key = memo.key(self.cmd, self.exe, self.install)
+        if memo.fetch(key, output):
+            self.memoized = True
+            return 0
+        rc = self.execute(show, output, monitor)
+        if rc == 0 and self.timed_out is None:
+            memo.store(key, output, cmd=self.cmd, exe=self.exe, install=self.install)
+        return rc
+
+    def execute(self, show=False, output=None, monitor=None):
         if show == True:
             logging.info("Printing command:\n{}".format(self.cmd))
+            return 0
+        elif self.timeout > 0 or self.idle_timeout > 0 or monitor is not None:
+            watchdog = wd.Watchdog(self.timeout, self.idle_timeout)
+            if output is not None:
+                with open(output, 'w') as f:
+                    rc = watchdog.run(self.cmd, f, output + ".diag", monitor)
+            else:
+                rc = watchdog.run(self.cmd, sys.stdout, on_line=monitor)
+            self.timed_out = watchdog.reason
+            return rc
+        elif output is not None:
+            with open(output, 'w') as f:
+                rv = subprocess.run(['/bin/bash', '-c', self.cmd],
+                        stdout=f, stderr=subprocess.STDOUT)
+            return rv.returncode
         else:
-            subprocess.run(['/bin/bash', '-c', self.cmd])
+            return subprocess.run(['/bin/bash', '-c', self.cmd]).returncode
 
 def init(args):
     """Init runner by creating a local configuration file.
@@ -179,17 +258,421 @@ def run(args):
     # load configuration from file
     config = cfg.Config.config_load("./config.json")
 
+    monitor = None
+    if args.stream:
+        monitor = st.StreamMonitor(args.stream, args.abort_metric, args.baseline,
+                args.abort_below, args.abort_above)
+
     # build command
     runner.build_cmd(config)
     if args.show:
-        runner.run(show=True)
+        rc = runner.run(show=True)
+    else:
+        rc = runner.run(show=False, output=args.output, monitor=monitor,
+                memo=mm.Memo(args.memo_dir, args.no_memo))
+    # timeouts and aborted streams exit with their own codes
+    sys.exit(rc)
+
+def sweep_points(sweep):
+    """Cartesian product of the sweep, a dict of key to list of values."""
+    keys = list(sweep.keys())
+    for values in itertools.product(*[sweep[key] for key in keys]):
+        yield dict(zip(keys, values))
+
+def sweep_configs(header):
+    """Configurations of all points of a journal header, validated before
+    anything is run."""
+    configs = []
+    for point in sweep_points(header["sweep"]):
+        config = cfg.Config.ConfigDecoder().decode(json.dumps(header["config"]))
+        for key, value in point.items():
+            if not config.has_key(key):
+                raise KeyError("Key {} not found".format(key))
+            config.set(key, value)
+        configs.append((point, config))
+    return configs
+
+def run_sweep(journal, retry_failed=True, memo=None):
+    header = journal.header()
+    states = journal.states()
+    configs = sweep_configs(header)
+    os.makedirs(header["outdir"], exist_ok=True)
+
+    nrun = 0
+    for i, (point, config) in enumerate(configs):
+        cfg_hash = config.config_hash()
+        state = states.get(cfg_hash)
+        if state is not None and (state["status"] == "completed" or
+                (state["status"] not in ["running", "exported"] and not retry_failed)):
+            logging.info("[{}/{}] Skipping {} point {}"
+                    .format(i+1, len(configs), state["status"], point))
+            continue
+
+        output = os.path.join(header["outdir"], cfg_hash + ".out")
+        logging.info("[{}/{}] Running point {}".format(i+1, len(configs), point))
+        journal.record(cfg_hash, "running", point=point, output=output)
+
+        runner = Runner()
+        runner.build_cmd(config)
+        rc = runner.run(output=output, memo=memo)
+
+        if runner.memoized:
+            journal.record(cfg_hash, "completed", point=point, output=output,
+                    exit_code=rc, memoized=True)
+        elif runner.timed_out is not None:
+            journal.record(cfg_hash, "timeout", point=point, output=output,
+                    exit_code=rc, reason=runner.timed_out)
+        else:
+            status = "completed" if rc == 0 else "failed"
+            journal.record(cfg_hash, status, point=point, output=output, exit_code=rc)
+        nrun = nrun + 1
+
+    states = journal.states()
+    nfailed = len([s for s in states.values() if s["status"] != "completed"])
+    logging.info("Sweep done: {} run, {} points not completed".format(nrun, nfailed))
+
+def create_sweep(args):
+    """Create the journal of a new sweep, None if one already exists."""
+    journal = jn.Journal(args.journal)
+    if journal.exists() and not args.force:
+        logging.warning("{} already exists. Continue it with 'resume' or "
+                "overwrite with --force".format(args.journal))
+        return None
+
+    cfg_file = args.cfg_file if args.cfg_file else "./config.json"
+    with open(cfg_file, 'r') as f:
+        base_config = json.load(f)
+    with open(args.sweep_file, 'r') as f:
+        sweep = json.load(f)
+
+    header = {"sweep": sweep, "config": base_config, "outdir": os.path.abspath(args.outdir)}
+    # fail on invalid points before creating the journal
+    sweep_configs(header)
+    journal.create(header)
+    return journal
+
+def calibration(args, baseline, outdir):
+    tests = {"latency": args.latency_test, "bandwidth": args.bandwidth_test}
+    return cb.Calibration(baseline, tests, run_config, args.tolerance, outdir)
+
+def preflight(args, header):
+    """Run the calibration requested by --calibrate on the base
+    configuration of a sweep. Returns True when the sweep can run."""
+    if not args.calibrate:
+        return True
+    config = cfg.Config.ConfigDecoder().decode(json.dumps(header["config"]))
+    if not calibration(args, args.calibrate, header["outdir"]).calibrate(config):
+        logging.error("Refusing to run sweep on a fabric out of tolerance")
+        return False
+    return True
+
+def calibrate(args):
+    """Check OSU latency and bandwidth of a configuration against the
+    baseline of its fabric, or record them as baseline with --record.
+    Exits with code 1 when the calibration fails, to gate batch jobs."""
+    if args.journal:
+        header = jn.Journal(args.journal).header()
+        config = cfg.Config.ConfigDecoder().decode(json.dumps(header["config"]))
     else:
-        runner.run(show=False)
+        config = cfg.Config.config_load(args.cfg_file if args.cfg_file else "./config.json")
+
+    if not calibration(args, args.baseline, args.outdir).calibrate(config, args.record):
+        sys.exit(1)
+
+def sweep(args):
+    """Run all points of a sweep file, recording them in a journal.
+    The sweep file maps configuration keys to lists of values (example:
+    {\"n_ptl\": [1, 2, 4], \"rndv_mode\": [0, 1]})."""
+    journal = create_sweep(args)
+    if journal is not None and preflight(args, journal.header()):
+        run_sweep(journal, memo=mm.Memo(args.memo_dir, args.no_memo))
+
+def resume(args):
+    """Resume a sweep from its journal: completed points are skipped,
+    failed and interrupted ones are run again."""
+    journal = jn.Journal(args.journal)
+    if not journal.exists():
+        logging.error("No journal '{}' to resume".format(args.journal))
+        return
+
+    if preflight(args, journal.header()):
+        run_sweep(journal, retry_failed=not args.skip_failed,
+                memo=mm.Memo(args.memo_dir, args.no_memo))
+
+batch_header="""#!/bin/bash
+# {npoints} points of sweep {journal}, collect outputs with:
+#   runner.py collect --journal {journal}
+"""
+
+array_header="""#SBATCH --array=0-{last}
+"""
+
+batch_point="""# point {index}: {point}
+(
+{env}{launch}
+) > {output} 2>&1
+echo $? > {output}.rc
+"""
+
+batch_calibration="""# stop on a fabric out of tolerance
+python3 {runner} calibrate --journal {journal} --baseline {baseline} --tolerance {tolerance} \\
+    --latency-test {latency} --bandwidth-test {bandwidth} --outdir {outdir} || exit 1
+"""
+
+def batch_script(points, setup, journal, array=False, preflight=""):
+    """Single script running the (point, config, output) points, sourcing
+    the setup once. As a job array, each task runs one point."""
+    script = batch_header.format(npoints=len(points), journal=shlex.quote(journal))
+    if array:
+        script += array_header.format(last=len(points)-1)
+    script += "\n" + setup + "\n" + preflight
+    if array:
+        script += "case $SLURM_ARRAY_TASK_ID in\n"
+
+    for i, (point, config, output) in enumerate(points):
+        launch = Runner.launch_cmd(config)
+        if config.timeout.value > 0:
+            launch = "timeout -k 5 {} {}".format(config.timeout.value, launch)
+        body = batch_point.format(index=i, point=json.dumps(point),
+                env=Runner.env_cmd(config), launch=launch, output=shlex.quote(output))
+        if array:
+            body = "{})\n{};;\n".format(i, body)
+        script += body
+    if array:
+        script += "esac\n"
+    return script
+
+def export(args):
+    """Write the points of a sweep to a single batch script (or a slurm
+    job array with --array) instead of running them one by one. Points
+    already completed in the journal are left out."""
+    if args.resume:
+        journal = jn.Journal(args.journal)
+        if not journal.exists():
+            logging.error("No journal '{}' to export".format(args.journal))
+            return
+    elif args.sweep_file is None:
+        logging.error("A sweep file is required to export a new sweep")
+        return
+    else:
+        journal = create_sweep(args)
+        if journal is None:
+            return
+
+    header = journal.header()
+    states = journal.states()
+    os.makedirs(header["outdir"], exist_ok=True)
+
+    memo = mm.Memo(args.memo_dir, args.no_memo)
+    points = []
+    setups = set()
+    nidle = 0
+    for point, config in sweep_configs(header):
+        cfg_hash = config.config_hash()
+        state = states.get(cfg_hash)
+        if state is not None and state["status"] == "completed":
+            continue
+        output = os.path.join(header["outdir"], cfg_hash + ".out")
+
+        # memoized points are completed right away
+        runner = Runner()
+        runner.build_cmd(config)
+        if memo.fetch(memo.key(runner.cmd, runner.exe, runner.install), output):
+            journal.record(cfg_hash, "completed", point=point, output=output,
+                    exit_code=0, memoized=True)
+            continue
+        points.append((point, config, output))
+        setups.add(Runner.setup_cmd(config))
+        if config.idle_timeout.value > 0:
+            nidle = nidle + 1
+
+    if len(setups) > 1:
+        logging.error("Points of a batch script must share their installation")
+        return
+    if len(points) == 0:
+        logging.info("No point left to export")
+        return
+    if nidle > 0:
+        # only the watchdog of 'run' and 'sweep' sees the output of a point
+        logging.warning("idle_timeout of {} points is not enforced by batch scripts, "
+                "only their timeout".format(nidle))
+
+    preflight = ""
+    if args.calibrate:
+        preflight = batch_calibration.format(runner=shlex.quote(os.path.abspath(__file__)),
+                journal=shlex.quote(os.path.abspath(args.journal)),
+                baseline=shlex.quote(os.path.abspath(args.calibrate)),
+                tolerance=args.tolerance, latency=shlex.quote(args.latency_test),
+                bandwidth=shlex.quote(args.bandwidth_test), outdir=shlex.quote(header["outdir"]))
+
+    with open(args.script, 'w') as f:
+        f.write(batch_script(points, setups.pop() if setups else "",
+            os.path.abspath(args.journal), args.array, preflight))
+    os.chmod(args.script, 0o755)
+
+    # points are exported once the script exists
+    for point, config, output in points:
+        journal.record(config.config_hash(), "exported", point=point, output=output)
+    logging.info("Exported {} points to '{}'".format(len(points), args.script))
+
+def collect(args):
+    """Record in the journal the outcome of the points run by an exported
+    batch script. Points not run yet are left for 'resume' or another
+    export."""
+    journal = jn.Journal(args.journal)
+    if not journal.exists():
+        logging.error("No journal '{}' to collect".format(args.journal))
+        return
+
+    states = journal.states()
+    configs = {config.config_hash(): config for point, config in sweep_configs(journal.header())}
+    memo = mm.Memo(args.memo_dir)
+    ncollected = 0
+    npending = 0
+    for cfg_hash, state in states.items():
+        if state["status"] != "exported":
+            continue
+        try:
+            with open(state["output"] + ".rc", 'r') as f:
+                rc = int(f.read())
+        except (OSError, ValueError):
+            npending = npending + 1
+            continue
+
+        if rc == wd.TIMEOUT_EXIT_CODE:
+            journal.record(cfg_hash, "timeout", point=state["point"],
+                    output=state["output"], exit_code=rc, reason="timeout")
+        else:
+            status = "completed" if rc == 0 else "failed"
+            journal.record(cfg_hash, status, point=state["point"],
+                    output=state["output"], exit_code=rc)
+        if rc == 0 and cfg_hash in configs:
+            # memoized as the successful runs of a sweep
+            runner = Runner()
+            runner.build_cmd(configs[cfg_hash])
+            memo.store(memo.key(runner.cmd, runner.exe, runner.install), state["output"],
+                    cmd=runner.cmd, exe=runner.exe, install=runner.install)
+        ncollected = ncollected + 1
+
+    logging.info("Collected {} points, {} not run yet".format(ncollected, npending))
+
+def time_cmd(cmd, output):
+    """Wall-clock seconds from the start to the exit of a shell command,
+    and its exit code."""
+    with open(output, 'w') as f:
+        start = time.perf_counter()
+        rv = subprocess.run(['/bin/bash', '-c', cmd], stdout=f, stderr=subprocess.STDOUT)
+        elapsed = time.perf_counter() - start
+    return elapsed, rv.returncode
+
+def overhead(args):
+    """Measure the startup to exit time of a trivial program launched
+    through build_cmd, for all points of a sweep file (example:
+    {\"N\": [1, 2], \"n\": [2, 4, 8], \"net\": [\"tcp\"]}). The same
+    program run directly after the same setup is timed as a reference,
+    the difference being the overhead of the launcher."""
+    cfg_file = args.cfg_file if args.cfg_file else "./config.json"
+    with open(cfg_file, 'r') as f:
+        base_config = json.load(f)
+    with open(args.sweep_file, 'r') as f:
+        sweep = json.load(f)
+    configs = sweep_configs({"sweep": sweep, "config": base_config})
+    os.makedirs(args.outdir, exist_ok=True)
+
+    keys = list(sweep.keys())
+    fields = keys + ["rep", "launch", "direct", "overhead", "exit_code"]
+    with open(args.output, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=fields)
+        writer.writeheader()
+
+        for i, (point, config) in enumerate(configs):
+            config.fq_name.use_program(args.program)
+            runner = Runner()
+            runner.build_cmd(config)
+            direct = Runner.setup_cmd(config) + Runner.env_cmd(config) + args.program
+            output = os.path.join(args.outdir, config.config_hash() + ".out")
+
+            logging.info("[{}/{}] Timing launch of point {}".format(i+1, len(configs), point))
+            for rep in range(-args.warmup, args.repeat):
+                t_launch, rc = time_cmd(runner.cmd, output)
+                t_direct, _ = time_cmd(direct, output + ".direct")
+                if rep < 0:
+                    continue
+                writer.writerow(dict(point, rep=rep, launch=t_launch, direct=t_direct,
+                    overhead=t_launch - t_direct, exit_code=rc))
+                if rc != 0:
+                    logging.warning("Launch of point {} exited with code {}, see '{}'"
+                            .format(point, rc, output))
+            f.flush()
+
+    logging.info("Launch times of {} points written to '{}'".format(len(configs), args.output))
+
+def run_config(config, output):
+    runner = Runner()
+    runner.build_cmd(config)
+    return runner.run(output=output)
+
+def autotune(args):
+    """Search the best values of tuning keys for a benchmark objective.
+    Writes the best configuration and keeps every trial in the journal."""
+    cfg_file = args.cfg_file if args.cfg_file else "./config.json"
+    with open(cfg_file, 'r') as f:
+        base_config = json.load(f)
+    with open(args.space_file, 'r') as f:
+        space = json.load(f)
+
+    objective = at.Objective(args.benchmark, args.metric, args.agg,
+            args.min_bytes, args.max_bytes, args.minimize)
+
+    journal = jn.Journal(args.journal)
+    if not journal.exists() or args.force:
+        settings = {k: v for k, v in vars(args).items() if k != "func"}
+        journal.create({"autotune": settings, "objective": objective.settings(),
+            "space": space, "config": base_config})
+    else:
+        # scores of another objective cannot be compared
+        header = journal.header()
+        recorded = header.get("objective")
+        if recorded is None:
+            recorded = {k: header.get("autotune", {}).get(k) for k in objective.settings()}
+        if recorded != objective.settings():
+            logging.error("Journal '{}' holds trials of objective {}, not {}. "
+                    "Overwrite it with --force".format(args.journal, recorded,
+                        objective.settings()))
+            return
+        logging.info("Reusing trials of journal '{}'".format(args.journal))
+    os.makedirs(args.outdir, exist_ok=True)
+
+    tuner = at.Tuner(base_config, space, objective, journal,
+            os.path.abspath(args.outdir), run_config)
+    results = tuner.search(args.strategy, args.budget, args.seed)
+
+    for score, point in results:
+        logging.info("score={} point={}".format(score, point))
+    best_score, best_point = results[0]
+    if best_score is None:
+        logging.error("No successful trial, no configuration written")
+        return
+
+    tuner.make_config(best_point).config_dump(args.best)
+    logging.info("Best point {} with {} {}={}, written to '{}'".format(best_point,
+        args.agg, args.metric, best_score, args.best))
 
 parser = argparse.ArgumentParser(description='Test runner tool')
 subparsers = parser.add_subparsers(dest="cmd")
 subparsers.required = True
 
+def add_calibration_args(p, baseline="--calibrate", required=False,
+        baseline_help="Check OSU latency and bandwidth against a per-fabric baseline file first"):
+    p.add_argument(baseline, type=str, metavar="BASELINE", required=required,
+            help=baseline_help)
+    p.add_argument("--tolerance", type=float, default=0.25,
+            help="Tolerated deviation from baseline, as a fraction")
+    p.add_argument("--latency-test", type=str, default="osu/latency",
+            help="FQ name of the OSU latency test, or path to its executable")
+    p.add_argument("--bandwidth-test", type=str, default="osu/bw",
+            help="FQ name of the OSU bandwidth test, or path to its executable")
+
 init_p = subparsers.add_parser('init')
 init_p.add_argument("--force", action='store_true', help="Force overwrite configuration file")
 init_p.add_argument("--cfg-file", type=str, help="Path to custom configuration file")
@@ -216,8 +699,102 @@ run_p.add_argument("--key-value", type=str,
         help="JSON list of key values (example: {\"type\": \"log\", \"c\": 2})")
 run_p.add_argument("--show", action='store_true', help="Print command that will be executed")
 run_p.add_argument("--fq-name", type=str, help="FQ name of PCVS test")
+run_p.add_argument("--output", type=str, help="Write output to file, reusing memoized results")
+run_p.add_argument("--no-memo", action='store_true', help="Run even if a memoized result exists")
+run_p.add_argument("--memo-dir", type=str, default=mm.Memo.DEFAULT_DIR, help="Directory of memoized results")
+run_p.add_argument("--stream", type=str, metavar="BENCHMARK",
+        help="Parse output of benchmark (e.g. pt2pt_osu_bw) while it runs")
+run_p.add_argument("--baseline", type=str, help="Previous output of the benchmark to compare to")
+run_p.add_argument("--abort-metric", type=str, help="Metric of abort rules (default: first metric)")
+run_p.add_argument("--abort-below", type=float, metavar="PCT",
+        help="Abort when metric falls below PCT%% of baseline")
+run_p.add_argument("--abort-above", type=float, metavar="PCT",
+        help="Abort when metric rises above PCT%% of baseline")
 run_p.set_defaults(func=run)
 
+sweep_p = subparsers.add_parser('sweep')
+sweep_p.add_argument("--sweep-file", type=str, required=True,
+        help="JSON dict of key to list of values (example: {\"n_ptl\": [1, 2]})")
+sweep_p.add_argument("--cfg-file", type=str, help="Path to custom base configuration file")
+sweep_p.add_argument("--journal", type=str, default="./sweep.journal", help="Path to sweep journal")
+sweep_p.add_argument("--outdir", type=str, default="./sweep", help="Directory of run outputs")
+sweep_p.add_argument("--force", action='store_true', help="Overwrite existing journal")
+sweep_p.add_argument("--no-memo", action='store_true', help="Run points even if memoized")
+sweep_p.add_argument("--memo-dir", type=str, default=mm.Memo.DEFAULT_DIR, help="Directory of memoized results")
+add_calibration_args(sweep_p)
+sweep_p.set_defaults(func=sweep)
+
+resume_p = subparsers.add_parser('resume')
+resume_p.add_argument("--journal", type=str, default="./sweep.journal", help="Path to sweep journal")
+resume_p.add_argument("--skip-failed", action='store_true', help="Do not run failed points again")
+resume_p.add_argument("--no-memo", action='store_true', help="Run points even if memoized")
+resume_p.add_argument("--memo-dir", type=str, default=mm.Memo.DEFAULT_DIR, help="Directory of memoized results")
+add_calibration_args(resume_p)
+resume_p.set_defaults(func=resume)
+
+export_p = subparsers.add_parser('export')
+export_p.add_argument("--sweep-file", type=str, help="JSON file mapping keys to lists of values")
+export_p.add_argument("--cfg-file", type=str, help="Path to custom base configuration file")
+export_p.add_argument("--journal", type=str, default="./sweep.journal", help="Path to sweep journal")
+export_p.add_argument("--outdir", type=str, default="./sweep", help="Directory of run outputs")
+export_p.add_argument("--script", type=str, default="./sweep.sh", help="Path of the batch script")
+export_p.add_argument("--array", action='store_true', help="Write a slurm job array, one task per point")
+export_p.add_argument("--resume", action='store_true',
+        help="Export the points of an existing journal not completed yet")
+export_p.add_argument("--force", action='store_true', help="Overwrite existing journal")
+export_p.add_argument("--no-memo", action='store_true', help="Export points even if memoized")
+export_p.add_argument("--memo-dir", type=str, default=mm.Memo.DEFAULT_DIR, help="Directory of memoized results")
+add_calibration_args(export_p)
+export_p.set_defaults(func=export)
+
+collect_p = subparsers.add_parser('collect')
+collect_p.add_argument("--journal", type=str, default="./sweep.journal", help="Path to sweep journal")
+collect_p.add_argument("--memo-dir", type=str, default=mm.Memo.DEFAULT_DIR, help="Directory of memoized results")
+collect_p.set_defaults(func=collect)
+
+calibrate_p = subparsers.add_parser('calibrate')
+add_calibration_args(calibrate_p, "--baseline", True, "Path to per-fabric baseline file")
+calibrate_p.add_argument("--record", action='store_true', help="Record measures as baseline of the fabric")
+calibrate_p.add_argument("--cfg-file", type=str, help="Path to custom configuration file")
+calibrate_p.add_argument("--journal", type=str, help="Calibrate the base configuration of a sweep journal")
+calibrate_p.add_argument("--outdir", type=str, default=".", help="Directory of calibration outputs")
+calibrate_p.set_defaults(func=calibrate)
+
+overhead_p = subparsers.add_parser('overhead')
+overhead_p.add_argument("--sweep-file", type=str, required=True,
+        help="JSON file mapping keys (e.g. N, n, c, net) to lists of values")
+overhead_p.add_argument("--cfg-file", type=str, help="Path to custom base configuration file")
+overhead_p.add_argument("--program", type=str, default="/bin/true", help="Trivial program to launch")
+overhead_p.add_argument("--repeat", type=int, default=5, help="Number of timed launches per point")
+overhead_p.add_argument("--warmup", type=int, default=1, help="Number of untimed launches per point")
+overhead_p.add_argument("--output", type=str, default="./overhead.csv", help="CSV file of launch times")
+overhead_p.add_argument("--outdir", type=str, default="./overhead", help="Directory of launch outputs")
+overhead_p.set_defaults(func=overhead)
+
+autotune_p = subparsers.add_parser('autotune')
+autotune_p.add_argument("--space-file", type=str, required=True,
+        help="JSON dict of key to list of values, null for all allowed values "
+        "(example: {\"rndv_mode\": null, \"n_ptl\": [1, 2, 4]})")
+autotune_p.add_argument("--benchmark", type=str, required=True,
+        help="Benchmark name used to parse outputs (example: pt2pt_osu_bw)")
+autotune_p.add_argument("--metric", type=str, required=True, help="Metric of the objective")
+autotune_p.add_argument("--agg", type=str, default="mean", choices=at.Objective.AGGREGATES,
+        help="Aggregate of the metric over message sizes")
+autotune_p.add_argument("--min-bytes", type=int, default=0, help="Smallest message size of the objective")
+autotune_p.add_argument("--max-bytes", type=int, help="Largest message size of the objective")
+autotune_p.add_argument("--minimize", action='store_true', help="Minimize the objective (default: maximize)")
+autotune_p.add_argument("--strategy", type=str, default="grid", choices=at.Tuner.STRATEGIES,
+        help="Search strategy")
+autotune_p.add_argument("--budget", type=int, help="Number of points sampled by random and halving")
+autotune_p.add_argument("--seed", type=int, default=0, help="Seed of random sampling")
+autotune_p.add_argument("--cfg-file", type=str, help="Path to custom base configuration file")
+autotune_p.add_argument("--journal", type=str, default="./autotune.journal", help="Path to search log")
+autotune_p.add_argument("--outdir", type=str, default="./autotune", help="Directory of run outputs")
+autotune_p.add_argument("--best", type=str, default="./best_config.json",
+        help="Path of the best configuration file")
+autotune_p.add_argument("--force", action='store_true', help="Overwrite existing search log")
+autotune_p.set_defaults(func=autotune)
+
 def main():
     args = parser.parse_args()
     args.func(args)
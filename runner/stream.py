@@ -0,0 +1,62 @@
+import logging
+import config as cfg
+import parsers
+
+class StreamMonitor():
+    """Parse the output of a benchmark while it runs and log its rows as
+    they are produced.
+
+    With a baseline, a previous output of the same benchmark, the run is
+    aborted as soon as the metric at a message size falls below
+    abort_below or rises above abort_above percent of the baseline value
+    at that size (None disables a rule)."""
+
+    def __init__(self, benchmark, metric=None, baseline=None,
+            abort_below=None, abort_above=None):
+        self.b = parsers.benchmark_class(benchmark)
+        if self.b is None:
+            raise cfg.CfgArgError("Unknown benchmark '{}'".format(benchmark))
+        self.metric = metric if metric is not None else self.b.BENCHMARK_Y[0]
+        if self.metric not in self.b.BENCHMARK_Y:
+            raise cfg.CfgArgError("Benchmark '{}' has no metric '{}', choose from {}"
+                    .format(benchmark, self.metric, self.b.BENCHMARK_Y))
+        self.abort_below = abort_below
+        self.abort_above = abort_above
+        self.parser      = self.b.stream()
+        self.baseline    = {}
+        if baseline is not None:
+            self.baseline = self.load_baseline(baseline)
+
+    def load_baseline(self, path):
+        parser = self.b.stream()
+        with open(path, 'r') as f:
+            for line in f:
+                parser.feed(line)
+        x = self.b.BENCHMARK_X[0]
+        baseline = {row[x]: row[self.metric] for row in parser.rows}
+        logging.info("Loaded baseline '{}': {} sizes".format(path, len(baseline)))
+        return baseline
+
+    def check(self, row):
+        x = self.b.BENCHMARK_X[0]
+        ref = self.baseline.get(row[x])
+        if ref is None or ref <= 0:
+            return None
+        pct = 100.0 * row[self.metric] / ref
+        if self.abort_below is not None and pct < self.abort_below:
+            return "{} {} at {} {} is {:.1f}% of baseline (< {}%)".format(
+                    self.metric, row[self.metric], row[x], x, pct, self.abort_below)
+        if self.abort_above is not None and pct > self.abort_above:
+            return "{} {} at {} {} is {:.1f}% of baseline (> {}%)".format(
+                    self.metric, row[self.metric], row[x], x, pct, self.abort_above)
+        return None
+
+    def __call__(self, line):
+        """Feed one line of output, return the reason to abort or None."""
+        row = self.parser.feed(line)
+        if row is None:
+            return None
+        logging.info("[{}] {}".format(self.b.BENCHMARK_NAME,
+            " ".join("{}={:.6g}".format(k, v) if isinstance(v, float)
+                else "{}={}".format(k, v) for k, v in row.items())))
+        return self.check(row)
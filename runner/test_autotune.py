@@ -0,0 +1,83 @@
+import json
+import pytest
+import autotune as at
+import config as cfg
+import journal as jn
+
+def osu_output(latency):
+    return "# Size  Latency (us)\n" + "".join("{}  {}\n".format(m, latency * m)
+            for m in [1, 8, 1024])
+
+class FakeRun():
+    """Run writing an OSU latency output where rndv_mode 1 is the fastest,
+    failing for n_ptl 3."""
+
+    def __init__(self):
+        self.trials = []
+
+    def __call__(self, config, output):
+        self.trials.append((config.rndv_mode.value, config.n_ptl.value))
+        if config.n_ptl.value == 3:
+            return 1
+        with open(output, 'w') as f:
+            f.write(osu_output(1.0 + abs(config.rndv_mode.value - 1) + 0.1 * config.n_ptl.value))
+        return 0
+
+def tuner(tmp_path, config_file, space, run):
+    base_config = json.loads(config_file.read_text())
+    journal = jn.Journal(str(tmp_path / "tune.journal"))
+    if not journal.exists():
+        journal.create({})
+    objective = at.Objective("pt2pt_osu_latency", "latency", max_bytes=8, minimize=True)
+    return at.Tuner(base_config, space, objective, journal, str(tmp_path), run)
+
+def test_objective(tmp_path):
+    (tmp_path / "run.out").write_text(osu_output(2.0))
+    assert at.Objective("pt2pt_osu_latency", "latency").score(str(tmp_path / "run.out")) == 2.0 * (1 + 8 + 1024) / 3
+    assert at.Objective("pt2pt_osu_latency", "latency", agg="max", max_bytes=8) \
+            .score(str(tmp_path / "run.out")) == 16.0
+    assert at.Objective("pt2pt_osu_latency", "latency", min_bytes=2048) \
+            .score(str(tmp_path / "run.out")) is None
+
+    with pytest.raises(cfg.CfgArgError):
+        at.Objective("pt2pt_osu_unknown", "latency")
+    with pytest.raises(cfg.CfgArgError):
+        at.Objective("pt2pt_osu_latency", "bw")
+
+def test_search_space():
+    assert at.search_space({"rndv_mode": None, "n_ptl": [1, 2]}) == \
+            {"rndv_mode": [0, 1, 2], "n_ptl": [1, 2]}
+    assert at.grid_points({"a": [0, 1], "b": [2]}) == [{"a": 0, "b": 2}, {"a": 1, "b": 2}]
+    with pytest.raises(cfg.CfgArgError):
+        at.search_space({"n_ptl": None})
+
+def test_grid(tmp_path, config_file):
+    run = FakeRun()
+    results = tuner(tmp_path, config_file, {"rndv_mode": None, "n_ptl": [1, 3]}, run) \
+            .search("grid")
+    assert len(run.trials) == 6
+    assert results[0][1] == {"rndv_mode": 1, "n_ptl": 1}
+    # failed runs are ranked last
+    assert [s for s, p in results[-3:]] == [None] * 3
+
+    # completed and failed trials of the journal are reused
+    run = FakeRun()
+    tuner(tmp_path, config_file, {"rndv_mode": None, "n_ptl": [1, 3]}, run).search("grid")
+    assert run.trials == []
+
+def test_halving(tmp_path, config_file):
+    run = FakeRun()
+    results = tuner(tmp_path, config_file, {"rndv_mode": None, "n_ptl": [1, 2]}, run) \
+            .search("halving")
+    # 6 points once, the best 3 twice, the best 2 four times, the last one 8 times
+    assert len(run.trials) == 6 + 3 * 2 - 3 + 2 * 4 - 2 * 2 + 8 - 4
+    assert results == [(pytest.approx(1.1 * (1 + 8) / 2), {"rndv_mode": 1, "n_ptl": 1})]
+
+def test_budget(tmp_path, config_file):
+    run = FakeRun()
+    results = tuner(tmp_path, config_file, {"rndv_mode": None, "n_ptl": [1, 2]}, run) \
+            .search("random", budget=2)
+    assert len(run.trials) == 2 and len(results) == 2
+
+    with pytest.raises(cfg.CfgArgError):
+        tuner(tmp_path, config_file, {"n_ptl": [1]}, run).search("anneal")
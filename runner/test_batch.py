@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import journal as jn
+from conftest import runner, TESTDATA
+
+def run_script(tmp_path, script):
+    env = dict(os.environ, PATH=TESTDATA + os.pathsep + os.environ["PATH"])
+    return subprocess.run(["/bin/bash", script], env=env, cwd=tmp_path,
+            capture_output=True, text=True)
+
+def test_export_collect(tmp_path, config_file):
+    (tmp_path / "sweep.json").write_text(json.dumps({"n_ptl": [1, 2]}))
+    # outputs in a directory whose name needs quoting
+    args = ["--journal", "sweep.journal", "--memo-dir", "memo"]
+    rv = runner(tmp_path, "export", "--cfg-file", str(config_file), "--sweep-file", "sweep.json",
+            "--outdir", "out dir", "--script", "sweep.sh", *args)
+    assert rv.returncode == 0
+    journal = jn.Journal(str(tmp_path / "sweep.journal"))
+    states = journal.states()
+    assert [s["status"] for s in states.values()] == ["exported", "exported"]
+
+    # points not run yet are left exported
+    assert runner(tmp_path, "collect", *args).returncode == 0
+    assert all(s["status"] == "exported" for s in journal.states().values())
+
+    assert run_script(tmp_path, "sweep.sh").returncode == 0
+    for state in states.values():
+        assert "Latency" in open(state["output"]).read()
+    assert runner(tmp_path, "collect", *args).returncode == 0
+    assert all(s["status"] == "completed" for s in journal.states().values())
+
+    # collected results are memoized, a new sweep reuses them
+    rv = runner(tmp_path, "sweep", "--cfg-file", str(config_file), "--sweep-file", "sweep.json",
+            "--outdir", "out", "--journal", "again.journal", "--memo-dir", "memo")
+    assert rv.returncode == 0
+    states = jn.Journal(str(tmp_path / "again.journal")).states()
+    assert all(s.get("memoized") for s in states.values())
+
+def test_export_idle_timeout(tmp_path, config_file):
+    config = json.loads(config_file.read_text())
+    config["idle_timeout"] = 10
+    config_file.write_text(json.dumps(config))
+    (tmp_path / "sweep.json").write_text(json.dumps({"n_ptl": [1]}))
+    rv = runner(tmp_path, "export", "--cfg-file", str(config_file), "--sweep-file", "sweep.json",
+            "--outdir", "out", "--no-memo")
+    assert rv.returncode == 0
+    assert "idle_timeout of 1 points is not enforced" in rv.stderr
@@ -0,0 +1,37 @@
+import json
+import os
+from conftest import TESTDATA, runner
+
+def calibrate(config_file, *args, degraded=1,
+        latency=os.path.join(TESTDATA, "osu_latency")):
+    tmp_path = config_file.parent
+    return runner(tmp_path, "calibrate", "--cfg-file", str(config_file),
+            "--baseline", str(tmp_path / "baseline.json"), "--outdir", str(tmp_path / "out"),
+            "--latency-test", latency, "--bandwidth-test", os.path.join(TESTDATA, "osu_bw"),
+            *args, DEGRADED=str(degraded))
+
+def test_record_then_check(config_file):
+    assert calibrate(config_file, "--record").returncode == 0
+    with open(config_file.parent / "baseline.json", 'r') as f:
+        baseline = json.load(f)
+    assert baseline["tcp"]["latency"]["8"] == 2.5
+    assert baseline["tcp"]["bandwidth"]["1048576"] == 10486.0
+
+    assert calibrate(config_file).returncode == 0
+    rv = calibrate(config_file, degraded=4)
+    assert rv.returncode == 1
+    assert "Calibration failed" in rv.stderr
+
+def test_fq_name(config_file):
+    assert calibrate(config_file, "--record", latency="osu/latency").returncode == 0
+
+def test_no_baseline(config_file):
+    rv = calibrate(config_file)
+    assert rv.returncode == 1
+    assert "No baseline for fabric 'tcp'" in rv.stderr
+
+def test_unknown_test(config_file):
+    rv = calibrate(config_file, "--record", latency="osu/missing")
+    assert rv.returncode == 1
+    assert "Invalid calibration latency test" in rv.stderr
+    assert "Traceback" not in rv.stderr
@@ -0,0 +1,59 @@
+import json
+import pytest
+import journal as jn
+from conftest import runner
+
+def test_states(tmp_path):
+    journal = jn.Journal(str(tmp_path / "sweep.journal"))
+    assert not journal.exists()
+    journal.create({"sweep": {"n_ptl": [1, 2]}})
+    journal.record("a", "running")
+    journal.record("b", "running")
+    journal.record("a", "completed", exit_code=0)
+
+    assert journal.header() == {"sweep": {"n_ptl": [1, 2]}}
+    states = journal.states()
+    # the last record of a point is its state
+    assert states["a"]["status"] == "completed"
+    assert states["a"]["exit_code"] == 0
+    assert states["b"]["status"] == "running"
+
+def test_truncated_entry(tmp_path):
+    journal = jn.Journal(str(tmp_path / "sweep.journal"))
+    journal.create({})
+    journal.record("a", "completed", exit_code=0)
+    with open(journal.path, 'a') as f:
+        f.write('{"hash": "b", "sta')
+    assert list(journal.states()) == ["a"]
+
+def test_invalid_header(tmp_path):
+    (tmp_path / "sweep.journal").write_text("not a journal\n")
+    with pytest.raises(jn.JournalError):
+        jn.Journal(str(tmp_path / "sweep.journal")).header()
+
+def test_resume(tmp_path, config_file):
+    (tmp_path / "sweep.json").write_text(json.dumps({"n_ptl": [1, 2, 3]}))
+    args = ["--journal", "sweep.journal", "--no-memo"]
+    rv = runner(tmp_path, "sweep", "--cfg-file", str(config_file), "--sweep-file", "sweep.json",
+            "--outdir", "out", *args)
+    assert rv.returncode == 0
+    journal = jn.Journal(str(tmp_path / "sweep.journal"))
+    states = journal.states()
+    assert [s["status"] for s in states.values()] == ["completed"] * 3
+    with open(next(iter(states.values()))["output"], 'r') as f:
+        assert "OSU MPI Latency Test" in f.read()
+
+    # interrupt the last point while it runs, then a failed one
+    hashes = list(states)
+    journal.record(hashes[2], "running")
+    journal.record(hashes[1], "failed", exit_code=1)
+    rv = runner(tmp_path, "resume", "--skip-failed", *args)
+    assert "Skipping failed point" in rv.stderr
+    assert "[3/3] Running point" in rv.stderr
+    states = journal.states()
+    assert [s["status"] for s in states.values()] == ["completed", "failed", "completed"]
+
+    rv = runner(tmp_path, "resume", *args)
+    assert "[1/3] Skipping completed point" in rv.stderr
+    assert "[2/3] Running point" in rv.stderr
+    assert journal.states()[hashes[1]]["status"] == "completed"
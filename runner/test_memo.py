@@ -0,0 +1,59 @@
+import json
+import os
+import journal as jn
+import memo as mm
+from conftest import runner
+
+def make_exe(path, content):
+    path.write_text(content)
+    os.chmod(path, 0o755)
+    return str(path)
+
+def test_key(tmp_path):
+    exe = make_exe(tmp_path / "exe", "v1")
+    key = mm.Memo.key("mpcrun -n=2 exe", exe, str(tmp_path))
+    assert key == mm.Memo.key("mpcrun -n=2 exe", exe, str(tmp_path))
+    assert key != mm.Memo.key("mpcrun -n=4 exe", exe, str(tmp_path))
+    assert key != mm.Memo.key("mpcrun -n=2 exe", exe, str(tmp_path / "other"))
+
+    # a rebuilt executable is another result
+    make_exe(tmp_path / "exe", "v1.1")
+    assert key != mm.Memo.key("mpcrun -n=2 exe", exe, str(tmp_path))
+
+def test_store_fetch(tmp_path):
+    memo = mm.Memo(str(tmp_path / "memo"))
+    output = tmp_path / "run.out"
+    output.write_text("result")
+    assert not memo.fetch("k", str(tmp_path / "copy.out"))
+
+    memo.store("k", str(output), cmd="mpcrun")
+    assert memo.fetch("k", str(tmp_path / "copy.out"))
+    assert (tmp_path / "copy.out").read_text() == "result"
+
+    # a forced memo records results but never reuses them
+    forced = mm.Memo(str(tmp_path / "memo"), True)
+    assert not forced.fetch("k", str(tmp_path / "copy2.out"))
+    forced.store("k2", str(output))
+    assert memo.fetch("k2", str(tmp_path / "copy2.out"))
+
+def test_incomplete_entry(tmp_path):
+    memo = mm.Memo(str(tmp_path / "memo"))
+    output = tmp_path / "run.out"
+    output.write_text("result")
+    memo.store("k", str(output))
+    # output without metadata, as left by an interrupted store
+    out, meta = memo.entry("k")
+    os.remove(meta)
+    assert not memo.fetch("k", str(tmp_path / "copy.out"))
+
+def test_sweep_reuses_memo(tmp_path, config_file):
+    (tmp_path / "sweep.json").write_text(json.dumps({"n_ptl": [1, 2]}))
+    args = ["--cfg-file", str(config_file), "--sweep-file", "sweep.json", "--outdir", "out",
+            "--journal", "sweep.journal", "--memo-dir", "memo", "--force"]
+    assert runner(tmp_path, "sweep", *args).returncode == 0
+    assert "Reusing result" not in runner(tmp_path, "sweep", *args, "--no-memo").stderr
+
+    # --force restarts the journal but keeps the memo
+    assert runner(tmp_path, "sweep", *args).returncode == 0
+    states = jn.Journal(str(tmp_path / "sweep.journal")).states()
+    assert all(s.get("memoized") for s in states.values())
@@ -0,0 +1,26 @@
+import csv
+import json
+from conftest import runner
+
+def overhead(tmp_path, config_file, *args):
+    (tmp_path / "sweep.json").write_text(json.dumps({"n": [1, 2]}))
+    rv = runner(tmp_path, "overhead", "--cfg-file", str(config_file), "--sweep-file", "sweep.json",
+            "--repeat", "2", "--output", "overhead.csv", *args)
+    with open(tmp_path / "overhead.csv", 'r') as f:
+        return rv, list(csv.DictReader(f))
+
+def test_overhead(tmp_path, config_file):
+    rv, rows = overhead(tmp_path, config_file)
+    assert rv.returncode == 0
+    # warmup launches are not recorded
+    assert [(r["n"], r["rep"]) for r in rows] == [("1", "0"), ("1", "1"), ("2", "0"), ("2", "1")]
+    for r in rows:
+        assert r["exit_code"] == "0"
+        assert float(r["launch"]) > 0 and float(r["direct"]) > 0
+        assert float(r["overhead"]) == float(r["launch"]) - float(r["direct"])
+
+def test_failed_launch(tmp_path, config_file):
+    rv, rows = overhead(tmp_path, config_file, "--program", "/bin/false", "--warmup", "0")
+    assert len(rows) == 4
+    assert all(r["exit_code"] == "1" for r in rows)
+    assert "exited with code 1" in rv.stderr
@@ -0,0 +1,16 @@
+import watchdog as wd
+from conftest import runner
+
+def test_run_exit_code(tmp_path, config_file):
+    rv = runner(tmp_path, "run", "--output", "lat.out", "--no-memo")
+    assert rv.returncode == 0
+
+    # latencies four times the baseline abort the run
+    rv = runner(tmp_path, "run", "--output", "slow.out", "--no-memo",
+            "--stream", "pt2pt_osu_latency", "--baseline", "lat.out", "--abort-above", "200",
+            DEGRADED="4")
+    assert rv.returncode == wd.ABORT_EXIT_CODE
+
+    rv = runner(tmp_path, "run", "--output", "ok.out", "--no-memo",
+            "--stream", "pt2pt_osu_latency", "--baseline", "lat.out", "--abort-above", "200")
+    assert rv.returncode == 0
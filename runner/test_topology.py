@@ -0,0 +1,43 @@
+import pytest
+import config as cfg
+import topology
+
+CPUINFO = "".join("processor\t: {}\nphysical id\t: {}\n\n".format(cpu, cpu // 4) for cpu in range(8))
+
+def fake_topology(tmp_path, numa=True):
+    (tmp_path / "cpuinfo").write_text(CPUINFO)
+    if numa:
+        for node, cpulist in [(0, "0-3"), (1, "4-7\n")]:
+            (tmp_path / "node" / "node{}".format(node)).mkdir(parents=True)
+            (tmp_path / "node" / "node{}".format(node) / "cpulist").write_text(cpulist)
+        (tmp_path / "node" / "possible").write_text("0-1")
+    return topology.Topology(str(tmp_path / "node"), str(tmp_path / "cpuinfo"))
+
+def test_parse_cpulist():
+    assert topology.parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert topology.parse_cpulist("5") == [5]
+    assert topology.parse_cpulist("") == []
+
+def test_topology(tmp_path):
+    t = fake_topology(tmp_path)
+    assert t.cpus == list(range(8))
+    assert t.sockets == {0, 1}
+    assert t.numa == {0: [0, 1, 2, 3], 1: [4, 5, 6, 7]}
+
+def test_topology_without_numa(tmp_path):
+    t = fake_topology(tmp_path, numa=False)
+    assert t.numa == {0: list(range(8))}
+
+def test_validation(tmp_path, monkeypatch):
+    monkeypatch.setattr(topology, "_LOCAL_TOPOLOGY", fake_topology(tmp_path))
+    cpu_map = cfg.CfgArgCpuMap([0, 5])
+    assert cpu_map.to_string() == "export SLURM_CPU_BIND=map_cpu:0,5"
+    assert cfg.CfgArgCpuMap().to_string() == ""
+    for value in [[0, 8], ["0"], "0,5"]:
+        with pytest.raises(cfg.CfgArgError):
+            cpu_map.set(value)
+
+    assert cfg.CfgArgNuma(1).to_string() == "numactl --cpunodebind=1 --membind=1"
+    assert cfg.CfgArgNuma().to_string() == ""
+    with pytest.raises(cfg.CfgArgError):
+        cfg.CfgArgNuma(2)
@@ -0,0 +1,40 @@
+import io
+import time
+import watchdog as wd
+
+def leader(out):
+    return int(out.getvalue().split()[0])
+
+def test_timeout_kills_group():
+    out = io.StringIO()
+    w = wd.Watchdog(timeout=1, grace=1)
+    # a rank ignoring SIGTERM outlives the leader of the group
+    rc = w.run('echo $$; (trap "" TERM; exec sleep 41) & sleep 42', out)
+    assert rc == wd.TIMEOUT_EXIT_CODE
+    assert w.reason == "timeout"
+    assert wd.group_pids(leader(out)) == []
+
+def test_hang():
+    out = io.StringIO()
+    w = wd.Watchdog(idle_timeout=1, grace=1)
+    start = time.monotonic()
+    rc = w.run("echo $$; sleep 0.5; echo alive; sleep 30", out, diag=None)
+    assert rc == wd.TIMEOUT_EXIT_CODE
+    assert w.reason == "hang"
+    assert "alive" in out.getvalue()
+    assert time.monotonic() - start < 10
+    assert wd.group_pids(leader(out)) == []
+
+def test_abort():
+    out = io.StringIO()
+    w = wd.Watchdog()
+    rc = w.run("echo $$; echo ok; echo bad; sleep 30", out,
+            on_line=lambda line: "bad line" if line == "bad" else None)
+    assert rc == wd.ABORT_EXIT_CODE
+    assert w.detail == "bad line"
+    assert wd.group_pids(leader(out)) == []
+
+def test_exit_code():
+    out = io.StringIO()
+    assert wd.Watchdog(timeout=10).run("echo done; exit 3", out) == 3
+    assert out.getvalue() == "done\n"
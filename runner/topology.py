@@ -0,0 +1,59 @@
+import os
+import re
+import logging
+
+NODE_DIR = "/sys/devices/system/node"
+CPUINFO  = "/proc/cpuinfo"
+
+def parse_cpulist(cpulist):
+    """Expand a kernel cpu list such as '0-3,8,10-11'."""
+    cpus = []
+    for chunk in cpulist.strip().split(","):
+        if chunk == "":
+            continue
+        if "-" in chunk:
+            first, last = chunk.split("-")
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(chunk))
+    return cpus
+
+class Topology():
+    """CPUs, sockets and NUMA nodes of the local machine."""
+
+    def __init__(self, node_dir=NODE_DIR, cpuinfo=CPUINFO):
+        self.cpus    = []
+        self.sockets = set()
+        self.numa    = {}
+
+        with open(cpuinfo, 'r') as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                key = key.strip()
+                if key == "processor":
+                    self.cpus.append(int(value))
+                elif key == "physical id":
+                    self.sockets.add(int(value))
+
+        if os.path.isdir(node_dir):
+            for entry in os.listdir(node_dir):
+                m = re.fullmatch(r"node(\d+)", entry)
+                if m is None:
+                    continue
+                with open(os.path.join(node_dir, entry, "cpulist"), 'r') as f:
+                    self.numa[int(m.group(1))] = parse_cpulist(f.read())
+
+        # kernels without NUMA support expose no node directory
+        if not self.numa:
+            self.numa = {0: list(self.cpus)}
+
+        logging.debug("Local topology: {} cpus, {} sockets, {} numa nodes"
+                .format(len(self.cpus), len(self.sockets), len(self.numa)))
+
+_LOCAL_TOPOLOGY = None
+
+def local():
+    global _LOCAL_TOPOLOGY
+    if _LOCAL_TOPOLOGY is None:
+        _LOCAL_TOPOLOGY = Topology()
+    return _LOCAL_TOPOLOGY
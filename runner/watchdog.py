@@ -0,0 +1,170 @@
+import codecs
+import os
+import selectors
+import shutil
+import signal
+import subprocess
+import time
+import logging
+
+# exit code of runs killed by the watchdog, as coreutils timeout
+TIMEOUT_EXIT_CODE = 124
+# exit code of runs aborted on their output
+ABORT_EXIT_CODE = 125
+
+def group_pids(pgid):
+    """Pids of the running processes of a process group, zombies
+    excluded."""
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open("/proc/{}/stat".format(entry), 'r') as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # comm may contain spaces, fields restart after its parenthesis
+        fields = stat[stat.rfind(")") + 2:].split()
+        if int(fields[2]) == pgid and fields[0] != "Z":
+            pids.append(int(entry))
+    return pids
+
+class Watchdog():
+    """Run a shell command in its own process group, copying its output,
+    and kill the whole group when it exceeds timeout seconds of wall-clock
+    time or idle_timeout seconds without output (0 disables a limit).
+
+    Before killing, stack snapshots of every process of the group are
+    taken with gdb in batch mode when it is available.
+
+    When on_line is given, it is called on every complete line of output
+    and the group is killed, without diagnostics, as soon as it returns
+    a reason to abort."""
+
+    def __init__(self, timeout=0, idle_timeout=0, grace=5):
+        self.timeout      = timeout
+        self.idle_timeout = idle_timeout
+        self.grace        = grace
+        self.reason       = None
+        self.detail       = None
+
+    def expired(self, start, last):
+        now = time.monotonic()
+        if self.timeout > 0 and now - start > self.timeout:
+            return "timeout"
+        if self.idle_timeout > 0 and now - last > self.idle_timeout:
+            return "hang"
+        return None
+
+    def feed(self, on_line, lines):
+        for line in lines:
+            detail = on_line(line)
+            if detail:
+                self.detail = detail
+                return "aborted"
+        return None
+
+    def run(self, cmd, out, diag=None, on_line=None):
+        proc = subprocess.Popen(['/bin/bash', '-c', cmd], stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT, start_new_session=True)
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        sel = selectors.DefaultSelector()
+        sel.register(proc.stdout, selectors.EVENT_READ)
+
+        start = last = time.monotonic()
+        eof = False
+        pending = ""
+        while self.reason is None:
+            if eof:
+                # output closed, wait for the exit of the command
+                try:
+                    proc.wait(timeout=1)
+                    break
+                except subprocess.TimeoutExpired:
+                    pass
+            elif sel.select(timeout=1):
+                data = os.read(proc.stdout.fileno(), 65536)
+                if len(data) == 0:
+                    eof = True
+                    if on_line is not None and pending:
+                        self.reason = self.feed(on_line, [pending])
+                else:
+                    text = decoder.decode(data)
+                    out.write(text)
+                    out.flush()
+                    last = time.monotonic()
+                    if on_line is not None:
+                        lines = (pending + text).split("\n")
+                        pending = lines.pop()
+                        self.reason = self.feed(on_line, lines)
+            if self.reason is None:
+                self.reason = self.expired(start, last)
+
+        sel.close()
+        proc.stdout.close()
+        if self.reason is None:
+            return proc.returncode
+
+        if self.reason == "aborted":
+            logging.error("Aborting command: {}".format(self.detail))
+            self.kill(proc)
+            return ABORT_EXIT_CODE
+
+        logging.error("Killing command after {}: {} seconds".format(self.reason,
+            int(time.monotonic() - (start if self.reason == "timeout" else last))))
+        self.diagnose(proc.pid, diag)
+        self.kill(proc)
+        return TIMEOUT_EXIT_CODE
+
+    def diagnose(self, pgid, diag):
+        pids = group_pids(pgid)
+        report = ""
+        for pid in pids:
+            try:
+                with open("/proc/{}/cmdline".format(pid), 'rb') as f:
+                    cmdline = f.read().replace(b"\0", b" ").decode(errors="replace")
+            except OSError:
+                continue
+            report += "==== pid {}: {}\n".format(pid, cmdline)
+            if shutil.which("gdb") is None:
+                continue
+            try:
+                rv = subprocess.run(["gdb", "-p", str(pid), "-batch", "-nx",
+                    "-ex", "thread apply all bt"], capture_output=True, text=True,
+                    timeout=30)
+                report += rv.stdout + rv.stderr
+            except subprocess.TimeoutExpired:
+                report += "gdb timed out\n"
+
+        if diag is not None:
+            with open(diag, 'w') as f:
+                f.write(report)
+            logging.info("Diagnostics of {} processes written to '{}'".format(len(pids), diag))
+        else:
+            logging.info("Diagnostics:\n{}".format(report))
+
+    def kill(self, proc):
+        """SIGTERM the group, then SIGKILL what is left of it after grace
+        seconds. The leader may exit first while ranks ignoring SIGTERM
+        still run, so the whole group is waited for and not the leader."""
+        try:
+            os.killpg(proc.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+        deadline = time.monotonic() + self.grace
+        killed = False
+        while group_pids(proc.pid):
+            proc.poll()
+            if time.monotonic() > deadline:
+                if killed:
+                    logging.warning("Processes of group {} survived SIGKILL".format(proc.pid))
+                    break
+                try:
+                    os.killpg(proc.pid, signal.SIGKILL)
+                except ProcessLookupError:
+                    pass
+                killed = True
+                deadline = time.monotonic() + self.grace
+            time.sleep(0.1)
+        proc.wait()